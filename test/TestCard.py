@@ -1,7 +1,8 @@
 """Unit tests for the Card class."""
 
 import unittest
-from war.Card import Card  # Import from your package
+import pickle
+from war.Card import Card, CARD_TABLE, RANKS  # Import from your package
 
 
 class TestCard(unittest.TestCase):
@@ -68,5 +69,37 @@ class TestCard(unittest.TestCase):
         self.assertEqual(c2.get_value(), 14)
 
 
+class TestCardTable(unittest.TestCase):
+    """Tests for the shared card table and card codes."""
+
+    def test_table_has_52_cards_with_matching_ranks(self):
+        """Every code should map to a card whose value matches RANKS."""
+        self.assertEqual(len(CARD_TABLE), 52)
+        for code, card in enumerate(CARD_TABLE):
+            self.assertEqual(card.get_value(), RANKS[code])
+
+    def test_code_roundtrip(self):
+        """get_code and from_code should be inverse operations."""
+        for code in range(52):
+            self.assertEqual(Card.from_code(code).get_code(), code)
+        self.assertEqual(Card(3, "🂣", "Spades", "black").get_code(), 1)
+
+    def test_get_code_of_non_standard_card_raises(self):
+        """Cards outside a standard deck have no code."""
+        with self.assertRaises(ValueError):
+            Card(99, "🂣", "Spades", "black").get_code()
+
+    def test_table_cards_are_read_only(self):
+        """Shared cards must not be changed by one game for every other."""
+        with self.assertRaises(AttributeError):
+            CARD_TABLE[0].set_value(99)
+        self.assertEqual(CARD_TABLE[0].get_value(), 2)
+
+    def test_pickle_returns_shared_instance(self):
+        """Unpickling a table card should give back the same shared object."""
+        card = CARD_TABLE[17]
+        self.assertIs(pickle.loads(pickle.dumps(card)), card)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -51,6 +51,15 @@ class TestCardHand(unittest.TestCase):
         self.assertEqual(len(hand_list), 3)
         self.assertIn(self.card2, hand_list)
 
+    def test_get_hand_is_a_copy(self):
+        """The cards returned by get_hand should not change the hand."""
+        self.assertEqual(self.hand.highest_index(), 2)
+        cards = self.hand.get_hand()
+        self.assertIsInstance(cards, tuple)
+        self.hand.draw_card()
+        self.assertEqual(len(cards), 3)
+        self.assertEqual(self.hand.highest_index(), 1)
+
     def test_set_hand(self):
         """Test replacing the hand."""
         new_cards = [self.card1]
@@ -89,6 +98,69 @@ class TestCardHand(unittest.TestCase):
         self.assertEqual(returned, new_amount)
         self.assertEqual(self.hand.get_amount(), new_amount)
 
+    def test_draw_card_at_index(self):
+        """Drawing at a non-zero index should remove exactly that card."""
+        drawn = self.hand.draw_card(1)
+        self.assertEqual(drawn, self.card2)
+        self.assertEqual(list(self.hand.get_hand()), [self.card1, self.card3])
+        self.assertEqual(self.hand.get_amount(), 2)
+
+    def test_collect_pot_orders_loser_cards_first(self):
+        """collect_pot should append the loser's active cards, then the winner's own."""
+        other = CardHand([Card(8, "🂨", "Spades", "black")])
+        lost = other.draw_card()
+        won = self.hand.draw_card()
+        self.hand.collect_pot(other)
+        self.assertEqual(list(self.hand.get_hand())[-2:], [lost, won])
+        self.assertEqual(self.hand.get_amount(), 4)
+        self.assertEqual(other.get_active_card(), [])
+        self.assertEqual(self.hand.get_active_card(), [])
+
+    def test_value_index_follows_the_hand(self):
+        """The highest and lowest card should be found after every change."""
+        self.assertEqual(self.hand.highest_index(), 2)
+        self.assertEqual(self.hand.lowest_index(), 0)
+        ace = Card(14, "🂡", "Spades", "black")
+        self.hand.add_card(ace)
+        self.assertEqual(self.hand.highest_index(), 3)
+        self.hand.draw_card(3)
+        self.hand.draw_card()
+        self.assertEqual(self.hand.highest_index(), 1)
+        self.assertEqual(self.hand.lowest_index(), 0)
+        other = CardHand([Card(2, "🂢", "Hearts", "red")])
+        other.draw_card()
+        self.hand.collect_pot(other)
+        self.assertEqual(list(self.hand.get_hand())[-2:][::-1], [self.card1, ace])
+        self.assertEqual(self.hand.highest_index(), 3)
+        self.assertEqual(self.hand.lowest_index(), 2)
+        self.assertEqual(self.hand.count_value(14), 1)
+        self.assertEqual(CardHand().highest_index(), None)
+
+    def test_value_index_ties_and_direct_changes(self):
+        """Ties go to the card nearest the top; mutable_cards drops the index."""
+        second = Card(10, "🂺", "Spades", "black")
+        self.hand.add_card(second)
+        self.assertEqual(self.hand.highest_index(), 2)
+        self.hand.draw_card(2)
+        self.assertEqual(self.hand.highest_index(), 2)
+        self.hand.mutable_cards().appendleft(Card(13, "🂮", "Clubs", "black"))
+        self.assertEqual(self.hand.highest_index(), 0)
+        self.assertEqual(self.hand.count_value(13), 1)
+        self.hand.set_hand([self.card2, self.card1])
+        self.assertEqual(self.hand.highest_index(), 0)
+        self.assertEqual(self.hand.count_value(10), 0)
+
+    def test_rank_mask(self):
+        """The mask should have a bit per value held, kept up to date."""
+        self.assertEqual(self.hand.rank_mask(), 1 << 1 | 1 << 3 | 1 << 8)
+        self.hand.draw_card(1)
+        self.hand.add_card(Card(99, "?", "Spades", "black"))
+        self.assertEqual(self.hand.rank_mask(), 1 << 1 | 1 << 8)
+        self.hand.return_cards()
+        self.assertEqual(self.hand.rank_mask(), 1 << 1 | 1 << 3 | 1 << 8)
+        self.assertEqual(self.hand.index_of_value(5), 3)
+        self.assertIsNone(self.hand.index_of_value(7))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -121,6 +121,35 @@ class TestDeck(unittest.TestCase):
         self.assertEqual(values.count(13), 4)
         self.assertEqual(values.count(14), 4)
 
+    def test_create_uses_shared_table_cards(self):
+        """Two decks should hold the same shared Card objects."""
+        other = Deck()
+        self.assertCountEqual(
+            [id(c) for c in self.deck.get_deck()], [id(c) for c in other.get_deck()]
+        )
+
+    def test_encode_decode_roundtrip(self):
+        """A deck encoded to bytes should decode to the same cards in order."""
+        codes = Deck.encode(self.deck.get_deck())
+        self.assertIsInstance(codes, bytes)
+        self.assertEqual(len(codes), 52)
+        self.assertEqual(Deck.decode(codes), self.deck.get_deck())
+
+    def test_shuffled_codes_match_seeded_deck(self):
+        """Shuffled codes should be the encoding of the deck with the same seed."""
+        self.assertEqual(Deck.shuffled_codes(5), Deck.encode(Deck(5).get_deck()))
+
+    def test_seeded_decks_are_reproducible(self):
+        """Decks shuffled with the same seed should be in the same order."""
+        self.assertEqual(Deck(7).get_deck(), Deck(7).get_deck())
+        self.assertNotEqual(Deck(7).get_deck(), Deck(8).get_deck())
+
+    def test_deck_accepts_rng_object(self):
+        """A random.Random object should be used for shuffling."""
+        import random
+
+        self.assertEqual(Deck(random.Random(3)).get_deck(), Deck(3).get_deck())
+
 
 if __name__ == "__main__":
     unittest.main()
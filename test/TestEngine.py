@@ -0,0 +1,226 @@
+"""Unit tests for the headless Engine (war/Engine.py)."""
+
+import contextlib
+import io
+import random
+import unittest
+
+from war.Card import Card
+from war.CardHand import CardHand
+from war.Deck import Deck
+from war.Engine import CAPPED, CYCLE, WON, Engine, GameResult
+from war.Game import Game
+from war.Intelligence import Intelligence
+from war.Player import Player
+
+
+def make_cards(values):
+    """Build a list of Card objects from plain values."""
+    return [Card(v, str(v), "Spades", "black") for v in values]
+
+
+class TestEngine(unittest.TestCase):
+    """Tests for Engine.run and its GameResult."""
+
+    def make_engine(self, values1, values2):
+        p1 = Player("A", CardHand(make_cards(values1)))
+        p2 = Player("B", CardHand(make_cards(values2)))
+        return Engine(p1, p2), p1, p2
+
+    def test_single_round_win(self):
+        """A higher card wins the only round and ends the game."""
+        engine, p1, p2 = self.make_engine([10], [4])
+        result = engine.run()
+        self.assertIsInstance(result, GameResult)
+        self.assertEqual(result.winner, 1)
+        self.assertEqual(result.num_draws, 1)
+        self.assertEqual(result.wars, 0)
+        self.assertEqual(len(p1.get_hand().get_hand()), 2)
+        self.assertEqual(p2.get_hand().get_amount(), 0)
+
+    def test_winner_receives_loser_cards_first(self):
+        """The pot is returned as the loser's cards followed by the winner's cards."""
+        engine, p1, p2 = self.make_engine([3], [8, 2])
+        result = engine.run()
+        self.assertEqual(result.winner, 2)
+        values = [c.get_value() for c in p2.get_hand().get_hand()]
+        self.assertEqual(values, [2, 3, 8])
+
+    def test_war_is_counted(self):
+        """A tie followed by a decisive face up card counts as one war."""
+        engine, p1, p2 = self.make_engine([5, 2, 9], [5, 3, 4])
+        result = engine.run()
+        self.assertEqual(result.winner, 1)
+        self.assertEqual(result.num_draws, 1)
+        self.assertEqual(result.wars, 1)
+        self.assertEqual(result.longest_war, 1)
+        self.assertEqual(p1.get_hand().get_amount(), 6)
+
+    def test_war_without_enough_cards_forfeits_pot(self):
+        """A player with fewer than two cards left during a war loses the pot."""
+        engine, p1, p2 = self.make_engine([5], [5, 9])
+        result = engine.run()
+        self.assertEqual(result.winner, 2)
+        self.assertEqual(p2.get_hand().get_amount(), 3)
+        self.assertEqual(len(p1.get_hand().get_active_card()), 0)
+
+    def test_looping_game_is_detected(self):
+        """A deal that repeats its position should end as a cycle without a winner."""
+        engine, p1, p2 = self.make_engine([5, 9], [5])
+        result = engine.run()
+        self.assertEqual(result.outcome, CYCLE)
+        self.assertEqual(result.winner, 0)
+        self.assertEqual(p1.get_hand().get_amount() + p2.get_hand().get_amount(), 3)
+
+    def test_round_cap_stops_game(self):
+        """A game still running after max_rounds should end as capped."""
+        p1 = Player("A", CardHand(make_cards([3, 9])))
+        p2 = Player("B", CardHand(make_cards([8])))
+        result = Engine(p1, p2, max_rounds=2).run()
+        self.assertEqual(result, GameResult(0, 2, 0, 0, CAPPED))
+
+    def test_random_level_skips_cycle_detection(self):
+        """Random play cannot be proven to loop, so only the cap applies."""
+        p1 = Player("A", CardHand(make_cards([5, 9])))
+        p2 = Intelligence("B", CardHand(make_cards([5])), level="random")
+        self.assertEqual(Engine(p1, p2, max_rounds=50).run().outcome, CAPPED)
+
+    def test_counting_level_sees_every_face_up_card(self):
+        """A counting AI should be told each pair and loop once it sees no more."""
+        p1 = Player("A", CardHand(make_cards([5, 9])))
+        p2 = Intelligence("B", CardHand(make_cards([5])), level="counting")
+        result = Engine(p1, p2, max_rounds=50).run()
+        self.assertEqual(result.outcome, CYCLE)
+        self.assertLess(result.num_draws, 50)
+        # Only the 5, 9 and 5 of spades exist, and a 5 was seen twice
+        self.assertEqual(bin(p2.seen).count("1"), 2)
+        self.assertEqual((p2.unseen[5], p2.unseen[9]), (3, 3))
+
+    def test_full_deck_conserves_cards(self):
+        """Playing a full deck ends with one player holding all 52 cards."""
+        random.seed(1)
+        engine = Engine.from_deck(Deck())
+        result = engine.run()
+        p1, p2 = engine.get_players()
+        self.assertIn(result.winner, (1, 2))
+        self.assertEqual(result.outcome, WON)
+        winner = engine.get_players()[result.winner - 1]
+        self.assertEqual(len(winner.get_hand().get_hand()), 52)
+        self.assertEqual(p1.get_hand().get_amount() + p2.get_hand().get_amount(), 52)
+        self.assertGreaterEqual(result.num_draws, 26)
+
+    def test_from_deck_uses_intelligence(self):
+        """from_deck should mirror singleplayer mode with an AI second player."""
+        engine = Engine.from_deck(ai_level="greedy")
+        p1, p2 = engine.get_players()
+        self.assertIsInstance(p2, Intelligence)
+        self.assertEqual(p2.get_level(), "greedy")
+        self.assertEqual(p1.get_hand().get_amount(), 26)
+
+    def test_from_deck_ai_versus_ai(self):
+        """With ai_level1 both seats should hold an Intelligence."""
+        engine = Engine.from_deck(ai_level="top", rng=2, ai_level1="greedy")
+        p1, p2 = engine.get_players()
+        self.assertIsInstance(p1, Intelligence)
+        self.assertEqual((p1.get_level(), p2.get_level()), ("greedy", "top"))
+        self.assertEqual(p1.get_hand().get_amount(), 26)
+
+    def test_from_codes_matches_from_deck(self):
+        """An encoded deal should play out exactly like the deck it came from."""
+        random.seed(4)
+        deck = Deck()
+        codes = Deck.encode(deck.get_deck())
+        result = Engine.from_deck(deck).run()
+        self.assertEqual(Engine.from_codes(codes[:26], codes[26:]).run(), result)
+
+    def test_matches_interactive_draw_cards(self):
+        """The engine should resolve a game exactly like repeated Game.draw_cards calls."""
+        values1 = [8, 14, 8, 2, 6, 10, 9, 8]
+        values2 = [14, 6, 9, 7, 11, 5, 10, 4]
+
+        game = Game()
+        game.start(mode=2, player1="A", player2="B")
+        g1, g2 = game._Game__players
+        g1.set_hand(CardHand(make_cards(values1)))
+        g2.set_hand(CardHand(make_cards(values2)))
+        with contextlib.redirect_stdout(io.StringIO()):
+            while g1.get_hand().get_hand() and g2.get_hand().get_hand():
+                game.draw_cards()
+
+        engine, p1, p2 = self.make_engine(values1, values2)
+        result = engine.run()
+
+        self.assertEqual(result.num_draws, game.num_draws)
+        self.assertEqual(
+            [c.get_value() for c in p1.get_hand().get_hand()],
+            [c.get_value() for c in g1.get_hand().get_hand()],
+        )
+        self.assertEqual(
+            [c.get_value() for c in p2.get_hand().get_hand()],
+            [c.get_value() for c in g2.get_hand().get_hand()],
+        )
+
+    def test_greedy_matches_interactive_draw_cards(self):
+        """A greedy AI should play the same game in the engine and in Game."""
+        values1 = [8, 14, 8, 2, 6, 10, 9, 8, 3, 3]
+        values2 = [14, 6, 9, 7, 11, 5, 10, 4, 3, 13]
+
+        game = Game()
+        game.start(mode=2, player1="A", player2="B")
+        players = game._Game__players
+        players[0].set_hand(CardHand(make_cards(values1)))
+        players[1] = Intelligence("B", CardHand(make_cards(values2)), "greedy")
+        with contextlib.redirect_stdout(io.StringIO()):
+            while game.num_draws < 200 and all(
+                player.get_hand().get_hand() for player in players
+            ):
+                game.draw_cards()
+
+        p1 = Player("A", CardHand(make_cards(values1)))
+        p2 = Intelligence("B", CardHand(make_cards(values2)), "greedy")
+        result = Engine(p1, p2, max_rounds=200).run()
+
+        self.assertEqual(result.num_draws, game.num_draws)
+        for engine_player, game_player in ((p1, players[0]), (p2, players[1])):
+            self.assertEqual(
+                [c.get_value() for c in engine_player.get_hand().get_hand()],
+                [c.get_value() for c in game_player.get_hand().get_hand()],
+            )
+        hand = p2.get_hand()
+        self.assertEqual(
+            hand.count_value(14), [c.value for c in hand.get_hand()].count(14)
+        )
+
+
+class TestGameSimulate(unittest.TestCase):
+    """Tests for Game.simulate."""
+
+    def test_simulate_records_winner(self):
+        """simulate should finish the game and record the winner's statistics."""
+        random.seed(2)
+        game = Game()
+        game.start(mode=2, player1="SimA", player2="SimB")
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = game.simulate()
+        winner = "SimA" if result.winner == 1 else "SimB"
+        stats = game._Game__highscore.get_highscores()[winner]
+        self.assertTrue(stats[-1].get_has_won())
+        self.assertEqual(stats[-1].get_draws(), result.num_draws)
+        self.assertEqual(result.num_draws, game.num_draws)
+
+    def test_simulate_loop_records_nothing(self):
+        """A looping game has no winner, so no statistics should be added."""
+        game = Game()
+        game.start(mode=2, player1="LoopA", player2="LoopB")
+        g1, g2 = game._Game__players
+        g1.set_hand(CardHand(make_cards([5, 9])))
+        g2.set_hand(CardHand(make_cards([5])))
+        result = game.simulate()
+        self.assertEqual(result.outcome, CYCLE)
+        highscores = game._Game__highscore.get_highscores()
+        self.assertEqual(highscores.get("LoopA", []), [])
+        self.assertEqual(highscores.get("LoopB", []), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
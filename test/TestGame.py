@@ -1,13 +1,28 @@
 """Unit tests for the core Game logic (war/Game.py)."""
 
 import unittest
+import contextlib
 import datetime
+import io
 import os
 import json
+import tempfile
 from war.Game import Game
 from war.Card import Card
 from war.CardHand import CardHand
+from war.Deck import Deck
+from war.Events import (
+    CardsRevealed,
+    CheatUsed,
+    FaceDown,
+    GameOver,
+    PotWon,
+    RoundStarted,
+    War,
+)
 from war.Highscore import Highscore
+from war.ShardedHighscore import ShardedHighscore
+from war.SqliteHighscore import SqliteHighscore
 from war.Statistics import Statistics
 
 
@@ -62,6 +77,28 @@ class TestGame(unittest.TestCase):
         self.assertTrue(hasattr(p2, "get_level"))
         self.assertEqual(p2.get_level(), "greedy")
 
+    def test_start_ai_versus_ai(self):
+        """Mode 3 should seat two Intelligence players with their own levels."""
+        game = Game()
+        game.start(3, "AI 1", "AI 2", ai_level="counting", seed=4, ai_level1="greedy")
+        p1, p2 = game._Game__players
+        self.assertEqual((p1.get_name(), p1.get_level()), ("AI 1", "greedy"))
+        self.assertEqual((p2.get_name(), p2.get_level()), ("AI 2", "counting"))
+        # Player 1 now chooses its card: greedy plays its highest one
+        highest = max(card.get_value() for card in p1.get_hand().get_hand())
+        events = list(game.play_round())
+        self.assertEqual(events[1].card1.get_value(), highest)
+        self.assertTrue(game.simulate().winner in (0, 1, 2))
+
+    def test_counting_ai_sees_revealed_cards(self):
+        """Every face up card of a round should be revealed to a counting AI."""
+        game = Game()
+        game.start(mode=1, player1="Solo", ai_level="counting", seed=3)
+        ai = game._Game__players[1]
+        game.draw_cards()
+        self.assertGreaterEqual(bin(ai.seen).count("1"), 2)
+        self.assertEqual(sum(ai.unseen), 52 - bin(ai.seen).count("1"))
+
     def test_draw_when_player_has_no_cards_records_highscore(self):
         """If one player has no cards, the other is recorded as winner in highscores."""
         game = Game()
@@ -80,15 +117,72 @@ class TestGame(unittest.TestCase):
 
     def test_name_change_updates_highscore_keys(self):
         """Game.name_change should propagate to Highscore and replace keys."""
-        game = Game()
+        with tempfile.TemporaryDirectory() as directory:
+            game = Game(Highscore(os.path.join(directory, "highscores.json")))
+            game.start(mode=2, player1="Old", player2="Other")
+            hs = game._Game__highscore
+            # ensure Old exists
+            self.assertIn("Old", hs.get_highscores())
+            # perform rename
+            game.name_change("Old", "NewName")
+            self.assertIn("NewName", hs.get_highscores())
+            self.assertNotIn("Old", hs.get_highscores())
+            game.close()
+
+    def test_close_writes_the_pending_save(self):
+        """close should write a requested save and stop the writer thread."""
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "highscores.json")
+            hs = Highscore(filename, save_delay=60)
+            game = Game(hs)
+            game.start(mode=2, player1="Old", player2="Other")
+            game.name_change("Old", "NewName")
+            writer = hs._Highscore__writer
+            game.close()
+            self.assertFalse(writer.is_alive())
+            with open(filename, encoding="utf-8") as fh:
+                self.assertIn("NewName", json.load(fh))
+
+    def test_play_after_close(self):
+        """Every highscore store should keep recording games after close."""
+        with tempfile.TemporaryDirectory() as directory:
+            stores = [
+                Highscore(os.path.join(directory, "highscores.json"), journal=True),
+                ShardedHighscore(os.path.join(directory, "sharded")),
+                SqliteHighscore(os.path.join(directory, "highscores.db")),
+            ]
+            for hs in stores:
+                game = Game(hs)
+                for _ in range(2):
+                    game.start(mode=2, player1="Ann", player2="Ben")
+                    ann, ben = game._Game__players
+                    ann.set_hand(CardHand([Card(9, "9", "s", "b")]))
+                    ben.set_hand(CardHand([Card(5, "5", "s", "b")]))
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        game.simulate()
+                        game.show_highscore()
+                    game.close()
+                standing = hs.get_leaderboard().get_standing("Ann")
+                self.assertEqual((standing.games, standing.wins), (2, 2))
+                hs.close()
+
+    def test_name_change_saves_in_background(self):
+        """name_change should request a save that save_highscore waits for."""
+        filename = "test/test_name_change.json"
+        hs = Highscore(filename, save_delay=60)
+        game = Game(hs)
         game.start(mode=2, player1="Old", player2="Other")
-        hs = game._Game__highscore
-        # ensure Old exists
-        self.assertIn("Old", hs.get_highscores())
-        # perform rename
-        game.name_change("Old", "NewName")
-        self.assertIn("NewName", hs.get_highscores())
-        self.assertNotIn("Old", hs.get_highscores())
+        try:
+            game.name_change("Old", "NewName")
+            self.assertFalse(os.path.exists(filename))
+            game.save_highscore()
+            with open(filename, encoding="utf-8") as fh:
+                self.assertIn("NewName", json.load(fh))
+        finally:
+            hs.close()
+            for path in (filename, hs.get_lock_filename()):
+                if os.path.exists(path):
+                    os.remove(path)
 
     def test_war_with_insufficient_cards_causes_loss_and_records_highscore(self):
         """If a war occurs but player1 cannot continue (not enough cards) player2 should win and be recorded."""
@@ -140,6 +234,136 @@ class TestGame(unittest.TestCase):
         # After the round, AI should have taken cards and therefore its hand amount should be >= 1
         self.assertGreaterEqual(p2.get_hand().amount, 1)
 
+    def test_long_war_chain_is_one_draw(self):
+        """A chain of thousands of wars should resolve without recursion in one draw."""
+        g = Game()
+        g.start(mode=2, player1="A", player2="B")
+        p1 = g._Game__players[0]
+        p2 = g._Game__players[1]
+
+        # Every face up card ties until the last pair, where player 1 wins
+        values1 = [5] * 4000 + [9]
+        values2 = [5] * 4000 + [3]
+        p1.set_hand(CardHand([Card(v, str(v), "s", "b") for v in values1]))
+        p2.set_hand(CardHand([Card(v, str(v), "s", "b") for v in values2]))
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            g.draw_cards()
+
+        self.assertEqual(g.num_draws, 1)
+        self.assertEqual(len(p1.get_hand().get_hand()), 8002)
+        self.assertEqual(len(p2.get_hand().get_hand()), 0)
+        self.assertEqual(p1.get_hand().get_active_card(), [])
+
+    def test_play_round_yields_war_events(self):
+        """A round with a war should be described by its events, in order."""
+        g = Game()
+        g.start(mode=2, player1="A", player2="B")
+        p1 = g._Game__players[0]
+        p2 = g._Game__players[1]
+        p1.set_hand(CardHand([Card(v, str(v), "s", "b") for v in (5, 2, 9)]))
+        p2.set_hand(CardHand([Card(v, str(v), "s", "b") for v in (5, 3, 4)]))
+
+        events = list(g.play_round())
+
+        kinds = [type(event) for event in events]
+        self.assertEqual(
+            kinds,
+            [RoundStarted, CardsRevealed, War, FaceDown, CardsRevealed, PotWon],
+        )
+        self.assertEqual(events[0], RoundStarted("A", "B", 3, 3))
+        self.assertEqual(events[2].depth, 1)
+        self.assertEqual(events[-1].winner, 1)
+        self.assertEqual(events[-1].cards, 3)
+        self.assertEqual(events[-1].amount1, 6)
+
+    def test_subscribers_receive_game_over(self):
+        """Subscribers should get every event, ending with GameOver and num_draws."""
+        g = Game()
+        g.start(mode=2, player1="A", player2="B")
+        received = []
+        g.subscribe(received.append)
+        g._Game__players[0].set_hand(CardHand([Card(9, "9", "s", "b")]))
+        g._Game__players[1].set_hand(CardHand([Card(4, "4", "s", "b")]))
+        g.draw_cards()
+        g.draw_cards()
+        self.assertIsInstance(received[-2], PotWon)
+        self.assertEqual(received[-1], GameOver("A", "B", 1))
+
+        g.unsubscribe(received.append)
+        g.cheat()
+        self.assertNotIsInstance(received[-1], CheatUsed)
+
+    def test_draw_cards_prints_nothing_without_subscribers(self):
+        """Without a renderer subscribed no screens should be printed."""
+        g = Game()
+        g.start(mode=2, player1="A", player2="B")
+        captured = io.StringIO()
+        with contextlib.redirect_stdout(captured):
+            g.draw_cards()
+            g.cheat()
+        self.assertEqual(captured.getvalue(), "")
+
+    def test_start_with_seed_deals_same_hands(self):
+        """Games started with the same seed should deal the same hands."""
+        hands = []
+        for _ in range(2):
+            g = Game()
+            g.start(mode=1, player1="A", ai_level="random", seed=99)
+            hands.append([p.get_hand().get_hand() for p in g._Game__players])
+        self.assertEqual(hands[0], hands[1])
+
+    def test_cheat_sets_player1_values_without_touching_deck(self):
+        """cheat should give player 1 cards of value 99 but leave other decks intact."""
+        g = Game()
+        g.start(mode=2, player1="A", player2="B")
+        g.cheat()
+        hand = g._Game__players[0].get_hand().get_hand()
+        self.assertTrue(all(card.get_value() == 99 for card in hand))
+        values = sorted(card.get_value() for card in Deck().get_deck())
+        self.assertEqual(values[-1], 14)
+
+    def test_show_highscore_prints_top_of_leaderboard(self):
+        """show_highscore should print at most LEADERBOARD_SIZE ranked players."""
+        hs = Highscore("test/test_leaderboard.json")
+        hs.set_highscores({f"P{i}": [Statistics(True, i)] for i in range(25)})
+        captured = io.StringIO()
+        with contextlib.redirect_stdout(captured):
+            Game(hs).show_highscore()
+        lines = captured.getvalue().splitlines()
+        self.assertEqual(len(lines), Game.LEADERBOARD_SIZE + 1)
+        self.assertIn("P0", lines[1])
+
+    def test_show_highscore_of_a_period(self):
+        """show_highscore should rank only the games of the given period."""
+        hs = Highscore("test/test_leaderboard.json")
+        hs.set_highscores(
+            {
+                "Old": [Statistics(True, 1, datetime.date(2020, 1, 1))] * 3,
+                "New": [Statistics(True, 1, datetime.date(2026, 10, 2))],
+            }
+        )
+        captured = io.StringIO()
+        with contextlib.redirect_stdout(captured):
+            Game(hs).show_highscore(since=datetime.date(2026, 10, 1))
+        self.assertIn("New", captured.getvalue())
+        self.assertNotIn("Old", captured.getvalue())
+
+    def test_compact_highscores(self):
+        """compact_highscores should compact a ShardedHighscore only."""
+        with tempfile.TemporaryDirectory() as directory:
+            hs = ShardedHighscore(directory)
+            hs.add_player("Ann")
+            hs.add_statistics("Ann", True, 3, datetime.date(2000, 1, 1))
+            hs.add_statistics("Ann", True, 3, datetime.date.today())
+            captured = io.StringIO()
+            with contextlib.redirect_stdout(captured):
+                Game(hs).compact_highscores(30)
+                Game(Highscore("test/test_leaderboard.json")).compact_highscores(30)
+            self.assertIn("Compacted 1 games", captured.getvalue())
+            self.assertIn("can't be compacted", captured.getvalue())
+            self.assertEqual(len(ShardedHighscore(directory).get_days("Ann")), 1)
+
 
 class TestHighscoreExtras(unittest.TestCase):
     def setUp(self):
@@ -151,10 +375,11 @@ class TestHighscoreExtras(unittest.TestCase):
             pass
 
     def tearDown(self):
-        try:
-            os.remove(self.test_filename)
-        except Exception:
-            pass
+        for filename in (self.test_filename, "test/test_extras.lock"):
+            try:
+                os.remove(filename)
+            except Exception:
+                pass
 
     def test_save_and_load_statistics_roundtrip(self):
         """Saving highscores containing Statistics objects should reconstruct Statistics on load."""
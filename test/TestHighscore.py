@@ -1,8 +1,10 @@
 """Unit tests for Highscore persistence and Statistics handling."""
 
-import unittest, os, json, datetime
+import unittest, os, json, datetime, tempfile, time, io, contextlib
+import importlib, multiprocessing, gc
+from unittest.mock import patch
 from war.Highscore import Highscore
-from war.Statistics import Statistics
+from war.Statistics import Statistics, StatisticsColumns
 
 
 class TestHighscore(unittest.TestCase):
@@ -47,6 +49,8 @@ class TestHighscore(unittest.TestCase):
         Checks if it's possible to save a file for default params and a valid filename.
         """
 
+        # Highscores are read on first use, so use them before the file goes
+        self.highscore.get_highscores()
         os.remove(self.test_filename)
         self.highscore.save_highscores()
         self.assertTrue(os.path.exists(self.test_filename))
@@ -157,6 +161,8 @@ class TestHighscore(unittest.TestCase):
 
     def tearDown(self):
         os.remove(self.test_filename)
+        if os.path.exists(self.highscore.get_lock_filename()):
+            os.remove(self.highscore.get_lock_filename())
 
 
 class TestHighscoreExtras(unittest.TestCase):
@@ -169,10 +175,11 @@ class TestHighscoreExtras(unittest.TestCase):
             pass
 
     def tearDown(self):
-        try:
-            os.remove(self.test_filename)
-        except Exception:
-            pass
+        for filename in (self.test_filename, "test/test_extras.lock"):
+            try:
+                os.remove(filename)
+            except Exception:
+                pass
 
     def test_save_and_load_statistics_roundtrip(self):
         """Saving highscores containing Statistics objects should reconstruct Statistics on load."""
@@ -241,5 +248,588 @@ class TestHighscoreExtras(unittest.TestCase):
         self.assertGreaterEqual(len(lst), 1)
 
 
+class TestHighscoreJournal(unittest.TestCase):
+    """Tests for the append-only journal of Highscore."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmp.name, "highscores.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def journal_lines(self, hs):
+        with open(hs.get_journal_filename(), encoding="utf-8") as fh:
+            return fh.readlines()
+
+    def test_changes_persist_without_save(self):
+        """Every change should be replayed from the journal on load."""
+        hs = Highscore(self.filename, journal=True)
+        hs.add_player("Ann")
+        hs.add_player("Ben")
+        hs.add_statistics("Ann", True, 40, datetime.date(2024, 1, 2))
+        hs.add_statistics("Ann", False, 12)
+        hs.remove_statistics("Ann", 1)
+        hs.update_player_name("Ann", "Anna")
+        hs.remove_player("Ben")
+        self.assertFalse(os.path.exists(self.filename))
+        self.assertEqual(len(self.journal_lines(hs)), 7)
+
+        loaded = Highscore(self.filename, journal=True).get_highscores()
+        self.assertEqual(list(loaded), ["Anna"])
+        stat = loaded["Anna"][0]
+        self.assertEqual(len(loaded["Anna"]), 1)
+        self.assertEqual(stat.get_draws(), 40)
+        self.assertEqual(stat.get_date(), datetime.date(2024, 1, 2))
+
+    def test_failed_changes_are_not_journaled(self):
+        """No-ops such as statistics for a missing player should not be written."""
+        hs = Highscore(self.filename, journal=True)
+        hs.add_statistics("Nobody", True, 3)
+        hs.remove_player("Nobody")
+        self.assertFalse(os.path.exists(hs.get_journal_filename()))
+
+    def test_save_compacts_journal(self):
+        """Saving should write the snapshot and empty the journal."""
+        hs = Highscore(self.filename, journal=True)
+        hs.add_player("Cid")
+        hs.add_statistics("Cid", True, 30)
+        hs.save_highscores()
+        self.assertEqual(self.journal_lines(hs), [])
+        with open(self.filename, encoding="utf-8") as fh:
+            self.assertEqual(len(json.load(fh)["Cid"]), 1)
+
+        hs.add_statistics("Cid", False, 20)
+        loaded = Highscore(self.filename, journal=True).get_highscores()
+        self.assertEqual([s.get_draws() for s in loaded["Cid"]], [30, 20])
+
+    def test_compacts_automatically(self):
+        """The journal should be compacted once it holds COMPACT_EVERY records."""
+        hs = Highscore(self.filename, journal=True)
+        hs.COMPACT_EVERY = 3
+        hs.add_player("Dee")
+        hs.add_statistics("Dee", True, 1)
+        self.assertFalse(os.path.exists(self.filename))
+        hs.add_statistics("Dee", True, 2)
+        self.assertTrue(os.path.exists(self.filename))
+        self.assertEqual(self.journal_lines(hs), [])
+
+    def test_damaged_last_record_is_ignored(self):
+        """A partly written record should end the replay without an error."""
+        hs = Highscore(self.filename, journal=True)
+        hs.add_player("Eve")
+        with open(hs.get_journal_filename(), "a", encoding="utf-8") as fh:
+            fh.write('{"op": "add_statis')
+        loaded = Highscore(self.filename, journal=True).get_highscores()
+        self.assertEqual(loaded, {"Eve": []})
+
+    def test_journal_is_off_by_default(self):
+        """Without journal=True nothing but the snapshot should be written."""
+        hs = Highscore(self.filename)
+        hs.add_player("Fay")
+        self.assertFalse(hs.get_journal())
+        self.assertFalse(os.path.exists(hs.get_journal_filename()))
+
+    def test_game_name_change_skips_full_save(self):
+        """A journaled rename from Game should not rewrite the snapshot."""
+        from war.Game import Game
+
+        game = Game(Highscore(self.filename, journal=True))
+        game.start(mode=2, player1="Old", player2="Other")
+        game.name_change("Old", "New")
+        self.assertFalse(os.path.exists(self.filename))
+        loaded = Highscore(self.filename, journal=True).get_highscores()
+        self.assertIn("New", loaded)
+        self.assertNotIn("Old", loaded)
+
+
+class TestHighscoreLeaderboard(unittest.TestCase):
+    """Tests for the leaderboard kept by Highscore."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.highscore = Highscore(os.path.join(self.tmp.name, "highscores.json"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_leaderboard_follows_changes(self):
+        """Every change to the highscores should update the leaderboard."""
+        hs = self.highscore
+        hs.add_player("Ann", [Statistics(True, 30)])
+        hs.add_player("Ben")
+        hs.add_statistics("Ben", True, 10)
+        hs.add_statistics("Ben", True, 20)
+        self.assertEqual(hs.get_leaderboard().top(1)[0].name, "Ben")
+
+        hs.remove_statistics("Ben", 0)
+        hs.remove_statistics("Ben", 0)
+        hs.update_player_name("Ann", "Anna")
+        self.assertEqual(hs.get_leaderboard().top(1)[0].name, "Anna")
+        hs.remove_player("Anna")
+        self.assertEqual([s.name for s in hs.get_leaderboard().top()], ["Ben"])
+
+    def test_leaderboard_is_rebuilt_on_load(self):
+        """Loading and replacing the highscores should rebuild the leaderboard."""
+        self.highscore.add_player("Ann", [Statistics(True, 30)])
+        self.highscore.save_highscores()
+        loaded = Highscore(self.highscore.get_filename())
+        self.assertEqual(loaded.get_leaderboard().get_standing("Ann").wins, 1)
+        loaded.set_highscores({"Ben": []})
+        self.assertEqual(len(loaded.get_leaderboard()), 1)
+
+    def test_columnar_negative_draws(self):
+        """A columnar store should take the draws the list store takes."""
+        for columnar in (False, True):
+            hs = Highscore(
+                os.path.join(self.tmp.name, f"{columnar}.json"), columnar=columnar
+            )
+            hs.add_player("Ann")
+            hs.add_statistics("Ann", True, -1, datetime.date(2024, 1, 2))
+            self.assertEqual(hs.get_highscores()["Ann"][0].get_draws(), -1)
+
+    def test_columnar_histories(self):
+        """Columnar highscores should keep histories in StatisticsColumns."""
+        filename = os.path.join(self.tmp.name, "columnar.json")
+        hs = Highscore(filename, journal=True, columnar=True)
+        hs.add_player("Ann", [Statistics(True, 30)])
+        hs.add_statistics("Ann", False, 12, datetime.date(2024, 1, 2))
+        hs.remove_statistics("Ann", 0)
+        hs.update_player_name("Nobody", "Ben")
+        self.assertIsInstance(hs.get_highscores()["Ann"], StatisticsColumns)
+        self.assertIsInstance(hs.get_highscores()["Ben"], StatisticsColumns)
+
+        replayed = Highscore(filename, journal=True, columnar=True)
+        history = replayed.get_highscores()["Ann"]
+        self.assertIsInstance(history, StatisticsColumns)
+        self.assertEqual([s.get_draws() for s in history], [12])
+        replayed.save_highscores()
+
+        loaded = Highscore(filename, columnar=True)
+        self.assertEqual(loaded.get_highscores()["Ann"], history)
+        standing = loaded.get_leaderboard().get_standing("Ann")
+        self.assertEqual((standing.games, standing.wins), (1, 0))
+
+
+class TestHighscoreCache(unittest.TestCase):
+    """Tests for lazy loading and the shared store cache of Highscore."""
+
+    def setUp(self):
+        Highscore.clear_cache()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmp.name, "highscores.json")
+        with open(self.filename, "w", encoding="utf-8") as fh:
+            json.dump({"Ann": [{"has_won": True, "draws": 30, "date": None}]}, fh)
+
+    def tearDown(self):
+        Highscore.clear_cache()
+        self.tmp.cleanup()
+
+    def touch(self):
+        """Give the file a new modification time, as a real edit would."""
+        stat = os.stat(self.filename)
+        os.utime(self.filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    def test_parsed_on_first_use(self):
+        """Creating a Highscore should not parse the file yet."""
+        hs = Highscore(self.filename)
+        self.assertIsNone(hs._Highscore__store)
+        self.assertIn("Ann", hs.get_highscores())
+
+    def test_nothing_is_read_on_creation(self):
+        """Creating a Highscore should not open or look up the file."""
+        with patch("builtins.open", side_effect=AssertionError("opened")):
+            with patch("war.Highscore.os.stat", side_effect=AssertionError("stat")):
+                hs = Highscore(self.filename)
+        self.assertIn("Ann", hs.get_highscores())
+
+    def test_unchanged_file_shares_store(self):
+        """Highscores of an unchanged file should share one parsed store."""
+        first = Highscore(self.filename)
+        second = Highscore(self.filename)
+        self.assertIs(first.get_highscores(), second.get_highscores())
+        self.assertIs(first.get_leaderboard(), second.get_leaderboard())
+
+        third = Highscore(self.filename, columnar=True)
+        self.assertIsNot(third.get_highscores(), first.get_highscores())
+
+    def test_changed_file_is_loaded_again(self):
+        """A file changed on disk should be parsed again."""
+        first = Highscore(self.filename)
+        first.get_highscores()
+        with open(self.filename, "w", encoding="utf-8") as fh:
+            json.dump({"Ben": []}, fh)
+        self.touch()
+        self.assertEqual(list(Highscore(self.filename).get_highscores()), ["Ben"])
+
+    def test_unsaved_changes_leave_the_cache(self):
+        """Changes should only be shared with new Highscores once saved."""
+        first = Highscore(self.filename)
+        first.add_player("Ben")
+        self.assertNotIn("Ben", Highscore(self.filename).get_highscores())
+
+        first.save_highscores()
+        self.assertIs(Highscore(self.filename).get_highscores(), first.get_highscores())
+
+    def test_sharers_see_a_replacement(self):
+        """set_highscores should replace the store of every Highscore sharing it."""
+        first = Highscore(self.filename)
+        second = Highscore(self.filename)
+        self.assertIs(first.get_highscores(), second.get_highscores())
+        second.add_player("Ben")
+        first.set_highscores({"Dee": []})
+        self.assertEqual(second.get_highscores(), {"Dee": []})
+        self.assertEqual(second.get_leaderboard().top(5)[0].name, "Dee")
+        second.save_highscores()
+        with open(self.filename, encoding="utf-8") as fh:
+            self.assertEqual(json.load(fh), {"Dee": []})
+
+    def test_sharers_share_the_change_log(self):
+        """A save through one sharer should write the other's changes."""
+        first = Highscore(self.filename)
+        second = Highscore(self.filename)
+        first.get_highscores()
+        second.add_statistics("Ann", False, 4)
+        first.save_highscores()
+        # Written by first, so the change is no longer pending for second
+        self.assertEqual(second._Highscore__store.changes, [])
+        self.assertIs(Highscore(self.filename).get_highscores(), first.get_highscores())
+
+    def test_journaled_changes_stay_cached(self):
+        """With a journal every change is on disk, so the store stays shared."""
+        first = Highscore(self.filename, journal=True)
+        first.add_player("Ben")
+        second = Highscore(self.filename, journal=True)
+        self.assertIs(second.get_highscores(), first.get_highscores())
+
+
+class TestHighscoreWriteBehind(unittest.TestCase):
+    """Tests for request_save and the atomic writes of Highscore."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmp.name, "highscores.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def saved(self):
+        with open(self.filename, encoding="utf-8") as fh:
+            return json.load(fh)
+
+    def test_request_save_returns_before_writing(self):
+        """request_save should leave the write to flush or the writer thread."""
+        hs = Highscore(self.filename, save_delay=60)
+        hs.add_player("Ann")
+        hs.request_save()
+        self.assertFalse(os.path.exists(self.filename))
+        hs.flush()
+        self.assertEqual(self.saved(), {"Ann": []})
+        hs.close()
+
+    def test_burst_of_requests_is_one_write(self):
+        """Requests within the save delay should be coalesced into one write."""
+        hs = Highscore(self.filename, save_delay=0.2)
+        with patch("war.Highscore.os.replace", side_effect=os.replace) as replace:
+            for name in ["Ann", "Ben", "Cid"]:
+                hs.add_player(name)
+                hs.request_save()
+            hs.close()
+        self.assertEqual(replace.call_count, 1)
+        self.assertEqual(set(self.saved()), {"Ann", "Ben", "Cid"})
+
+    def test_writer_saves_after_delay(self):
+        """Without flush the writer thread should save once the delay passed."""
+        hs = Highscore(self.filename, save_delay=0.01)
+        hs.add_player("Ann")
+        hs.request_save()
+        for _ in range(200):
+            if os.path.exists(self.filename):
+                break
+            time.sleep(0.01)
+        hs.close()
+        self.assertEqual(self.saved(), {"Ann": []})
+
+    def test_close_can_be_followed_by_new_requests(self):
+        """A request after close should start a new writer."""
+        hs = Highscore(self.filename, save_delay=0)
+        hs.request_save()
+        hs.close()
+        hs.add_player("Ann")
+        hs.request_save()
+        hs.close()
+        self.assertEqual(self.saved(), {"Ann": []})
+
+    def test_dropped_highscore_stops_its_writer(self):
+        """The writer thread should end once its Highscore is dropped."""
+        hs = Highscore(self.filename, save_delay=0)
+        hs.add_player("Ann")
+        hs.request_save()
+        hs.flush()
+        writer = hs._Highscore__writer
+        del hs
+        gc.collect()
+        writer.join(5)
+        self.assertFalse(writer.is_alive())
+        self.assertEqual(self.saved(), {"Ann": []})
+
+    def test_writers_are_closed_at_exit(self):
+        """A save still waiting for its delay should be written at exit."""
+        hs = Highscore(self.filename, save_delay=60)
+        hs.add_player("Ann")
+        hs.request_save()
+        importlib.import_module("war.Highscore")._close_writers()
+        self.assertEqual(self.saved(), {"Ann": []})
+        self.assertIsNone(hs._Highscore__writer)
+
+    def test_save_replaces_file_atomically(self):
+        """A save should keep the file mode and leave no temporary files."""
+        hs = Highscore(self.filename)
+        hs.save_highscores()
+        os.chmod(self.filename, 0o640)
+        hs.add_player("Ann")
+        hs.save_highscores()
+        self.assertEqual(
+            sorted(os.listdir(self.tmp.name)), ["highscores.json", "highscores.lock"]
+        )
+        self.assertEqual(os.stat(self.filename).st_mode & 0o777, 0o640)
+
+    def test_failed_write_keeps_old_file(self):
+        """If serializing fails, the old file should be left as it was."""
+        hs = Highscore(self.filename)
+        hs.add_player("Ann")
+        hs.save_highscores()
+        hs.add_player("Ben", [object()])
+        hs.save_highscores()
+        self.assertEqual(self.saved(), {"Ann": []})
+        self.assertEqual(
+            sorted(os.listdir(self.tmp.name)), ["highscores.json", "highscores.lock"]
+        )
+
+
+class TestHighscoreStreaming(unittest.TestCase):
+    """Tests for the streaming loader of Highscore."""
+
+    DATA = {
+        "Ann": [
+            {"has_won": True, "draws": 30, "date": "2024-01-02"},
+            {"has_won": False, "draws": 12345678, "date": "2024-01-02"},
+            {"has_won": 1, "draws": "7", "date": None},
+        ],
+        "Ben": [],
+        "Cid": [1, {"draws": 4}, "text"],
+        "Dan": 5,
+    }
+
+    def setUp(self):
+        Highscore.clear_cache()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmp.name, "highscores.json")
+        with open(self.filename, "w", encoding="utf-8") as fh:
+            json.dump(self.DATA, fh, indent=1)
+
+    def tearDown(self):
+        Highscore.clear_cache()
+        self.tmp.cleanup()
+
+    def check(self, highscores):
+        """The loaded highscores should match DATA read the old way."""
+        ann = highscores["Ann"]
+        self.assertEqual(
+            [s.to_dict() for s in ann],
+            [
+                {"has_won": True, "draws": 30, "date": "2024-01-02"},
+                {"has_won": False, "draws": 12345678, "date": "2024-01-02"},
+                {"has_won": True, "draws": 7, "date": None},
+            ],
+        )
+        self.assertEqual(list(highscores["Ben"]), [])
+        self.assertEqual(highscores["Cid"][0], 1)
+        self.assertEqual(highscores["Cid"][1].get_draws(), 4)
+        self.assertEqual(highscores["Cid"][2], "text")
+        self.assertEqual(highscores["Dan"], 5)
+
+    def test_small_chunks(self):
+        """Records and numbers split over chunks should load correctly."""
+        for chunk in [1, 7, 1 << 16]:
+            for columnar in [False, True]:
+                Highscore.clear_cache()
+                with patch("war.Highscore._JsonStream.CHUNK", chunk):
+                    hs = Highscore(self.filename, columnar=columnar)
+                    self.check(hs.get_highscores())
+
+    def test_dates_are_parsed_once(self):
+        """Equal date strings should share one date object."""
+        ann = Highscore(self.filename).get_highscores()["Ann"]
+        self.assertIs(ann[0].get_date(), ann[1].get_date())
+
+    def test_file_is_read_on_first_use(self):
+        """The file should only be read when it is parsed."""
+        hs = Highscore(self.filename)
+        with open(self.filename, "w", encoding="utf-8") as fh:
+            json.dump(self.DATA, fh)
+        self.check(hs.get_highscores())
+
+    def test_progress(self):
+        """Progress should be reported up to the file size."""
+        reports = []
+        with patch("war.Highscore._JsonStream.CHUNK", 16):
+            Highscore(self.filename).load_highscores(
+                progress=lambda done, size: reports.append((done, size))
+            )
+        size = os.path.getsize(self.filename)
+        self.assertGreater(len(reports), 1)
+        self.assertEqual(reports[-1], (size, size))
+
+    def test_large_files_print_progress(self):
+        """Files over PROGRESS_BYTES should print their loading progress."""
+        captured = io.StringIO()
+        with patch.object(Highscore, "PROGRESS_BYTES", 0):
+            with contextlib.redirect_stdout(captured):
+                Highscore(self.filename).get_highscores()
+        self.assertIn("Loading highscores: 100%", captured.getvalue())
+
+    def test_damaged_file_loads_empty(self):
+        """A file that isn't a complete JSON object should load as empty."""
+        for text in ['{"Ann": [{"has_won": true', "[1, 2]", '{"Ann": [] "Ben": []}']:
+            Highscore.clear_cache()
+            with open(self.filename, "w", encoding="utf-8") as fh:
+                fh.write(text)
+            self.assertEqual(Highscore(self.filename).get_highscores(), {})
+
+
+def _play_games(filename, games):
+    """Add and save games one at a time, as a separate process would."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        hs = Highscore(filename)
+        for draws in range(games):
+            hs.add_statistics("Ann", True, draws)
+            hs.save_highscores()
+
+
+class TestHighscoreMerge(unittest.TestCase):
+    """Tests for the locked, merging saves of Highscore."""
+
+    def setUp(self):
+        Highscore.clear_cache()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmp.name, "highscores.json")
+        with open(self.filename, "w", encoding="utf-8") as fh:
+            json.dump({"Ann": [], "Ben": []}, fh)
+
+    def tearDown(self):
+        Highscore.clear_cache()
+        self.tmp.cleanup()
+
+    def saved(self):
+        with open(self.filename, encoding="utf-8") as fh:
+            return json.load(fh)
+
+    def separate(self, **options):
+        """Return a loaded Highscore that shares nothing with the others."""
+        Highscore.clear_cache()
+        hs = Highscore(self.filename, **options)
+        hs.get_highscores()
+        return hs
+
+    def test_saves_keep_each_others_games(self):
+        """Two Highscores saving one after the other should lose no games."""
+        first, second = self.separate(), self.separate()
+        first.add_statistics("Ann", True, 1)
+        second.add_statistics("Ben", False, 2)
+        second.add_player("Cid")
+        first.save_highscores()
+        second.save_highscores()
+        saved = self.saved()
+        self.assertEqual(len(saved["Ann"]), 1)
+        self.assertEqual(len(saved["Ben"]), 1)
+        self.assertEqual(saved["Cid"], [])
+        self.assertEqual(len(second.get_highscores()["Ann"]), 1)
+        self.assertEqual(second.get_leaderboard().get_standing("Ann").wins, 1)
+
+    def test_merge_replays_renames_and_removals(self):
+        """Renames and removals should be replayed onto the saved file."""
+        first, second = self.separate(), self.separate()
+        first.add_statistics("Ben", True, 3)
+        first.save_highscores()
+        second.update_player_name("Ben", "Bea")
+        second.remove_player("Ann")
+        second.save_highscores()
+        saved = self.saved()
+        self.assertEqual(list(saved), ["Bea"])
+        self.assertEqual(saved["Bea"][0]["draws"], 3)
+
+    def test_merge_removes_statistics_by_content(self):
+        """A replayed removal should remove the same game, not the same index."""
+        setup = self.separate()
+        for draws in (1, 2, 3):
+            setup.add_statistics("Ann", True, draws)
+        setup.save_highscores()
+        first, second = self.separate(), self.separate()
+        first.remove_statistics("Ann", 0)
+        first.save_highscores()
+        second.remove_statistics("Ann", 1)
+        second.save_highscores()
+        self.assertEqual([s["draws"] for s in self.saved()["Ann"]], [3])
+
+    def test_merge_skips_a_game_removed_by_both(self):
+        """A game another process already removed should not cost another."""
+        setup = self.separate()
+        for draws in (1, 2):
+            setup.add_statistics("Ann", True, draws)
+        setup.save_highscores()
+        first, second = self.separate(), self.separate()
+        first.remove_statistics("Ann", 0)
+        first.save_highscores()
+        second.remove_statistics("Ann", 0)
+        second.save_highscores()
+        self.assertEqual([s["draws"] for s in self.saved()["Ann"]], [2])
+
+    def test_change_log_is_emptied_by_save(self):
+        """A change should be merged by the first save that writes it only."""
+        first, second = self.separate(), self.separate()
+        first.add_statistics("Ann", True, 1)
+        first.save_highscores()
+        second.add_statistics("Ann", True, 2)
+        second.save_highscores()
+        first.save_highscores()
+        self.assertEqual([s["draws"] for s in self.saved()["Ann"]], [1, 2])
+
+    def test_set_highscores_is_not_merged(self):
+        """A replacement should be saved as it is."""
+        first, second = self.separate(), self.separate()
+        first.add_statistics("Ann", True, 1)
+        first.save_highscores()
+        second.set_highscores({"Dee": []})
+        second.save_highscores()
+        self.assertEqual(self.saved(), {"Dee": []})
+
+    def test_journals_are_merged_on_compaction(self):
+        """Journal records of both Highscores should survive a compaction."""
+        first = self.separate(journal=True)
+        second = self.separate(journal=True)
+        first.add_statistics("Ann", True, 1)
+        second.add_statistics("Ben", True, 2)
+        second.save_highscores()
+        saved = self.saved()
+        self.assertEqual((len(saved["Ann"]), len(saved["Ben"])), (1, 1))
+
+    @unittest.skipIf(
+        importlib.import_module("war.Highscore").fcntl is None,
+        "advisory locks need fcntl",
+    )
+    def test_processes_lose_no_games(self):
+        """Processes saving the same file at once should keep every game."""
+        processes = [
+            multiprocessing.Process(target=_play_games, args=(self.filename, 20))
+            for _ in range(3)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        self.assertEqual(len(self.saved()["Ann"]), 60)
+
+
 if __name__ == "__main__":
     unittest.main()
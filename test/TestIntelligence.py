@@ -1,5 +1,6 @@
 """Unit tests for AI behaviour (Intelligence class)."""
 
+import random
 import unittest
 
 from war.Intelligence import Intelligence
@@ -139,6 +140,91 @@ class TestIntelligence(unittest.TestCase):
             idx = ai.choose_index()
             self.assertIn(idx, range(5))
 
+    def test_seeded_random_choices_repeat(self):
+        """Two AIs with the same seed should make the same random choices."""
+        from war.Card import Card
+
+        class FakeHand:
+            def __init__(self, cards):
+                self._cards = cards
+
+            def getHand(self):
+                return list(self._cards)
+
+        cards = [Card(i, str(i), "S", "black") for i in range(10)]
+        choices = []
+        for _ in range(2):
+            ai = Intelligence(level="random", rng=11)
+            ai.set_hand(FakeHand(cards))
+            choices.append([ai.choose_index() for _ in range(15)])
+        self.assertEqual(choices[0], choices[1])
+
+    def test_levels_use_a_cardhand(self):
+        """Greedy and random should read a real CardHand, not only getHand."""
+        from war.Card import Card
+        from war.CardHand import CardHand
+
+        cards = [Card(v, str(v), "S", "black") for v in (4, 12, 7, 12)]
+        ai = Intelligence(level="greedy", hand=CardHand(cards))
+        self.assertEqual(ai.choose_index(), 1)
+        ai.get_hand().draw_card(1)
+        self.assertEqual(ai.choose_index(), 2)
+        ai.set_level("random")
+        ai.rng = random.Random(3)
+        self.assertEqual({ai.choose_index() for _ in range(50)}, {0, 1, 2})
+
+    def test_reveal_counts_each_card_once(self):
+        """Revealed cards should be counted once, whatever else is revealed."""
+        from war.Card import CARD_TABLE, Card
+
+        ai = Intelligence(level="counting")
+        ai.reveal(CARD_TABLE[12], CARD_TABLE[25])
+        ai.reveal(CARD_TABLE[12], Card(99, "?", "Spades", "black"))
+        self.assertEqual(ai.seen, 1 << 12 | 1 << 25)
+        self.assertEqual(ai.unseen[14], 2)
+        self.assertEqual(sum(ai.unseen), 50)
+
+    def test_counting_plays_lowest_card_that_wins(self):
+        """Counting should give up its lowest card or win with its lowest card."""
+        from war.Card import CARD_TABLE
+        from war.CardHand import CardHand
+
+        king, five, three = CARD_TABLE[11], CARD_TABLE[3], CARD_TABLE[1]
+        ai = Intelligence(level="counting", hand=CardHand([king, five, three]))
+        ai.reveal(*[card for card in CARD_TABLE if card.value != 14])
+        self.assertEqual(ai.choose_index(), 2)
+
+        ai = Intelligence(level="counting", hand=CardHand([king, five, three]))
+        ai.reveal(*[card for card in CARD_TABLE if card.value != 2])
+        self.assertEqual(ai.choose_index(), 2)
+        ai.set_hand(CardHand([king, five]))
+        self.assertEqual(ai.choose_index(), 1)
+
+    def test_counting_keeps_high_cards_it_would_lose(self):
+        """Counting should risk a low card rather than a king it may lose."""
+        from war.Card import CARD_TABLE
+        from war.CardHand import CardHand
+
+        # The king beats a queen or a 3 and the 4 only a 3, but an ace would
+        # take the king
+        king, four = CARD_TABLE[11], CARD_TABLE[2]
+        ai = Intelligence(level="counting", hand=CardHand([king, four]))
+        ai.reveal(*[card for card in CARD_TABLE if card.value not in (3, 12, 14)])
+        self.assertEqual(ai.choose_index(), 1)
+        ai.set_level("greedy")
+        self.assertEqual(ai.choose_index(), 0)
+
+    def test_counting_wins_more_than_greedy(self):
+        """On the same deals, counting should win at least 2% more games."""
+        from war.Simulation import _run_chunk
+
+        wins = {"greedy": 0, "counting": 0}
+        for level in wins:
+            for opponent in (None, "random"):  # None draws from the top
+                summary = _run_chunk(500, level, seed=1, ai_level1=opponent)
+                wins[level] += summary.wins[2]
+        self.assertGreaterEqual(wins["counting"], wins["greedy"] + 20)
+
 
 if __name__ == "__main__":
     unittest.main()
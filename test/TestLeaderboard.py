@@ -0,0 +1,183 @@
+"""Unit tests for the leaderboard aggregates (war/Leaderboard.py)."""
+
+import datetime
+import unittest
+
+from war.Leaderboard import Leaderboard
+from war.Statistics import Statistics
+
+
+class TestLeaderboard(unittest.TestCase):
+    """Tests for Leaderboard."""
+
+    def setUp(self):
+        self.board = Leaderboard()
+        self.board.load(
+            {
+                "Ann": [Statistics(True, 30), Statistics(False, 50)],
+                "Ben": [Statistics(True, 40), Statistics(True, 20)],
+                "Cid": [],
+            }
+        )
+
+    def test_ranks_by_wins_then_win_rate(self):
+        """Players should be ordered by wins, then win rate."""
+        self.board.add_statistics("Cid", True, 10)
+        names = [standing.name for standing in self.board.top()]
+        self.assertEqual(names, ["Ben", "Cid", "Ann"])
+        self.assertEqual(len(self.board.top(1)), 1)
+
+    def test_aggregates(self):
+        """Standings should hold games, wins, win rate and fewest draws."""
+        ann = self.board.get_standing("Ann")
+        self.assertEqual((ann.rank, ann.games, ann.wins), (2, 2, 1))
+        self.assertAlmostEqual(ann.win_rate, 0.5)
+        self.assertEqual(ann.fewest_draws, 30)
+        self.assertEqual(self.board.get_standing("Ben").fewest_draws, 20)
+        self.assertIsNone(self.board.get_standing("Nobody"))
+
+    def test_removing_a_game_updates_minimum_and_last_played(self):
+        """Removing the best game or latest date should find the next one."""
+        first, second = datetime.date(2024, 1, 1), datetime.date(2024, 2, 1)
+        self.board.add_statistics("Ann", True, 10, second)
+        self.board.add_statistics("Ann", False, 10, first)
+        self.assertEqual(self.board.get_standing("Ann").last_played, second)
+
+        self.board.remove_statistics("Ann", True, 10, second)
+        ann = self.board.get_standing("Ann")
+        self.assertEqual((ann.fewest_draws, ann.last_played), (30, first))
+        self.assertEqual(ann.games, 3)
+
+    def test_rename_and_remove(self):
+        """Renamed players keep their games; removed players disappear."""
+        self.board.update_player_name("Ben", "Bea")
+        self.assertEqual(self.board.top(1)[0].name, "Bea")
+        self.board.remove_player("Bea")
+        self.assertEqual([s.name for s in self.board.top()], ["Ann", "Cid"])
+        self.board.update_player_name("Nobody", "Dan")
+        self.assertEqual(len(self.board), 3)
+
+    def test_rename_onto_an_existing_player(self):
+        """Renaming onto a taken name should replace that player once."""
+        self.board.update_player_name("Ann", "Ben")
+        standings = self.board.top()
+        self.assertEqual([s.name for s in standings], ["Ben", "Cid"])
+        self.assertEqual((standings[0].games, standings[0].wins), (2, 1))
+        self.board.remove_player("Ben")
+        self.assertEqual([s.name for s in self.board.top()], ["Cid"])
+
+    def test_load_counts(self):
+        """Grouped counts should give the same aggregates as single games."""
+        board = Leaderboard()
+        board.load_counts(
+            ["Ann", "Ben"], [("Ann", 1, 30, "2024-03-01", 4), ("Ann", 0, 9, None, 2)]
+        )
+        ann = board.get_standing("Ann")
+        self.assertEqual((ann.games, ann.wins, ann.fewest_draws), (6, 4, 30))
+        self.assertEqual(ann.last_played, datetime.date(2024, 3, 1))
+        self.assertEqual(board.get_standing("Ben").games, 0)
+
+    def test_table(self):
+        """The table should have a header and one line per shown player."""
+        lines = self.board.table(2).splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertIn("Ben", lines[1])
+        self.assertIn("100.0%", lines[1])
+        self.assertEqual(Leaderboard().table(), "No highscores yet.")
+
+
+class TestLeaderboardWindow(unittest.TestCase):
+    """Tests for the time-windowed standings of Leaderboard."""
+
+    def setUp(self):
+        self.board = Leaderboard()
+        self.start = datetime.date(2024, 1, 1)  # A Monday
+        games = {"Ann": [], "Ben": []}
+        for offset in range(90):
+            day = self.start + datetime.timedelta(days=offset)
+            games["Ann"].append(Statistics(offset < 30, offset, day))
+            games["Ben"].append(Statistics(offset >= 60, 100 - offset, day))
+        games["Ann"].append(Statistics(True, 0))  # Undated: all-time only
+        self.board.load(games)
+
+    def brute_force(self, since, until):
+        """Rank the games of a period by scanning every one of them."""
+        totals = {}
+        for offset in range(90):
+            day = self.start + datetime.timedelta(days=offset)
+            if since <= day <= until:
+                for name, won in (("Ann", offset < 30), ("Ben", offset >= 60)):
+                    totals.setdefault(name, [0, 0])
+                    totals[name][0] += 1
+                    totals[name][1] += won
+        return sorted(totals.items(), key=lambda item: (-item[1][1], item[0]))
+
+    def test_windows_match_a_scan_of_every_game(self):
+        """Windows of any length and alignment should count their games only."""
+        for first, last in [(0, 0), (3, 17), (0, 30), (31, 59), (10, 89), (0, 89)]:
+            since = self.start + datetime.timedelta(days=first)
+            until = self.start + datetime.timedelta(days=last)
+            standings = self.board.window(since, until)
+            self.assertEqual(
+                [(s.name, [s.games, s.wins]) for s in standings],
+                self.brute_force(since, until),
+            )
+
+    def test_window_aggregates(self):
+        """A window should report its own fewest draws and last day played."""
+        january = self.board.window(
+            datetime.date(2024, 1, 1), datetime.date(2024, 1, 31)
+        )
+        ann = january[0]
+        self.assertEqual((ann.name, ann.games, ann.wins), ("Ann", 31, 30))
+        self.assertEqual(ann.fewest_draws, 0)
+        self.assertEqual(ann.last_played, datetime.date(2024, 1, 31))
+        later = self.board.window(since=datetime.date(2024, 3, 1))
+        self.assertEqual([s.name for s in later], ["Ben", "Ann"])
+        self.assertEqual(later[0].fewest_draws, 11)
+        self.assertEqual(self.board.window(until=datetime.date(2023, 1, 1)), [])
+
+    def test_rename_onto_an_existing_player_replaces_its_buckets(self):
+        """Windows should only count the renamed player's games afterwards."""
+        day = datetime.date(2024, 6, 1)  # After every game of Ann and Ben
+        self.board.add_statistics("Ben", True, 5, day)
+        self.board.window()
+        self.board.update_player_name("Ann", "Ben")
+        june = self.board.window(day, day)
+        self.assertEqual(june, [])
+        january = self.board.window(
+            datetime.date(2024, 1, 1), datetime.date(2024, 1, 31)
+        )
+        self.assertEqual([(s.name, s.games) for s in january], [("Ben", 31)])
+
+    def test_changes_after_a_window_update_the_buckets(self):
+        """Games, renames and removals after the first window should count."""
+        day = datetime.date(2024, 2, 14)
+        self.board.window()
+        self.board.add_statistics("Cid", True, 5, day)
+        self.board.add_player("Cid")
+        self.board.add_statistics("Cid", True, 5, day)
+        self.board.add_statistics("Cid", True, 6, day)
+        self.board.remove_statistics("Ann", False, 44, day)
+        self.board.update_player_name("Ben", "Bea")
+        february = self.board.window(
+            datetime.date(2024, 2, 1), datetime.date(2024, 2, 29)
+        )
+        self.assertEqual(
+            [(s.name, s.games) for s in february],
+            [("Cid", 2), ("Ann", 28), ("Bea", 29)],
+        )
+        self.board.remove_player("Cid")
+        self.assertEqual(self.board.window(day, day)[0].name, "Bea")
+
+    def test_table_of_a_period(self):
+        """The table of an empty period should say so."""
+        self.assertIn("Ann", self.board.table(since=datetime.date(2024, 1, 1)))
+        self.assertEqual(
+            self.board.table(since=datetime.date(2030, 1, 1)),
+            "No games in this period.",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+"""Unit tests for the Monte Carlo lookahead (war/Lookahead.py)."""
+
+import os
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from war.Card import CARD_TABLE
+from war.CardHand import CardHand
+from war.Deck import Deck
+from war.Engine import CAPPED, Engine
+from war.Game import Game
+from war.Highscore import Highscore
+from war.Intelligence import Intelligence
+from war.Lookahead import Lookahead
+from war.Player import Player
+
+
+class CountingPool:
+    """Pool that plays tasks in this thread and counts them."""
+
+    def __init__(self):
+        self.tasks = 0
+
+    def map(self, function, tasks):
+        self.tasks += len(tasks)
+        return [function(task) for task in tasks]
+
+
+class TestLookahead(unittest.TestCase):
+    """Tests for Lookahead.choose."""
+
+    def test_trivial_hands(self):
+        """An empty hand has no choice and a hand of one value plays its top."""
+        lookahead = Lookahead(rng=1)
+        self.assertIsNone(lookahead.choose([]))
+        self.assertEqual(lookahead.choose([CARD_TABLE[3], CARD_TABLE[16]]), 0)
+
+    def test_dominating_move_stops_early(self):
+        """Against a single ace only an ace wins at once, which ends the search."""
+        # Every card but the ace of spades, aces last
+        hand = sorted(CARD_TABLE[:12] + CARD_TABLE[13:], key=lambda card: card.value)
+        pool = CountingPool()
+        lookahead = Lookahead(budget=10, horizon=1, pool=pool, rng=1)
+        self.assertEqual(hand[lookahead.choose(hand)].value, 14)
+        self.assertLess(pool.tasks * lookahead.batch, lookahead.max_rollouts)
+
+    def test_keeps_highest_card_without_a_clear_edge(self):
+        """Moves that are only as good as the highest card don't replace it."""
+        # The opponent holds the ten of spades, so every higher card wins
+        hand = [card for card in CARD_TABLE if card is not CARD_TABLE[8]]
+        index = Lookahead(budget=10, max_rollouts=400, rng=1).choose(hand)
+        self.assertEqual(index, hand.index(CARD_TABLE[12]))
+
+    def test_budget_is_kept(self):
+        """A decision on a full hand should take about the budget."""
+        hand = Deck(rng=5).split()[0]
+        start = time.perf_counter()
+        index = Lookahead(budget=0.02, rng=5).choose(hand, [])
+        self.assertLess(time.perf_counter() - start, 0.1)
+        self.assertIn(index, range(len(hand)))
+
+    def test_pool_gives_the_same_choice(self):
+        """With enough budget a pool should play the same rollouts as a loop."""
+        hand = Deck(rng=8).split()[1]
+        serial = Lookahead(budget=10, max_rollouts=104, horizon=30, rng=3)
+        with ThreadPoolExecutor(2) as executor:
+            pooled = Lookahead(
+                budget=10, max_rollouts=104, horizon=30, pool=executor, rng=3
+            )
+            self.assertEqual(pooled.choose(hand), serial.choose(hand))
+
+    def test_single_round_has_no_standard_error(self):
+        """A batch as large as min_rollouts gives one round, never a winner."""
+        hand = Deck(rng=4).split()[0]
+        lookahead = Lookahead(budget=10, batch=16, min_rollouts=16, rng=4)
+        self.assertFalse(lookahead._beats([1.0], [0.0]))
+        self.assertIn(lookahead.choose(hand), range(len(hand)))
+
+    def test_rollout_budget_ignores_the_clock(self):
+        """With a rollout budget a decision plays that many rollouts, however long."""
+        hand = Deck(rng=6).split()[0]
+        counted = Lookahead(budget=0, rollouts=48, rng=6)
+        timed = Lookahead(budget=10, max_rollouts=48, rng=6)
+        self.assertEqual(counted.choose(hand), timed.choose(hand))
+
+
+class TestLookaheadLevel(unittest.TestCase):
+    """Tests for the 'lookahead' level of Intelligence."""
+
+    def test_level_uses_the_lookahead(self):
+        """The level should pick a card from the hand with its Lookahead."""
+        hand = CardHand(Deck(rng=2).split()[0])
+        ai = Intelligence(hand=hand, level="lookahead", rng=2)
+        self.assertEqual(ai.get_level(), "lookahead")
+        ai.lookahead = Lookahead(budget=0.01, rng=2)
+        self.assertIn(ai.choose_index(), range(26))
+        self.assertIsInstance(Intelligence(rng=1).get_lookahead(), Lookahead)
+
+    def test_seeded_level_counts_rollouts(self):
+        """A seeded AI should use a rollout budget, an unseeded one the clock."""
+        self.assertEqual(
+            Intelligence(rng=1).get_lookahead().rollouts, Lookahead.ROLLOUTS
+        )
+        self.assertIsNone(Intelligence().get_lookahead().rollouts)
+
+    def test_pool_reaches_the_lookahead(self):
+        """A pool given to Game.start should play the AI's rollouts."""
+        pool = CountingPool()
+        with tempfile.TemporaryDirectory() as directory:
+            game = Game(Highscore(os.path.join(directory, "highscores.json")))
+        game.start(
+            mode=3, ai_level="lookahead", ai_level1="lookahead", seed=1, pool=pool
+        )
+        for player in game._Game__players:
+            self.assertIs(player.get_lookahead().pool, pool)
+
+    def test_plays_as_strong_as_greedy(self):
+        """On the same deals against 'top', lookahead should win like greedy."""
+        wins = {"random": 0, "greedy": 0, "lookahead": 0}
+        for seed in range(20):
+            hands = Deck(rng=seed).split()
+            for level in wins:
+                ai = Intelligence(
+                    "AI",
+                    CardHand(hands[1]),
+                    level=level,
+                    rng=seed,
+                    lookahead=Lookahead(rollouts=16, horizon=20, rng=seed),
+                )
+                top = Player("Top", CardHand(hands[0]))
+                wins[level] += Engine(top, ai, max_rounds=1000).run().winner == 2
+        self.assertGreaterEqual(wins["lookahead"], wins["greedy"])
+        self.assertGreater(wins["lookahead"], wins["random"] + 5)
+
+    def test_engine_skips_cycle_detection(self):
+        """Sampled decisions have no fixed next position, like random play."""
+        p1 = Player("A", CardHand([CARD_TABLE[3], CARD_TABLE[7]]))
+        p2 = Intelligence("B", CardHand([CARD_TABLE[16]]), level="lookahead")
+        self.assertEqual(Engine(p1, p2, max_rounds=50).run().outcome, CAPPED)
+
+
+if __name__ == "__main__":
+    unittest.main()
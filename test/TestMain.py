@@ -1,12 +1,23 @@
 """Unit tests for the application entrypoint `Main`."""
 
+import os
+import tempfile
 import unittest
 from war.Main import Main  # if needed
+from war.__main__ import build_highscore, build_parser
+from war.ShardedHighscore import ShardedHighscore
+from war.SqliteHighscore import SqliteHighscore
 
 
 class TestMain(unittest.TestCase):
     """Tests for Main program"""
 
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
     def test_run_prints(self):
         """Test the run method runs and prints"""
         # Do not execute the full application loop in tests; just check the method exists
@@ -64,6 +75,43 @@ class TestMain(unittest.TestCase):
             # confirm that Main instance still has no attribute 'shell'
             self.assertFalse(hasattr(m, "shell"))
 
+    def test_run_gives_the_shell_a_game_with_the_highscore(self):
+        """Main.run(highscore) should start the Shell on a Game using it."""
+        from unittest.mock import patch
+
+        class FakeShell:
+            def __init__(self, game=None):
+                FakeShell.game = game
+
+            def cmdloop(self):
+                return None
+
+        highscore = ShardedHighscore(self.tmp.name)
+        with patch("war.Main.Shell", FakeShell):
+            Main().run(highscore)
+        self.assertIs(FakeShell.game._Game__highscore, highscore)
+
+    def test_build_highscore_picks_the_store(self):
+        """--highscores should choose the store, and only sharded compacts."""
+        path = os.path.join(self.tmp.name, "scores")
+        sharded = build_highscore("sharded", path)
+        self.assertIsInstance(sharded, ShardedHighscore)
+        self.assertTrue(sharded.can_compact())
+        sqlite = build_highscore("sqlite", path + ".db")
+        self.assertIsInstance(sqlite, SqliteHighscore)
+        self.assertFalse(sqlite.can_compact())
+        sqlite.close()
+        journal = build_highscore("journal", path + ".json")
+        self.assertTrue(journal.get_journal())
+        self.assertFalse(journal.can_compact())
+        self.assertIsNone(build_highscore("journal"))
+
+    def test_highscores_option(self):
+        """The parser should accept the store of the Shell's highscores."""
+        args = build_parser().parse_args(["--highscores", "sharded"])
+        self.assertEqual((args.highscores, args.highscores_path), ("sharded", None))
+        self.assertEqual(build_parser().parse_args([]).highscores, "journal")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,92 @@
+"""Unit tests for the precomputed AI policies (war/PolicyTable.py)."""
+
+import os
+import tempfile
+import unittest
+
+from war.Card import CARD_TABLE
+from war.CardHand import CardHand
+from war.Deck import Deck
+from war.Engine import Engine
+from war.Intelligence import Intelligence
+from war.PolicyTable import MASKS, PolicyTable
+
+
+class TestPolicyTable(unittest.TestCase):
+    """Tests for building, saving and using a PolicyTable."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "policy.table")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_greedy_table_matches_a_built_one(self):
+        """The greedy table should hold the highest value of every mask."""
+        table = PolicyTable.greedy()
+        self.assertEqual(table.lookup(0), 0)
+        self.assertEqual(table.lookup(0b1), 2)
+        self.assertEqual(table.lookup(0b0100000010100), 13)
+        built = PolicyTable.build("greedy", samples=1)
+        self.assertTrue(all(built.lookup(m) == table.lookup(m) for m in range(MASKS)))
+
+    def test_parallel_build_matches_one_process(self):
+        """Building with worker processes should give the same table."""
+        serial = PolicyTable.build("counting", samples=1, seed=4)
+        parallel = PolicyTable.build("counting", samples=1, seed=4, workers=2)
+        self.assertTrue(
+            all(serial.lookup(m) == parallel.lookup(m) for m in range(MASKS))
+        )
+        with self.assertRaises(ValueError):
+            PolicyTable.build("random")
+
+    def test_save_and_load_memory_maps_the_table(self):
+        """A saved table should load with the same entries."""
+        table = PolicyTable.build("counting", samples=2, seed=1)
+        table.save(self.filename)
+        loaded = PolicyTable.load(self.filename)
+        try:
+            self.assertTrue(
+                all(loaded.lookup(m) == table.lookup(m) for m in range(MASKS))
+            )
+        finally:
+            loaded.close()
+        with open(self.filename, "r+b") as file:
+            file.write(b"NOTATABL")
+        with self.assertRaises(ValueError):
+            PolicyTable.load(self.filename)
+
+    def test_choose_from_a_cardhand_or_a_list(self):
+        """The first card of the looked up value should be chosen."""
+        cards = [CARD_TABLE[3], CARD_TABLE[11], CARD_TABLE[24]]  # 5, king, king
+        table = PolicyTable.greedy()
+        self.assertEqual(table.choose(CardHand(cards)), 1)
+        self.assertEqual(table.choose(cards), 1)
+        self.assertIsNone(table.choose([]))
+        self.assertIsNone(table.choose(CardHand()))
+
+    def test_table_level(self):
+        """The 'table' level should play the entries of its table."""
+        lowest = PolicyTable(
+            bytes([0]) + bytes((m & -m).bit_length() + 1 for m in range(1, MASKS))
+        )
+        hand = CardHand([CARD_TABLE[11], CARD_TABLE[3], CARD_TABLE[7]])
+        ai = Intelligence(hand=hand, level="table", policy_table=lowest)
+        self.assertEqual(ai.get_level(), "table")
+        self.assertEqual(ai.choose_index(), 1)
+        self.assertIs(
+            Intelligence(level="table").get_policy_table(), PolicyTable.default()
+        )
+
+    def test_greedy_table_plays_like_greedy(self):
+        """An engine game with the greedy table should match the greedy level."""
+        results = [
+            Engine.from_deck(Deck(rng=9), ai_level=level, rng=9).run()
+            for level in ("greedy", "table")
+        ]
+        self.assertEqual(results[0], results[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
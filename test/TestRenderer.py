@@ -0,0 +1,53 @@
+"""Unit tests for the terminal Renderer (war/Renderer.py)."""
+
+import contextlib
+import io
+import unittest
+
+from war.Card import Card
+from war.Events import CheatUsed, GameOver, NotEnoughCards, PotWon, RoundStarted
+from war.Renderer import Renderer
+
+
+class TestRenderer(unittest.TestCase):
+    """Tests for the screens drawn for each event."""
+
+    def render(self, event):
+        captured = io.StringIO()
+        with contextlib.redirect_stdout(captured):
+            Renderer(pause=False)(event)
+        return captured.getvalue()
+
+    def test_round_started_shows_names_and_amounts(self):
+        """The draw screen should show both names and card counts."""
+        out = self.render(RoundStarted("Alice", "Bob", 26, 25))
+        self.assertIn("Draw!", out)
+        self.assertIn("Alice", out)
+        self.assertIn("Bob", out)
+        self.assertIn("25🂠", out)
+
+    def test_pot_won_names_winner(self):
+        """The result screen should name the winner and the cards won."""
+        card1 = Card(10, "🂪", "Spades", "black")
+        card2 = Card(4, "🂤", "Spades", "black")
+        out = self.render(PotWon("Alice", "Bob", 27, 25, card1, card2, 1, 1))
+        self.assertIn("Alice wins! They get 1 card(s)", out)
+
+    def test_not_enough_cards_names_loser(self):
+        """The forfeit screen should name the player who ran out of cards."""
+        card = Card(5, "🂥", "Spades", "black")
+        out = self.render(NotEnoughCards("Alice", "Bob", 0, 3, card, card, 2, 2))
+        self.assertIn("Alice doesn't have enough cards!", out)
+
+    def test_game_over_and_cheat(self):
+        """Game over and cheat events should print their messages."""
+        self.assertIn("Bob won the game!", self.render(GameOver("Bob", "Alice", 40)))
+        self.assertIn("Shhh", self.render(CheatUsed("Alice")))
+
+    def test_unknown_event_is_ignored(self):
+        """Events without a screen should print nothing."""
+        self.assertEqual(self.render(("something", "else")), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
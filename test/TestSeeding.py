@@ -0,0 +1,36 @@
+"""Unit tests for random number streams (war/Seeding.py)."""
+
+import random
+import unittest
+
+from war.Seeding import derive_seed, make_rng
+
+
+class TestSeeding(unittest.TestCase):
+    """Tests for make_rng and derive_seed."""
+
+    def test_make_rng_defaults_to_global_module(self):
+        """Without a seed the global random module should be used."""
+        self.assertIs(make_rng(), random)
+
+    def test_make_rng_from_seed(self):
+        """A seed should give a new generator with a repeatable stream."""
+        first, second = make_rng(5), make_rng(5)
+        self.assertIsInstance(first, random.Random)
+        self.assertEqual(first.random(), second.random())
+
+    def test_make_rng_keeps_generator(self):
+        """A generator should be returned as is."""
+        rng = random.Random(1)
+        self.assertIs(make_rng(rng), rng)
+
+    def test_derive_seed_is_stable_and_distinct(self):
+        """Derived seeds should only depend on the root seed and the path."""
+        self.assertEqual(derive_seed(1, 2), derive_seed(1, 2))
+        self.assertNotEqual(derive_seed(1, 2), derive_seed(1, 3))
+        self.assertNotEqual(derive_seed(1, 2), derive_seed(2, 2))
+        self.assertLess(derive_seed("run", 0), 2**64)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+"""Unit tests for the sharded highscore store (war/ShardedHighscore.py)."""
+
+import datetime
+import os
+import tempfile
+import unittest
+import zlib
+
+from war.ShardedHighscore import DailyTotal, ShardedHighscore
+from war.Statistics import Statistics
+
+
+class TestShardedHighscore(unittest.TestCase):
+    """Tests for ShardedHighscore."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.tmp.name, "highscores")
+        self.highscore = ShardedHighscore(self.directory, shards=8)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def reopen(self, **options):
+        self.highscore.save_highscores()
+        return ShardedHighscore(self.directory, **options)
+
+    def test_round_trip_through_compressed_shards(self):
+        """Players and statistics should survive a save and a reopen."""
+        self.highscore.add_player("Ann", [Statistics(True, 10)])
+        self.highscore.add_statistics("Ann", False, 20, datetime.date(2024, 5, 1))
+        self.highscore.add_player("Ben")
+        stats = self.reopen().get_highscores()
+        self.assertEqual(sorted(stats), ["Ann", "Ben"])
+        self.assertEqual([s.get_draws() for s in stats["Ann"]], [10, 20])
+        self.assertEqual(stats["Ann"][1].get_date(), datetime.date(2024, 5, 1))
+        summary = os.path.join(self.directory, "summary.json.z")
+        with open(summary, "rb") as fh:
+            self.assertIn(b"Ann", zlib.decompress(fh.read()))
+
+    def test_only_changed_shards_are_written(self):
+        """A save should write the summary and the shard of the changed player."""
+        self.highscore.add_player("Ann")
+        self.highscore.save_highscores()
+        self.assertEqual(len(os.listdir(self.directory)), 2)
+
+    def test_player_and_leaderboard_read_only_what_they_need(self):
+        """The leaderboard needs the summary, one player only their shard."""
+        for i in range(20):
+            self.highscore.add_player(f"P{i}", [Statistics(True, i)] * (i % 3))
+        highscore = self.reopen()
+        self.assertEqual(highscore.get_leaderboard().top(1)[0].wins, 2)
+        self.assertEqual(len(highscore._ShardedHighscore__loaded), 0)
+        self.assertEqual(len(highscore.get_statistics("P5")), 2)
+        self.assertEqual(len(highscore._ShardedHighscore__loaded), 1)
+        self.assertIsNone(highscore.get_statistics("Nobody"))
+
+    def test_rename_moves_player_between_shards(self):
+        """A renamed player should keep their games, in their new shard."""
+        self.highscore.add_player("Ann", [Statistics(True, 3)])
+        self.highscore.update_player_name("Ann", "Annabel")
+        highscore = self.reopen()
+        self.assertEqual(list(highscore.get_highscores()), ["Annabel"])
+        self.assertEqual(highscore.get_leaderboard().get_standing("Annabel").wins, 1)
+
+    def test_remove_player_and_statistics(self):
+        """Removals should update the games, the summary and the leaderboard."""
+        self.highscore.add_player("Ann", [Statistics(True, 3), Statistics(False, 4)])
+        self.highscore.add_player("Ben")
+        self.highscore.remove_statistics("Ann", 0)
+        self.highscore.remove_statistics("Ann", 5)
+        self.highscore.remove_player("Ben")
+        highscore = self.reopen()
+        self.assertEqual(list(highscore.get_highscores()), ["Ann"])
+        standing = highscore.get_leaderboard().get_standing("Ann")
+        self.assertEqual((standing.games, standing.wins), (1, 0))
+
+    def test_compact_rolls_old_games_into_days(self):
+        """Old games should become DailyTotals that rank the same."""
+        day, later = datetime.date(2024, 1, 1), datetime.date(2024, 3, 1)
+        self.highscore.add_player("Ann")
+        for has_won, draws in [(True, 9), (True, 4), (False, 7)]:
+            self.highscore.add_statistics("Ann", has_won, draws, day)
+        self.highscore.add_statistics("Ann", True, 2, later)
+        self.highscore.add_statistics("Ann", False, 1)
+        before = self.highscore.get_leaderboard().get_standing("Ann")
+        self.assertEqual(self.highscore.compact(datetime.date(2024, 2, 1)), 3)
+        highscore = self.reopen()
+        self.assertEqual(highscore.get_days("Ann"), [DailyTotal(day, 3, 2, 4)])
+        self.assertEqual(len(highscore.get_statistics("Ann")), 2)
+        self.assertEqual(highscore.get_leaderboard().get_standing("Ann"), before)
+
+    def test_compact_merges_into_existing_days(self):
+        """Compacting a day again should add to its total."""
+        day = datetime.date(2024, 1, 1)
+        self.highscore.add_player("Ann")
+        self.highscore.add_statistics("Ann", True, 5, day)
+        self.highscore.compact(datetime.date(2024, 2, 1))
+        self.highscore.add_statistics("Ann", False, 8, day)
+        self.highscore.add_statistics("Ann", True, 3, day)
+        self.highscore.compact(datetime.date(2024, 2, 1))
+        highscore = self.reopen()
+        self.assertEqual(highscore.get_days("Ann"), [DailyTotal(day, 3, 2, 3)])
+        standing = highscore.get_leaderboard().get_standing("Ann")
+        self.assertEqual((standing.games, standing.fewest_draws), (3, 3))
+
+    def test_existing_directory_keeps_its_settings(self):
+        """Reopening with another shard count should keep the stored one."""
+        self.highscore.add_player("Ann", [Statistics(True, 1)])
+        highscore = self.reopen(shards=3)
+        self.assertEqual(len(highscore.get_statistics("Ann")), 1)
+
+    def test_lzma_codec(self):
+        """The lzma codec should write .json.xz files."""
+        directory = os.path.join(self.tmp.name, "xz")
+        highscore = ShardedHighscore(directory, codec="lzma")
+        highscore.add_player("Ann", [Statistics(True, 1)])
+        highscore.save_highscores()
+        self.assertIn("summary.json.xz", os.listdir(directory))
+        reopened = ShardedHighscore(directory, codec="lzma")
+        self.assertEqual(len(reopened.get_statistics("Ann")), 1)
+        with self.assertRaises(ValueError):
+            ShardedHighscore(directory, codec="bz2")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,12 @@
 """Unit tests for the Shell (CLI) behaviour and command handlers."""
 
 import unittest
+from war.Game import Game
 from war.Shell import Shell
 from war.Player import Player
 from war.CardHand import CardHand
 from unittest.mock import patch
+import datetime
 import io
 import sys
 
@@ -146,6 +148,15 @@ class FakeGameForShell:
     def save_highscore(self):
         self.saved = True
 
+    def close(self):
+        self.closed = True
+
+    def compact_highscores(self, days):
+        self.compacted = days
+
+    def show_highscore(self, since=None, until=None):
+        self.period = (since, until)
+
 
 class TestShellExtra(unittest.TestCase):
 
@@ -187,6 +198,18 @@ class TestShellExtra(unittest.TestCase):
         self.assertEqual(args[1], "P1")
         self.assertEqual(args[2], "P2")
 
+    def test_do_start_ai_versus_ai(self):
+        fake = FakeGameForShell()
+        shell = Shell(game=fake)
+        # pick '3', an invalid level, then a level for each AI
+        with patch("builtins.input", side_effect=["3", "bad", "counting", ""]):
+            with patch("sys.stdout", new_callable=io.StringIO):
+                shell.do_start("")
+
+        args, kwargs = fake.started_with
+        self.assertEqual(args, (3, "AI 1 (counting)", "AI 2 (top)"))
+        self.assertEqual(kwargs, {"ai_level": "top", "ai_level1": "counting"})
+
     def test_do_namechange_inactive_prints_message(self):
         fake = FakeGameForShell()
         fake._active = False
@@ -210,8 +233,91 @@ class TestShellExtra(unittest.TestCase):
         shell = Shell(game=fake)
         result = shell.do_quit("")
         self.assertTrue(fake.saved)
+        self.assertTrue(fake.closed)
         self.assertTrue(result)
 
+    def test_shell_subscribes_renderer_to_game(self):
+        game = Game()
+        game.start(mode=2, player1="A", player2="B")
+        shell = Shell(game=game)
+        captured = io.StringIO()
+        with patch("sys.stdout", new=captured):
+            shell.do_draw("")
+        self.assertIn("Draw!", captured.getvalue())
+
+    def test_draw_n_plays_rounds_quietly(self):
+        game = Game()
+        game.start(mode=2, player1="A", player2="B", seed=3)
+        shell = Shell(game=game)
+        captured = io.StringIO()
+        with patch("sys.stdout", new=captured):
+            shell.do_draw("5")
+        out = captured.getvalue()
+        self.assertEqual(game.num_draws, 5)
+        self.assertIn("Played 5 round(s)", out)
+        # Only the final board is drawn, not the screens of every round
+        self.assertEqual(out.count("Draw!"), 1)
+        self.assertNotIn("Reveal...", out)
+
+    def test_draw_with_invalid_count_prints_usage(self):
+        game = Game()
+        game.start(mode=2, player1="A", player2="B")
+        shell = Shell(game=game)
+        captured = io.StringIO()
+        with patch("sys.stdout", new=captured):
+            shell.do_draw("many")
+        self.assertIn("Usage: draw", captured.getvalue())
+        self.assertEqual(game.num_draws, 0)
+
+    def test_auto_plays_to_the_end(self):
+        game = Game()
+        game.start(mode=1, player1="Solo", seed=8)
+        shell = Shell(game=game)
+        captured = io.StringIO()
+        with patch("sys.stdout", new=captured):
+            shell.do_auto("50")
+        out = captured.getvalue()
+        self.assertIn("won the game!", out)
+        self.assertIn("Round 50:", out)
+        self.assertIn(f"Played {game.num_draws} round(s)", out)
+
+    def test_compact_passes_days_to_game(self):
+        fake = FakeGameForShell()
+        shell = Shell(game=fake)
+        shell.do_compact("")
+        self.assertEqual(fake.compacted, 90)
+        shell.do_compact("7")
+        self.assertEqual(fake.compacted, 7)
+        captured = io.StringIO()
+        with patch("sys.stdout", new=captured):
+            shell.do_compact("soon")
+        self.assertIn("number of days", captured.getvalue())
+        self.assertEqual(fake.compacted, 7)
+
+    def test_highscores_periods(self):
+        fake = FakeGameForShell()
+        shell = Shell(game=fake)
+        date = datetime.date
+        shell.do_highscores("")
+        self.assertEqual(fake.period, (None, None))
+        shell.do_highscores("--since 2026-10-01")
+        self.assertEqual(fake.period, (date(2026, 10, 1), None))
+        shell.do_highscores("--since 2026-10-01 --until 2026-10-05")
+        self.assertEqual(fake.period, (date(2026, 10, 1), date(2026, 10, 5)))
+        shell.do_highscores("--day 2026-10-14")
+        self.assertEqual(fake.period, (date(2026, 10, 14), date(2026, 10, 14)))
+        shell.do_highscores("--week 2026-10-14")
+        self.assertEqual(fake.period, (date(2026, 10, 12), date(2026, 10, 18)))
+        shell.do_highscores("--month 2024-02-10")
+        self.assertEqual(fake.period, (date(2024, 2, 1), date(2024, 2, 29)))
+        shell.do_highscores("--week")
+        self.assertEqual(fake.period[1] - fake.period[0], datetime.timedelta(days=6))
+        captured = io.StringIO()
+        with patch("sys.stdout", new=captured):
+            shell.do_highscores("--since yesterday")
+            shell.do_highscores("--fortnight")
+        self.assertEqual(captured.getvalue().count("Usage: highscores"), 2)
+
 
 if __name__ == "__main__":
     unittest.main()
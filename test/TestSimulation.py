@@ -0,0 +1,178 @@
+"""Unit tests for batch simulation (war/Simulation.py) and the command line."""
+
+import contextlib
+import io
+import os
+import random
+import tempfile
+import unittest
+
+from war.Engine import CYCLE, GameResult
+from war.Simulation import Simulation, Summary, wilson_interval
+from war.__main__ import build_parser, main
+
+
+class TestSummary(unittest.TestCase):
+    """Tests for Summary aggregation."""
+
+    def test_add_counts_results(self):
+        """Adding results should update wins, draws and war statistics."""
+        summary = Summary()
+        summary.add(GameResult(1, 30, 2, 1))
+        summary.add(GameResult(2, 50, 3, 2))
+        summary.add(GameResult(1, 30, 0, 0))
+        self.assertEqual(summary.games, 3)
+        self.assertEqual(summary.wins[1], 2)
+        self.assertEqual(summary.draws[30], 2)
+        self.assertEqual(summary.wars, 5)
+        self.assertEqual(summary.longest_war, 2)
+        self.assertAlmostEqual(summary.mean_draws(), 110 / 3)
+        self.assertAlmostEqual(summary.win_rate(2), 1 / 3)
+
+    def test_merge_combines_summaries(self):
+        """Merging should be the same as adding all results to one summary."""
+        first, second = Summary(), Summary()
+        first.add(GameResult(1, 30, 2, 1))
+        second.add(GameResult(2, 40, 1, 4))
+        merged = first.merge(second)
+        self.assertIs(merged, first)
+        self.assertEqual(merged.games, 2)
+        self.assertEqual(merged.wins[2], 1)
+        self.assertEqual(merged.longest_war, 4)
+
+    def test_games_without_winner(self):
+        """Looping games should be counted as outcomes but not as wins."""
+        summary = Summary()
+        summary.add(GameResult(1, 30, 0, 0))
+        summary.add(GameResult(0, 8, 0, 0, CYCLE))
+        self.assertEqual(summary.wins[1] + summary.wins[2], 1)
+        self.assertEqual(summary.outcomes[CYCLE], 1)
+        self.assertIn("Games without a winner: 1 (cycle 1)", str(summary))
+
+    def test_wilson_interval(self):
+        """The interval should contain the rate and stay within 0 and 1."""
+        low, high = wilson_interval(50, 100)
+        self.assertAlmostEqual(low, 0.4038, places=4)
+        self.assertAlmostEqual(high, 0.5962, places=4)
+        low, high = wilson_interval(10, 10)
+        self.assertEqual(high, 1.0)
+        self.assertAlmostEqual(low, 0.7225, places=4)
+        self.assertEqual(wilson_interval(0, 0), (0.0, 1.0))
+
+    def test_win_interval_counts_unfinished_games(self):
+        """Games without a winner should count as games not won."""
+        summary = Summary()
+        summary.add(GameResult(1, 30, 0, 0))
+        summary.add(GameResult(0, 8, 0, 0, CYCLE))
+        self.assertEqual(summary.win_interval(1), wilson_interval(1, 2))
+
+    def test_str_reports_throughput(self):
+        """The report should include games per second once elapsed is known."""
+        summary = Summary()
+        summary.add(GameResult(1, 30, 0, 0))
+        summary.elapsed = 0.5
+        self.assertIn("2 games/sec", str(summary))
+
+
+class TestSimulation(unittest.TestCase):
+    """Tests for Simulation chunking and running."""
+
+    def test_chunks_cover_all_games(self):
+        """Chunks should add up to exactly the requested number of games."""
+        simulation = Simulation(games=105, workers=2, chunk_size=10)
+        chunks = simulation.chunks()
+        self.assertEqual(sum(chunks), 105)
+        self.assertEqual(chunks[-1], 5)
+
+    def test_default_chunk_size_is_positive(self):
+        """Small batches should still get a usable chunk size."""
+        self.assertEqual(Simulation(games=3, workers=8).chunk_size, 1)
+
+    def test_run_in_process(self):
+        """A single worker should play every game in this process."""
+        random.seed(5)
+        summary = Simulation(games=20, workers=1).run()
+        self.assertEqual(summary.games, 20)
+        self.assertEqual(summary.wins[1] + summary.wins[2], 20)
+        self.assertGreater(summary.elapsed, 0)
+
+    def test_round_cap_is_passed_to_games(self):
+        """With a tiny round cap no game should end with a winner."""
+        summary = Simulation(games=6, workers=1, max_rounds=3).run()
+        self.assertEqual(summary.outcomes["capped"], 6)
+        self.assertEqual(sum(summary.wins.values()), 0)
+
+    def test_seeded_runs_do_not_depend_on_workers(self):
+        """A seeded run should give the same summary for any chunks and workers."""
+
+        def counts(**options):
+            summary = Simulation(games=40, seed=12, vectorized=False, **options).run()
+            return summary.wins, summary.draws, summary.wars
+
+        self.assertEqual(counts(workers=1), counts(workers=2, chunk_size=7))
+
+    def test_ai_versus_ai_run(self):
+        """Player 1 should play at ai_level1, so greedy beats the top card."""
+        summary = Simulation(
+            games=60, workers=1, ai_level="top", seed=1, ai_level1="greedy"
+        ).run()
+        self.assertFalse(Simulation(ai_level1="greedy").vectorized)
+        self.assertGreater(summary.win_rate(1), 0.75)
+
+    def test_run_with_process_pool(self):
+        """Several workers should return merged summaries of all games."""
+        summary = Simulation(games=12, workers=2, chunk_size=3).run()
+        self.assertEqual(summary.games, 12)
+        self.assertEqual(sum(summary.draws.values()), 12)
+
+
+class TestCommandLine(unittest.TestCase):
+    """Tests for the ``python -m war`` entry point."""
+
+    def test_parse_simulate(self):
+        """The simulate command should parse its options."""
+        args = build_parser().parse_args(
+            ["simulate", "--games", "10", "--workers", "2", "--ai", "greedy"]
+        )
+        self.assertEqual(args.command, "simulate")
+        self.assertEqual(args.games, 10)
+        self.assertEqual(args.workers, 2)
+        self.assertEqual(args.ai, "greedy")
+
+    def test_main_simulate_prints_summary(self):
+        """Running simulate should print the summary report."""
+        random.seed(6)
+        captured = io.StringIO()
+        with contextlib.redirect_stdout(captured):
+            main(["simulate", "--games", "5", "--workers", "1"])
+        self.assertIn("Games played: 5", captured.getvalue())
+
+    def test_main_simulate_ai_versus_ai(self):
+        """--ai1 should seat an AI as player 1."""
+        args = build_parser().parse_args(["simulate", "--ai1", "counting"])
+        self.assertEqual((args.ai1, args.ai), ("counting", "top"))
+
+    def test_main_tournament_prints_standings(self):
+        """Running tournament should print the matrix of the given levels."""
+        captured = io.StringIO()
+        with contextlib.redirect_stdout(captured):
+            main(
+                ["tournament", "--levels", "top", "greedy", "--games", "4"]
+                + ["--workers", "1", "--seed", "2"]
+            )
+        self.assertIn("4 games per pairing", captured.getvalue())
+        self.assertIn("1. greedy", captured.getvalue())
+
+    def test_main_table_saves_a_table(self):
+        """Running table should compile the level and save it to --output."""
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "greedy.table")
+            captured = io.StringIO()
+            with contextlib.redirect_stdout(captured):
+                main(["table", "--samples", "1", "--workers", "1", "--output", output])
+            self.assertIn(output, captured.getvalue())
+            self.assertEqual(os.path.getsize(output), 8 + 8192)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+"""Unit tests for the SQLite highscore store (war/SqliteHighscore.py)."""
+
+import datetime
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from war.Leaderboard import Leaderboard
+from war.SqliteHighscore import SqliteHighscore
+from war.Statistics import Statistics
+
+
+class TestSqliteHighscore(unittest.TestCase):
+    """Tests for SqliteHighscore."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmp.name, "highscores.db")
+        self.highscore = SqliteHighscore(self.filename)
+
+    def tearDown(self):
+        self.highscore.close()
+        self.tmp.cleanup()
+
+    def test_uses_wal_mode(self):
+        """The database should be opened in WAL mode with indexes in place."""
+        with sqlite3.connect(self.filename) as connection:
+            mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+            indexes = {
+                row[0]
+                for row in connection.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'index'"
+                )
+            }
+        self.assertEqual(mode, "wal")
+        self.assertTrue({"statistics_player", "statistics_date"} <= indexes)
+
+    def test_add_player_and_statistics(self):
+        """Players and their statistics should be returned in insertion order."""
+        self.highscore.add_player("Ann", [Statistics(True, 10)])
+        self.highscore.add_statistics("Ann", False, 20, datetime.date(2024, 5, 1))
+        stats = self.highscore.get_highscores()["Ann"]
+        self.assertEqual([s.get_draws() for s in stats], [10, 20])
+        self.assertEqual(stats[1].get_date(), datetime.date(2024, 5, 1))
+        self.assertTrue(stats[0].get_has_won())
+
+    def test_statistics_are_batched(self):
+        """Statistics should only be inserted once a batch is full or saved."""
+        highscore = SqliteHighscore(
+            os.path.join(self.tmp.name, "batched.db"), batch_size=3
+        )
+        highscore.add_player("Ann")
+        reader = SqliteHighscore(highscore.get_filename())
+
+        highscore.add_statistics("Ann", True, 1)
+        highscore.add_statistics("Ann", True, 2)
+        self.assertEqual(reader.get_statistics("Ann"), [])
+        highscore.add_statistics("Ann", True, 3)
+        self.assertEqual(len(reader.get_statistics("Ann")), 3)
+
+        highscore.add_statistics("Ann", False, 4)
+        highscore.save_highscores()
+        self.assertEqual(len(reader.get_statistics("Ann")), 4)
+        highscore.close()
+        reader.close()
+
+    def test_changes_persist(self):
+        """A new store on the same file should see every saved change."""
+        self.highscore.add_player("Ann")
+        self.highscore.add_player("Ben")
+        self.highscore.add_statistics("Ann", True, 40)
+        self.highscore.add_statistics("Ann", False, 12)
+        self.highscore.remove_statistics("Ann", 0)
+        self.highscore.update_player_name("Ann", "Anna")
+        self.highscore.remove_player("Ben")
+        self.highscore.save_highscores()
+
+        loaded = SqliteHighscore(self.filename)
+        highscores = loaded.get_highscores()
+        loaded.close()
+        self.assertEqual(list(highscores), ["Anna"])
+        self.assertEqual([s.get_draws() for s in highscores["Anna"]], [12])
+
+    def test_missing_names_are_safe(self):
+        """Unknown players and indexes should not raise."""
+        self.highscore.add_statistics("Nobody", True, 1)
+        self.highscore.remove_statistics("Nobody", 0)
+        self.highscore.remove_player("Nobody")
+        self.highscore.update_player_name("Nobody", "Somebody")
+        self.assertEqual(self.highscore.get_highscores(), {"Somebody": []})
+        self.assertIsNone(self.highscore.get_statistics("Nobody"))
+
+    def test_set_highscores_replaces_everything(self):
+        """set_highscores should replace all players, accepting dict stats."""
+        self.highscore.add_player("Old")
+        self.highscore.set_highscores(
+            {"Ann": [Statistics(True, 5)], "Ben": [{"has_won": False, "draws": 7}]}
+        )
+        highscores = self.highscore.get_highscores()
+        self.assertEqual(list(highscores), ["Ann", "Ben"])
+        self.assertEqual(highscores["Ben"][0].get_draws(), 7)
+
+    def test_str_lists_players(self):
+        """The string form should list players with their matches."""
+        self.highscore.add_player("Ann", [Statistics(True, 5)])
+        self.assertEqual(str(self.highscore), "Ann:\n    Match: Won | Draws: 5")
+
+    def test_leaderboard_is_built_from_database(self):
+        """Reopening should count every saved game on the leaderboard."""
+        self.highscore.add_player("Ann")
+        self.highscore.add_statistics("Ann", True, 30, datetime.date(2024, 5, 1))
+        self.highscore.add_statistics("Ann", True, 30, datetime.date(2024, 5, 1))
+        self.highscore.add_statistics("Ann", False, 12)
+        self.highscore.remove_statistics("Ann", 2)
+        self.highscore.save_highscores()
+        standing = self.highscore.get_leaderboard().get_standing("Ann")
+
+        loaded = SqliteHighscore(self.filename)
+        self.assertEqual(loaded.get_leaderboard().get_standing("Ann"), standing)
+        self.assertEqual((standing.games, standing.wins), (2, 2))
+        loaded.close()
+
+    def test_leaderboard_sees_other_processes(self):
+        """A leaderboard should show games saved by another store at once."""
+        board = self.highscore.get_leaderboard()
+        other = SqliteHighscore(self.filename)
+        other.add_player("Ann")
+        other.add_statistics("Ann", True, 30)
+        other.save_highscores()
+        self.assertEqual(board.get_standing("Ann").wins, 1)
+        self.assertEqual(len(board), 1)
+        other.remove_player("Ann")
+        self.assertIsNone(board.get_standing("Ann"))
+        other.close()
+
+    def test_leaderboard_matches_in_memory_ranking(self):
+        """Queried standings should rank like the in-memory Leaderboard."""
+        day = datetime.date(2024, 5, 1)
+        highscores = {
+            "Ann": [Statistics(True, 9, day), Statistics(False, 3, day)],
+            "Ben": [Statistics(True, 5, day), Statistics(True, 7)],
+            "Cid": [Statistics(True, 4, day + datetime.timedelta(days=40))],
+            "Dan": [],
+        }
+        self.highscore.set_highscores(highscores)
+        memory = Leaderboard()
+        memory.load(highscores)
+        board = self.highscore.get_leaderboard()
+        self.assertEqual(board.top(3), memory.top(3))
+        self.assertEqual(board.top(), memory.top())
+        self.assertEqual(board.get_standing("Dan"), memory.get_standing("Dan"))
+        self.assertEqual(board.window(day, day), memory.window(day, day))
+        self.assertEqual(board.window(since=day), memory.window(since=day))
+        self.assertEqual(board.table(2), memory.table(2))
+
+    def test_leaderboard_query_uses_an_index(self):
+        """The totals should be read from covering indexes, not the table."""
+        connection = self.highscore._SqliteHighscore__connection
+        queries = []
+        connection.set_trace_callback(queries.append)
+        self.highscore.get_leaderboard().top()
+        self.highscore.get_leaderboard().window(datetime.date(2024, 1, 1))
+        connection.set_trace_callback(None)
+        for query in queries:
+            plan = connection.execute("EXPLAIN QUERY PLAN " + query).fetchall()
+            self.assertIn("COVERING INDEX", " ".join(row[-1] for row in plan))
+
+    def test_remove_missing_player_keeps_the_others(self):
+        """Removing an unknown player should change nothing."""
+        self.highscore.add_player("Ann", [Statistics(True, 5)])
+        self.highscore.remove_player("Nobody")
+        self.assertEqual(self.highscore.get_leaderboard().top()[0].name, "Ann")
+
+
+if __name__ == "__main__":
+    unittest.main()
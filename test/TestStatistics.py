@@ -1,7 +1,7 @@
 """Unit tests for the Statistics data model and serialization helpers."""
 
 import unittest, datetime
-from war.Statistics import Statistics
+from war.Statistics import Statistics, StatisticsColumns, StatisticsRow
 
 
 class TestStatistics(unittest.TestCase):
@@ -53,6 +53,11 @@ class TestStatistics(unittest.TestCase):
         s2.set_has_won(True)
         self.assertTrue(s2.get_has_won())
 
+    def test_from_trusted(self):
+        """from_trusted should store values as given."""
+        s = Statistics.from_trusted(True, 5, self.date)
+        self.assertEqual(s.to_dict(), Statistics(True, 5, self.date).to_dict())
+
     def test_to_from_dict_roundtrip(self):
         """to_dict and from_dict should roundtrip preserving values."""
         s = Statistics(True, 5, self.date)
@@ -78,5 +83,73 @@ class TestStatistics(unittest.TestCase):
         self.assertEqual(d["date"], self.date.isoformat())
 
 
+class TestStatisticsColumns(unittest.TestCase):
+    """Tests for the columnar StatisticsColumns container."""
+
+    def setUp(self):
+        self.date = datetime.date(2024, 3, 1)
+        self.columns = StatisticsColumns(
+            [
+                Statistics(True, 30, self.date),
+                Statistics(False, 12),
+                Statistics(True, 8),
+            ]
+        )
+
+    def test_rows_behave_like_statistics(self):
+        """Indexing should give views with the Statistics getters."""
+        row = self.columns[0]
+        self.assertIsInstance(row, StatisticsRow)
+        self.assertIsInstance(row, Statistics)
+        self.assertEqual(row.to_dict(), Statistics(True, 30, self.date).to_dict())
+        self.assertEqual(str(self.columns[-1]), "Match: Won | Draws: 8")
+        with self.assertRaises(IndexError):
+            self.columns[3]
+
+    def test_views_write_to_columns(self):
+        """Setting a value on a view should change the stored row."""
+        self.columns[1].set_draws(5)
+        self.columns[1].set_date("2025-01-01")
+        self.assertEqual(self.columns[1].get_draws(), 5)
+        self.assertEqual(self.columns.get_columns()[1][1], 5)
+        self.assertEqual(self.columns.last_played(), datetime.date(2025, 1, 1))
+
+    def test_list_methods(self):
+        """append, pop, len and iteration should work like a list."""
+        self.columns.append(Statistics(False, 3))
+        self.assertEqual(len(self.columns), 4)
+        popped = self.columns.pop(0)
+        self.assertEqual((popped.get_draws(), popped.get_date()), (30, self.date))
+        self.assertEqual([row.get_draws() for row in self.columns], [12, 8, 3])
+        self.assertEqual(self.columns[1:], StatisticsColumns(list(self.columns)[1:]))
+
+    def test_aggregations(self):
+        """Aggregations should scan the columns."""
+        self.assertEqual(self.columns.wins(), 2)
+        self.assertEqual(self.columns.total_draws(), 50)
+        self.assertEqual(self.columns.fewest_win_draws(), 8)
+        self.assertEqual(self.columns.last_played(), self.date)
+        self.assertIsNone(StatisticsColumns().fewest_win_draws())
+        self.assertEqual(self.columns.group_counts()[(True, 30, self.date)], 1)
+
+    def test_append_values(self):
+        """append_values should add a row without a Statistics object."""
+        self.columns.append_values(False, 9, None)
+        self.assertEqual(self.columns[-1].to_dict(), Statistics(False, 9).to_dict())
+
+    def test_negative_draws_are_stored(self):
+        """Columns should take the draws a Statistics object takes."""
+        self.columns.append(Statistics(True, -1))
+        self.columns.append_values(False, -2, None)
+        self.columns[0].set_draws(-3)
+        self.assertEqual([row.get_draws() for row in self.columns], [-3, 12, 8, -1, -2])
+
+    def test_to_dicts(self):
+        """to_dicts should match the to_dict form of every row."""
+        self.assertEqual(
+            self.columns.to_dicts(), [row.to_dict() for row in self.columns]
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
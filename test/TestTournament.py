@@ -0,0 +1,69 @@
+"""Unit tests for AI tournaments (war/Tournament.py)."""
+
+import unittest
+
+from war.Engine import GameResult
+from war.Simulation import Simulation
+from war.Tournament import Standings, Tournament
+
+
+class TestStandings(unittest.TestCase):
+    """Tests for the Standings matrix."""
+
+    def test_ranking_counts_both_seats(self):
+        """A level's games as player 1 and as player 2 should both count."""
+        standings = Standings(["top", "greedy"])
+        for _ in range(3):
+            standings.get_summary("greedy", "top").add(GameResult(1, 20, 0, 0))
+            standings.get_summary("top", "greedy").add(GameResult(2, 20, 0, 0))
+        standings.get_summary("top", "top").add(GameResult(1, 20, 0, 0))
+        self.assertEqual(standings.ranking(), [("greedy", 6, 6), ("top", 1, 8)])
+        self.assertEqual(standings.win_rate("greedy", "top"), 1.0)
+        self.assertEqual(standings.win_rate("greedy", "greedy"), 0.0)
+
+    def test_confidence_sets_the_interval(self):
+        """A higher confidence level should give a wider interval."""
+        narrow, wide = Standings(["top"], 0.5), Standings(["top"], 0.99)
+        for standings in (narrow, wide):
+            for winner in (1, 2, 1, 1):
+                standings.get_summary("top", "top").add(GameResult(winner, 9, 0, 0))
+        low, high = narrow.win_interval("top", "top")
+        wide_low, wide_high = wide.win_interval("top", "top")
+        self.assertLess(wide_low, low)
+        self.assertGreater(wide_high, high)
+        self.assertAlmostEqual(wide.z, 2.5758, places=4)
+
+
+class TestTournament(unittest.TestCase):
+    """Tests for playing a Tournament."""
+
+    def test_every_pairing_is_played(self):
+        """Each ordered pairing of levels should play the requested games."""
+        standings = Tournament(["top", "greedy"], games=10, workers=1, seed=3).run()
+        self.assertEqual(len(standings.summaries), 4)
+        for summary in standings.summaries.values():
+            self.assertEqual(summary.games, 10)
+        self.assertIn("greedy", str(standings))
+        self.assertGreater(standings.elapsed, 0)
+
+    def test_pairing_matches_a_simulation(self):
+        """With a seed a pairing should play the games of the same Simulation."""
+        standings = Tournament(["top", "greedy"], games=12, workers=1, seed=5).run()
+        summary = Simulation(
+            12, 1, "top", vectorized=False, seed=5, ai_level1="greedy"
+        ).run()
+        self.assertEqual(standings.get_summary("greedy", "top").wins, summary.wins)
+        self.assertEqual(standings.get_summary("greedy", "top").draws, summary.draws)
+
+    def test_process_pool_gives_the_same_standings(self):
+        """Seeded standings should not depend on the number of workers."""
+        serial = Tournament(["random", "counting"], games=8, workers=1, seed=6).run()
+        pooled = Tournament(
+            ["random", "counting"], games=8, workers=2, chunk_size=3, seed=6
+        ).run()
+        for pairing, summary in serial.summaries.items():
+            self.assertEqual(pooled.summaries[pairing].wins, summary.wins)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+"""Unit tests for the vectorized engine (war/VectorEngine.py)."""
+
+import unittest
+
+from war.Engine import CAPPED, CYCLE, Engine, GameResult
+from war.Simulation import Simulation, Summary
+from war.VectorEngine import VectorEngine, np
+
+
+@unittest.skipUnless(np, "NumPy is not installed")
+class TestVectorEngine(unittest.TestCase):
+    """Tests for VectorEngine.run and its agreement with the Engine."""
+
+    def engine_results(self, deals, max_rounds=None):
+        half = deals.shape[1] // 2
+        return [
+            Engine.from_codes(
+                bytes(row[:half].tolist()),
+                bytes(row[half:].tolist()),
+                max_rounds=max_rounds,
+            ).run()
+            for row in deals
+        ]
+
+    def test_matches_engine(self):
+        """Every game should end exactly like the Engine playing the same deal."""
+        engine = VectorEngine.random_deals(600, np.random.default_rng(3))
+        engine.SCALAR_TAIL = 50  # Play most of the batch vectorized
+        self.assertEqual(engine.results(), self.engine_results(engine.get_deals()))
+
+    def test_small_batch_uses_engine(self):
+        """Batches below the scalar tail should still give the same results."""
+        engine = VectorEngine.random_deals(5, np.random.default_rng(4))
+        self.assertEqual(engine.results(), self.engine_results(engine.get_deals()))
+
+    def test_run_returns_arrays(self):
+        """run should return one array entry per game."""
+        result = VectorEngine.random_deals(10, np.random.default_rng(5)).run()
+        self.assertIsInstance(result, GameResult)
+        self.assertEqual(len(result.winner), 10)
+        self.assertTrue(set(result.winner.tolist()) <= {1, 2})
+        self.assertTrue((result.num_draws >= 26).all())
+
+    def test_short_deal_with_war(self):
+        """Deals of any even size should be played, wars included."""
+        ranks = [5, 9, 2, 13, 5, 3, 7, 12]
+        codes = np.array([[rank - 2 for rank in ranks]])
+        engine = VectorEngine(codes)
+        engine.SCALAR_TAIL = 1
+        self.assertEqual(engine.results(), self.engine_results(codes))
+
+    def test_finished_games_are_not_played(self):
+        """Steps should leave the hands of finished games as they ended."""
+
+        class CheckedEngine(VectorEngine):
+            def _step(self, rows):
+                super()._step(rows)
+                counts = self._VectorEngine__state["count"]
+                test.assertTrue((counts >= 0).all())
+                test.assertTrue((counts.sum(axis=1) == 10).all())
+
+        test = self
+        deals = np.random.default_rng(9).integers(0, 52, (200, 10))
+        engine = CheckedEngine(deals)
+        engine.SCALAR_TAIL = 1
+        self.assertEqual(engine.results(), self.engine_results(deals))
+
+    def test_cycles_and_cap_match_engine(self):
+        """Looping and capped games should be found in the same round as the Engine."""
+        deals = np.random.default_rng(7).integers(0, 6, (600, 10))
+        engine = VectorEngine(deals, max_rounds=40)
+        engine.SCALAR_TAIL = 1
+        results = engine.results()
+        self.assertEqual(results, self.engine_results(deals, max_rounds=40))
+        outcomes = {result.outcome for result in results}
+        self.assertTrue({CYCLE, CAPPED} <= outcomes)
+
+
+@unittest.skipUnless(np, "NumPy is not installed")
+class TestVectorizedSimulation(unittest.TestCase):
+    """Tests for the vectorized path of Simulation."""
+
+    def test_add_batch_matches_add(self):
+        """add_batch should count the same as adding the games one by one."""
+        engine = VectorEngine.random_deals(20, np.random.default_rng(6))
+        batch, single = Summary(), Summary()
+        batch.add_batch(engine.run())
+        for result in engine.results():
+            single.add(result)
+        self.assertEqual(vars(batch), vars(single))
+
+    def test_default_is_vectorized_for_top(self):
+        """The vectorized engine should be used for 'top' and not for other levels."""
+        self.assertTrue(Simulation(games=10, workers=1).vectorized)
+        self.assertFalse(Simulation(games=10, workers=1, ai_level="greedy").vectorized)
+        with self.assertRaises(ValueError):
+            Simulation(games=10, ai_level="random", vectorized=True)
+
+    def test_seeded_run_matches_scalar(self):
+        """Seeded runs should deal the same games for both engines."""
+        vectorized = Simulation(games=30, workers=1, seed=5, vectorized=True).run()
+        scalar = Simulation(games=30, workers=1, seed=5, vectorized=False).run()
+        self.assertEqual(vectorized.draws, scalar.draws)
+        self.assertEqual(vectorized.wins, scalar.wins)
+
+    def test_run_vectorized(self):
+        """A vectorized run should play every game."""
+        summary = Simulation(games=300, workers=1, vectorized=True).run()
+        self.assertEqual(summary.games, 300)
+        self.assertEqual(summary.wins[1] + summary.wins[2], 300)
+
+
+if __name__ == "__main__":
+    unittest.main()
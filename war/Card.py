@@ -1,9 +1,33 @@
-"""Card module for representing a single playing card."""
+"""Card module for representing a single playing card.
+
+Besides the Card class this module holds the card table: the 52 cards of a
+standard deck as shared, read-only Card instances. A card can therefore be
+stored as a small integer code (0-51) and turned back into a Card with a
+table lookup. Codes are ordered by suit, then by value, so
+``code = suit_index * 13 + value - 2``.
+"""
+
+SUITS = ("Spades", "Hearts", "Diamonds", "Clubs")
+COLORS = ("black", "red", "red", "black")
+SYMBOLS = (
+    # Spades
+    "🂡🂢🂣🂤🂥🂦🂧🂨🂩🂪🂫🂭🂮"
+    # Hearts
+    "🂱🂲🂳🂴🂵🂶🂷🂸🂹🂺🂻🂽🂾"
+    # Diamonds
+    "🃁🃂🃃🃄🃅🃆🃇🃈🃉🃊🃋🃍🃎"
+    # Clubs
+    "🃑🃒🃓🃔🃕🃖🃗🃘🃙🃚🃛🃝🃞"
+)
+# Value (2-14) of every card code
+RANKS = bytes(code % 13 + 2 for code in range(52))
 
 
 class Card:
     """Represents a single playing card with a suit, symbol, value, and color."""
 
+    __slots__ = ("value", "symbol", "suit", "color")
+
     def __init__(self, value, symbol, suit, color):
         """Initialize a Card object.
 
@@ -52,3 +76,42 @@ class Card:
     def set_color(self, color):
         """Set the card’s color."""
         self.color = color
+
+    def get_code(self):
+        """Return the card's code (0-51) in the card table.
+
+        Raises ValueError when the card is not part of a standard deck.
+        """
+        if self.suit not in SUITS or not 2 <= self.value <= 14:
+            raise ValueError(f"{self.value} of {self.suit} has no card code")
+        return SUITS.index(self.suit) * 13 + self.value - 2
+
+    @staticmethod
+    def from_code(code):
+        """Return the shared Card for a card code (0-51)."""
+        return CARD_TABLE[code]
+
+
+class _TableCard(Card):
+    """Read-only Card shared by every deck through the card table."""
+
+    __slots__ = ()
+
+    def __init__(self, value, symbol, suit, color):
+        """Initialize the shared card, bypassing the read-only guard."""
+        for name, attr in zip(Card.__slots__, (value, symbol, suit, color)):
+            object.__setattr__(self, name, attr)
+
+    def __setattr__(self, name, value):
+        """Refuse changes, every deck shares this instance."""
+        raise AttributeError("cards from the card table are read-only")
+
+    def __reduce__(self):
+        """Pickle as a code so unpickling returns the shared instance."""
+        return (Card.from_code, (self.get_code(),))
+
+
+CARD_TABLE = tuple(
+    _TableCard(RANKS[code], SYMBOLS[code], SUITS[code // 13], COLORS[code // 13])
+    for code in range(52)
+)
@@ -1,5 +1,10 @@
 """CardHand class for managing a player's hand of cards."""
 
+from collections import deque
+
+# Bit of each standard value (2-14) in the rank mask of a hand
+RANK_BITS = {value: 1 << (value - 2) for value in range(2, 15)}
+
 
 class CardHand:
     def __init__(self, cards=None):
@@ -7,13 +12,79 @@ class CardHand:
 
         Create a new CardHand optionally populated with a list of Card objects.
 
+        The hand is kept in a deque so drawing the top card and adding cards
+        to the bottom are O(1).
+
+        The first rank query (highest_index, lowest_index, count_value,
+        rank_mask) builds an index of the cards by value: one deque per value,
+        holding that value's cards in hand order, and a 13-bit mask of the
+        values present. From then on every method that changes the hand keeps
+        them up to date, so count_value, count_values and rank_mask don't look
+        at the cards, and the highest or lowest value is picked from the
+        values present. Turning the chosen card into its position is still a
+        scan of the deque (deque.index), as is removing a card from the
+        middle, both linear in the size of the hand but in C and over at most
+        52 cards in a normal game.
+
+        get_hand returns a copy of the cards, so the hand only changes
+        through its methods; mutable_cards hands out the deque itself.
+
         :param cards: list of Card objects or None
         """
         if cards is None:
             cards = []
-        self.hand = list(cards)  # All cards currently in hand
+        self.hand = deque(cards)  # All cards currently in hand
         self.activeCard = []  # Cards that have been drawn (active)
         self.amount = len(self.hand)  # Number of cards currently in hand
+        self.__ranks = None  # value -> deque of cards, built on first use
+        self.__mask = 0  # RANK_BITS of the values in the index
+
+    def __len__(self):
+        """Return the number of cards in the hand."""
+        return len(self.hand)
+
+    def __iter__(self):
+        """Iterate over the cards in the hand, top card first."""
+        return iter(self.hand)
+
+    def _index(self, cards):
+        """Add cards, which were put at the bottom of the hand, to the index."""
+        ranks = self.__ranks
+        for card in cards:
+            bucket = ranks.get(card.value)
+            if bucket is None:
+                ranks[card.value] = deque((card,))
+                self.__mask |= RANK_BITS.get(card.value, 0)
+            else:
+                bucket.append(card)
+
+    def _unindex(self, card):
+        """Remove a card that left the hand from the index.
+
+        Only the card's bucket is searched, at most 4 cards in a normal deck.
+        """
+        bucket = self.__ranks[card.value]
+        if bucket[0] is card:
+            bucket.popleft()
+        else:
+            bucket.remove(card)
+        if not bucket:
+            del self.__ranks[card.value]
+            self.__mask &= ~RANK_BITS.get(card.value, 0)
+
+    def _ranks(self):
+        """Return the index of the hand by value, building it if needed."""
+        if self.__ranks is None:
+            self.__ranks = {}
+            self.__mask = 0
+            self._index(self.hand)
+        return self.__ranks
+
+    def _reindex(self):
+        """Rebuild the index by value, if it was built, for a new deque."""
+        if self.__ranks is not None:
+            self.__ranks = None
+            self._ranks()
 
     def draw_card(self, index=0):
         """Draw a card from the hand at the given index.
@@ -26,7 +97,13 @@ class CardHand:
             return None  # No cards left to draw
         if index < 0 or index >= len(self.hand):
             return None
-        card = self.hand.pop(index)
+        if index == 0:
+            card = self.hand.popleft()
+        else:
+            card = self.hand[index]
+            del self.hand[index]
+        if self.__ranks is not None:
+            self._unindex(card)
         self.activeCard.append(card)
         self.amount = len(self.hand)
         return card
@@ -37,6 +114,8 @@ class CardHand:
         :param card: Card object to append
         """
         self.hand.append(card)  # Add the card to the hand
+        if self.__ranks is not None:
+            self._index((card,))
         self.amount = len(self.hand)  # Update the count
 
     def remove_card(self):
@@ -53,14 +132,42 @@ class CardHand:
 
         Clears the active cards list by moving them back into `hand`.
         """
-        i, tmp = 0, len(self.activeCard)
-        while i < tmp:
-            self.hand.append(self.remove_card())
-            i += 1
+        self.hand.extend(self.activeCard)
+        if self.__ranks is not None:
+            self._index(self.activeCard)
+        self.activeCard.clear()
         self.amount = len(self.hand)
 
+    def collect_pot(self, other):
+        """Collect a won pot in one bulk transfer.
+
+        Moves all active cards of `other` to the bottom of this hand, followed
+        by this hand's own active cards, which is the order used by Game.
+
+        :param other: CardHand of the player that lost the round
+        """
+        self.hand.extend(other.activeCard)
+        if self.__ranks is not None:
+            self._index(other.activeCard)
+        other.activeCard.clear()
+        self.return_cards()
+
     def get_hand(self):
-        """Return the current list of Card objects in the hand."""
+        """Return a tuple of the Card objects in the hand, top card first.
+
+        The tuple is a copy: change the hand through the CardHand methods.
+        """
+        return tuple(self.hand)
+
+    def mutable_cards(self):
+        """Return the deque of the hand, for a caller that changes it directly.
+
+        The Engine moves cards this way when no player chooses them. The
+        index by value is dropped, so the next rank query builds it again
+        from the deque. The caller keeps `amount` up to date with set_amount.
+        """
+        self.__ranks = None
+        self.__mask = 0
         return self.hand
 
     def set_hand(self, hand):
@@ -68,8 +175,51 @@ class CardHand:
 
         :param hand: list of Card objects
         """
-        self.hand = list(hand)  # Set a new hand
+        self.hand = deque(hand)  # Set a new hand
         self.amount = len(hand)  # Update the count
+        self._reindex()
+
+    def highest_index(self):
+        """Return the index of the first card with the highest value.
+
+        Ties go to the card nearest the top. Returns None for an empty hand.
+        """
+        ranks = self._ranks()
+        if not ranks:
+            return None
+        return self.hand.index(ranks[max(ranks)][0])
+
+    def lowest_index(self):
+        """Return the index of the first card with the lowest value.
+
+        Ties go to the card nearest the top. Returns None for an empty hand.
+        """
+        ranks = self._ranks()
+        if not ranks:
+            return None
+        return self.hand.index(ranks[min(ranks)][0])
+
+    def index_of_value(self, value):
+        """Return the index of the first card with the given value, or None."""
+        bucket = self._ranks().get(value)
+        return self.hand.index(bucket[0]) if bucket else None
+
+    def count_value(self, value):
+        """Return the number of cards with the given value in the hand."""
+        bucket = self._ranks().get(value)
+        return len(bucket) if bucket else 0
+
+    def rank_mask(self):
+        """Return the 13-bit mask of the standard values (2-14) in the hand.
+
+        Bit `value - 2` is set when the hand holds a card of that value.
+        """
+        self._ranks()
+        return self.__mask
+
+    def count_values(self):
+        """Return a dict mapping every value in the hand to its number of cards."""
+        return {value: len(bucket) for value, bucket in self._ranks().items()}
 
     def get_active_card(self):
         """Return the list of active cards."""
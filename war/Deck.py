@@ -1,98 +1,37 @@
 """Deck class using Unicode playing card symbols (U+1F0A0–U+1F0FF)."""
 
-import random
-
 try:  # Try imports for executing Main normally
-    from Card import Card
+    from Card import CARD_TABLE
+    from Seeding import make_rng
 except:  # Except imports for UnitTesting. To prevent module not found Error.
-    from .Card import Card
+    from .Card import CARD_TABLE
+    from .Seeding import make_rng
 
 
 class Deck:
     """Represents a standard deck of 52 Unicode playing cards."""
 
-    def __init__(self):
-        """Create and shuffle the Unicode card deck."""
+    def __init__(self, rng=None):
+        """Create and shuffle the Unicode card deck.
+
+        :param rng: seed or random.Random-like object used for shuffling, the
+            global random module when None (see Seeding.make_rng)
+        """
+        self._rng = make_rng(rng)
         self._deck = self.create()
         self.shuffle()
 
     def create(self):
-        """Create a deck of cards using Unicode playing card characters."""
-        suits = ["Spades", "Hearts", "Diamonds", "Clubs"]
-        colors = ["black", "red", "red", "black"]
+        """Create a deck of cards using Unicode playing card characters.
 
-        unicode_cards = [
-            # Spades
-            "🂡",
-            "🂢",
-            "🂣",
-            "🂤",
-            "🂥",
-            "🂦",
-            "🂧",
-            "🂨",
-            "🂩",
-            "🂪",
-            "🂫",
-            "🂭",
-            "🂮",
-            # Hearts
-            "🂱",
-            "🂲",
-            "🂳",
-            "🂴",
-            "🂵",
-            "🂶",
-            "🂷",
-            "🂸",
-            "🂹",
-            "🂺",
-            "🂻",
-            "🂽",
-            "🂾",
-            # Diamonds
-            "🃁",
-            "🃂",
-            "🃃",
-            "🃄",
-            "🃅",
-            "🃆",
-            "🃇",
-            "🃈",
-            "🃉",
-            "🃊",
-            "🃋",
-            "🃍",
-            "🃎",
-            # Clubs
-            "🃑",
-            "🃒",
-            "🃓",
-            "🃔",
-            "🃕",
-            "🃖",
-            "🃗",
-            "🃘",
-            "🃙",
-            "🃚",
-            "🃛",
-            "🃝",
-            "🃞",
-        ]
-
-        cards = []
-        idx = 0
-        for s_index, suit in enumerate(suits):
-            color = colors[s_index]
-            for value in range(2, 15):
-                symbol = unicode_cards[idx]
-                idx = idx + 1
-                cards.append(Card(value, symbol, suit, color))
-        return cards
+        The deck is a new list of the shared cards from the card table, so
+        creating a deck does not build any new Card objects.
+        """
+        return list(CARD_TABLE)
 
     def shuffle(self):
         """Shuffle the deck."""
-        random.shuffle(self._deck)
+        self._rng.shuffle(self._deck)
 
     def split(self):
         """Split the deck evenly for two players."""
@@ -106,3 +45,24 @@ class Deck:
     def set_deck(self, deck):
         """Replace the current deck with a new list of cards."""
         self._deck = deck
+
+    @staticmethod
+    def encode(cards):
+        """Return the card codes of a sequence of table cards as bytes."""
+        return bytes(card.get_code() for card in cards)
+
+    @staticmethod
+    def shuffled_codes(rng=None):
+        """Return the card codes of a deck shuffled like Deck(rng), as bytes.
+
+        The codes are shuffled with the same random numbers as the cards, so
+        they come in the same order, without building and encoding a Deck.
+        """
+        codes = bytearray(range(len(CARD_TABLE)))
+        make_rng(rng).shuffle(codes)
+        return bytes(codes)
+
+    @staticmethod
+    def decode(codes):
+        """Return the shared table cards for a sequence of card codes."""
+        return [CARD_TABLE[code] for code in codes]
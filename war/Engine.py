@@ -0,0 +1,261 @@
+"""Headless simulation engine.
+
+Contains the Engine class which plays a complete War game to the end using
+the same rules as Game.draw_cards, but without rendering screens, printing
+or pausing. It is meant for programmatic use such as batch simulations.
+"""
+
+from collections import namedtuple
+
+try:  # Try imports for executing Main normally
+    from Deck import Deck
+    from Player import Player
+    from Intelligence import Intelligence
+    from CardHand import CardHand
+    from Seeding import make_rng
+except:  # Except imports for UnitTesting. To prevent module not found Error.
+    from .Deck import Deck
+    from .Player import Player
+    from .Intelligence import Intelligence
+    from .CardHand import CardHand
+    from .Seeding import make_rng
+
+
+# Outcomes of a headless game. Games that never end have no winner.
+WON = "won"  # One player holds every card
+CYCLE = "cycle"  # The hands repeated an earlier position, so play loops forever
+CAPPED = "capped"  # The game was stopped after the maximum number of rounds
+
+# Compact outcome of a headless game. `winner` is 1 or 2 (the player number),
+# or 0 when the outcome is CYCLE or CAPPED.
+GameResult = namedtuple(
+    "GameResult",
+    ["winner", "num_draws", "wars", "longest_war", "outcome"],
+    defaults=(WON,),
+)
+
+
+class Engine:
+    """Plays War games to completion without any terminal I/O.
+
+    Because the pot order is deterministic, some deals loop forever. Unless a
+    player picks cards at random, the engine detects such loops with Brent's
+    algorithm on the position of both hands, and what a counting player has
+    seen, and any game is stopped after max_rounds rounds.
+    """
+
+    MAX_ROUNDS = 100000  # Default cap on the rounds of a single game
+
+    def __init__(self, player1, player2, max_rounds=None):
+        """Initialize the Engine with two players that already hold a CardHand.
+
+        :param player1: Player or Intelligence holding a CardHand
+        :param player2: Player or Intelligence holding a CardHand
+        :param max_rounds: rounds after which the game is stopped, MAX_ROUNDS
+            when None
+        """
+        self.__players = [player1, player2]
+        self.__max_rounds = self.MAX_ROUNDS if max_rounds is None else max_rounds
+
+    @classmethod
+    def from_deck(
+        cls, deck=None, ai_level="top", max_rounds=None, rng=None, ai_level1=None
+    ):
+        """Deal a deck between a Player and an Intelligence like Game.start(mode=1).
+
+        With `ai_level1` the first player is an Intelligence too, like
+        Game.start(mode=3).
+
+        :param deck: Deck to deal from, a Deck shuffled with `rng` when None
+        :param ai_level: intelligence level of the second player
+        :param max_rounds: rounds after which the game is stopped
+        :param rng: seed or random.Random-like object for the shuffle and the
+            AIs' choices, the global random module when None
+        :param ai_level1: intelligence level of the first player, a Player
+            that draws its top card when None
+        """
+        rng = make_rng(rng)
+        if deck is None:
+            deck = Deck(rng)
+        hands = deck.split()
+        if ai_level1 is None:
+            player1 = Player("Player 1", CardHand(hands[0]))
+        else:
+            player1 = Intelligence("AI 1", CardHand(hands[0]), level=ai_level1, rng=rng)
+        player2 = Intelligence("AI", CardHand(hands[1]), level=ai_level, rng=rng)
+        return cls(player1, player2, max_rounds)
+
+    @classmethod
+    def from_codes(cls, codes1, codes2, ai_level="top", max_rounds=None, rng=None):
+        """Build an engine from two hands given as card codes (see Card.py).
+
+        Encoded deals are compact bytes that are cheap to copy, hash and send
+        to other processes.
+
+        :param codes1: card codes of player 1's hand, top card first
+        :param codes2: card codes of player 2's hand, top card first
+        :param ai_level: intelligence level of the second player
+        :param max_rounds: rounds after which the game is stopped
+        :param rng: seed or random.Random-like object for the AI's choices
+        """
+        player1 = Player("Player 1", CardHand(Deck.decode(codes1)))
+        player2 = Intelligence(
+            "AI", CardHand(Deck.decode(codes2)), level=ai_level, rng=rng
+        )
+        return cls(player1, player2, max_rounds)
+
+    def get_players(self):
+        """Return the two players of the engine."""
+        return self.__players
+
+    def get_max_rounds(self):
+        """Return the number of rounds after which a game is stopped."""
+        return self.__max_rounds
+
+    def _chooser(self, player):
+        """Return the player's choose_index method, or None to draw the top card."""
+        choose = getattr(player, "choose_index", None)
+        if choose is None or getattr(player, "get_level", lambda: "top")() == "top":
+            return None
+        return choose
+
+    @staticmethod
+    def _observer(player):
+        """Return the player's reveal method if it counts cards, else None."""
+        if getattr(player, "get_level", lambda: "top")() != "counting":
+            return None
+        return getattr(player, "reveal", None)
+
+    @staticmethod
+    def _position(cards1, cards2, counters=()):
+        """Return what decides the rest of the game.
+
+        That is the values of both hands, or with counting players the cards
+        themselves and the cards each of them has seen.
+        """
+        if counters:
+            return list(cards1), list(cards2), [p.seen for p in counters]
+        return [card.value for card in cards1], [card.value for card in cards2]
+
+    def run(self):
+        """Play rounds until one hand is empty and return a GameResult.
+
+        Rounds and wars are resolved exactly as in Game.draw_cards: the winner
+        of a round receives the loser's active cards followed by their own, and
+        a player without at least two cards left during a war forfeits the pot.
+        The players' CardHands are updated in place.
+
+        A game that loops or reaches max_rounds ends without a winner, with
+        the CYCLE or CAPPED outcome.
+        """
+        hand1 = self.__players[0].get_hand()
+        hand2 = self.__players[1].get_hand()
+        cards1, cards2 = hand1.mutable_cards(), hand2.mutable_cards()
+        pot1, pot2 = hand1.get_active_card(), hand2.get_active_card()
+        choose1 = self._chooser(self.__players[0])
+        choose2 = self._chooser(self.__players[1])
+        # Hands that choose their cards go through CardHand, which keeps its
+        # index by value up to date; otherwise the deques are used directly
+        indexed = choose1 is not None or choose2 is not None
+        # Players that count cards are told every face up pair
+        reveals = [
+            reveal
+            for reveal in map(self._observer, self.__players)
+            if reveal is not None
+        ]
+        # Random play and sampled rollouts don't depend on the position, so
+        # they cannot be proven to loop. Card counting depends on the cards
+        # seen as well, which only grow, so they are part of its position.
+        detect = all(
+            getattr(player, "get_level", lambda: "top")() not in ("random", "lookahead")
+            for player in self.__players
+        )
+        counters = [
+            player
+            for player in self.__players
+            if self._observer(player) is not None and hasattr(player, "seen")
+        ]
+
+        # Brent's cycle detection: the position is saved after 1, 2, 4, ...
+        # rounds and compared with every later one, cheap checks first. The
+        # round cap is checked at the same points.
+        max_rounds = self.__max_rounds
+        saved_len, saved_top, saved = -1, None, None
+        checkpoint = min(1, max_rounds)
+        num_draws = wars = longest_war = 0
+        outcome = WON
+        while cards1 and cards2:
+            if num_draws == checkpoint:
+                if num_draws == max_rounds:
+                    outcome = CAPPED
+                    break
+                if detect:
+                    saved_len, saved_top = len(cards1), cards1[0].value
+                    saved = self._position(cards1, cards2, counters)
+                checkpoint = min(checkpoint * 2, max_rounds)
+            num_draws += 1
+            depth = 0
+            while True:
+                if choose1 is None:
+                    card1 = cards1.popleft()
+                    pot1.append(card1)
+                else:
+                    card1 = hand1.draw_card(choose1() or 0)
+                if choose2 is None:
+                    card2 = cards2.popleft()
+                    pot2.append(card2)
+                else:
+                    card2 = hand2.draw_card(choose2() or 0)
+                if reveals:
+                    for reveal in reveals:
+                        reveal(card1, card2)
+                if card1.value > card2.value:
+                    winner, won, lost = cards1, pot1, pot2
+                    break
+                if card1.value < card2.value:
+                    winner, won, lost = cards2, pot2, pot1
+                    break
+
+                # War: both need a face down card and a face up card
+                depth += 1
+                if len(cards1) < 2:
+                    winner, won, lost = cards2, pot2, pot1
+                    break
+                if len(cards2) < 2:
+                    winner, won, lost = cards1, pot1, pot2
+                    break
+                if indexed:
+                    hand1.draw_card()
+                    hand2.draw_card()
+                else:
+                    pot1.append(cards1.popleft())
+                    pot2.append(cards2.popleft())
+
+            if indexed:
+                if winner is cards1:
+                    hand1.collect_pot(hand2)
+                else:
+                    hand2.collect_pot(hand1)
+            else:
+                # Same transfer as CardHand.collect_pot, inlined for speed
+                winner.extend(lost)
+                winner.extend(won)
+                lost.clear()
+                won.clear()
+            wars += depth
+            if depth > longest_war:
+                longest_war = depth
+
+            if (
+                len(cards1) == saved_len
+                and cards1[0].value == saved_top
+                and self._position(cards1, cards2, counters) == saved
+            ):
+                outcome = CYCLE
+                break
+
+        hand1.set_amount(len(cards1))
+        hand2.set_amount(len(cards2))
+        if outcome != WON:
+            return GameResult(0, num_draws, wars, longest_war, outcome)
+        return GameResult(1 if cards1 else 2, num_draws, wars, longest_war)
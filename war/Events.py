@@ -0,0 +1,40 @@
+"""Game event module.
+
+Contains the lightweight event types emitted by Game while a round is played.
+Events are plain namedtuples that describe what happened, never how it is
+shown, so renderers, loggers and statistics collectors can all consume the
+same stream. Every event of a round carries the names of both players and
+the number of cards left in their hands at that moment.
+"""
+
+from collections import namedtuple
+
+# Fields shared by the events of a round
+_TABLE = ["player1", "player2", "amount1", "amount2"]
+
+# A round begins, before any card is drawn
+RoundStarted = namedtuple("RoundStarted", _TABLE)
+
+# Both players drew a card, which is not shown yet
+CardsRevealed = namedtuple("CardsRevealed", _TABLE + ["card1", "card2"])
+
+# The drawn cards tie; `depth` counts the wars of this round so far
+War = namedtuple("War", _TABLE + ["card1", "card2", "depth"])
+
+# Both players placed a card face down during a war
+FaceDown = namedtuple("FaceDown", _TABLE)
+
+# Player `winner` (1 or 2) won the round and the `cards` of the opponent's pot
+PotWon = namedtuple("PotWon", _TABLE + ["card1", "card2", "winner", "cards"])
+
+# The other player has fewer than two cards for a war, so player `winner`
+# takes the pot
+NotEnoughCards = namedtuple(
+    "NotEnoughCards", _TABLE + ["card1", "card2", "winner", "cards"]
+)
+
+# A player ran out of cards. `winner` and `loser` are player names.
+GameOver = namedtuple("GameOver", ["winner", "loser", "num_draws"])
+
+# The cheat was used by the named player
+CheatUsed = namedtuple("CheatUsed", ["player"])
@@ -2,49 +2,110 @@
 
 Contains the Game class which implements the main War game logic and state.
 This module is intentionally free of direct long-running interactive loops so the
-logic can be used programmatically by tests and by the Shell CLI.
+logic can be used programmatically by tests and by the Shell CLI. Playing
+doesn't print anything either: rounds are played as a stream of events (see
+Events.py) that subscribers such as the Renderer turn into screens. Only the
+highscore commands (show_highscore, compact_highscores) print their results.
 """
 
 import datetime
 
 try:  # Try imports for executing Main normally
+    from Card import Card
     from Deck import Deck
     from Player import Player
     from Intelligence import Intelligence
     from CardHand import CardHand
     from Highscore import Highscore
+    from Engine import Engine
+    from Seeding import make_rng
+    from Events import (
+        CardsRevealed,
+        CheatUsed,
+        FaceDown,
+        GameOver,
+        NotEnoughCards,
+        PotWon,
+        RoundStarted,
+        War,
+    )
 except:  # Except imports for UnitTesting. To prevent module not found Error.
+    from .Card import Card
     from .Deck import Deck
     from .Player import Player
     from .Intelligence import Intelligence
     from .CardHand import CardHand
     from .Highscore import Highscore
+    from .Engine import Engine
+    from .Seeding import make_rng
+    from .Events import (
+        CardsRevealed,
+        CheatUsed,
+        FaceDown,
+        GameOver,
+        NotEnoughCards,
+        PotWon,
+        RoundStarted,
+        War,
+    )
 
 
 class Game:
     """Represents the game logic and contains the methods to run and manipulate the game."""
 
-    def __init__(self):
-        """Initialize the Game with default values."""
-        self.__highscore = Highscore()
-        self.__active_game = False
+    LEADERBOARD_SIZE = 20  # Players shown by show_highscore
+
+    def __init__(self, highscore=None):
+        """Initialize the Game with default values.
 
-    def start(self, mode=1, player1="Anonymous", player2="Anonymous", ai_level="top"):
+        :param highscore: Highscore used to record results, a Highscore for
+            the default file when None
+        """
+        self.__highscore = highscore if highscore is not None else Highscore()
+        self.__active_game = False
+        self.__subscribers = []  # Callbacks receiving every event, see subscribe
+
+    def start(
+        self,
+        mode=1,
+        player1="Anonymous",
+        player2="Anonymous",
+        ai_level="top",
+        seed=None,
+        ai_level1="top",
+        pool=None,
+    ):
         """Start a new game and deal cards to players.
 
-        :param mode: 1 for singleplayer or 2 for two-player
+        :param mode: 1 for singleplayer, 2 for two-player or 3 for AI versus AI
         :param player1: name of player 1 (default 'Anonymous')
         :param player2: name of player 2 (ignored in singleplayer)
-        :param ai_level: intelligence level for AI players ('top', 'random', 'greedy')
+        :param ai_level: intelligence level for AI players ('top', 'random',
+            'greedy', 'lookahead', 'counting', 'table'), of player 2 in AI
+            versus AI
+        :param seed: seed or random.Random-like object for the shuffle and the
+            AI, so the game can be replayed. The global random module when None.
+        :param ai_level1: intelligence level of player 1 in AI versus AI
+        :param pool: object with a map method that plays the rollouts of
+            'lookahead' AI players in parallel, e.g. a multiprocessing.Pool
         """
-        self.__player1 = Player(player1)
-        # Checks whether the current mode is single or multiplayer and assigns player2 accordingly.
-        self.__player2 = (
-            Player(player2) if mode == 2 else Intelligence("AI", level=ai_level)
+        rng = make_rng(seed)
+        # In AI versus AI both players are an Intelligence with its own level
+        self.__player1 = (
+            Intelligence(player1, level=ai_level1, rng=rng, pool=pool)
+            if mode == 3
+            else Player(player1)
         )
+        # Checks whether the current mode is single or multiplayer and assigns player2 accordingly.
+        if mode == 2:
+            self.__player2 = Player(player2)
+        elif mode == 3:
+            self.__player2 = Intelligence(player2, level=ai_level, rng=rng, pool=pool)
+        else:
+            self.__player2 = Intelligence("AI", level=ai_level, rng=rng, pool=pool)
         self.__players = [self.__player1, self.__player2]
 
-        self.__deck = Deck()
+        self.__deck = Deck(rng)
         hands = self.__deck.split()
         self.__players[0].set_hand(CardHand(hands[0]))
         self.__players[1].set_hand(CardHand(hands[1]))
@@ -60,36 +121,49 @@ class Game:
         """Return True when a game is currently active, otherwise False."""
         return self.__active_game
 
+    def subscribe(self, callback):
+        """Call `callback` with every event the game emits (see Events.py).
+
+        :param callback: callable taking a single event, e.g. a Renderer
+        """
+        self.__subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        """Stop sending events to a previously subscribed callback."""
+        if callback in self.__subscribers:
+            self.__subscribers.remove(callback)
+
+    def _publish(self, event):
+        """Send an event to every subscriber."""
+        for callback in self.__subscribers:
+            callback(event)
+
     def cheat(self):
         """Sets the value of all of Player1s cards to 99"""
-        print("Shhh. Be sneaky... All your cards now have a value of 99.")
-        player1_deck = self.__players[0].get_hand().get_hand()
-        for card in player1_deck:
-            card.set_value(99)
-
-    def _pause(self):
-        """Pause helper that avoids blocking when running tests."""
-        try:
-            import sys
-
-            # If unittest is running, skip pause to avoid blocking automated tests
-            if "unittest" in sys.modules:
-                return
-        except Exception:
-            pass
-        try:
-            input("Press to continue...")
-        except Exception:
-            return
+        # Deck cards are shared read-only cards, so swap in modified copies
+        player1_hand = self.__players[0].get_hand()
+        player1_hand.set_hand(
+            [
+                Card(99, card.get_symbol(), card.get_suit(), card.get_color())
+                for card in player1_hand.get_hand()
+            ]
+        )
+        self._publish(CheatUsed(self.__players[0].get_name()))
 
-    # TODO Graphics
-    def draw_cards(self, internal=False):
-        """Execute a single draw round and resolve the result.
+    def draw_cards(self):
+        """Execute a single draw round, resolve the result and publish its events."""
+        for event in self.play_round():
+            self._publish(event)
 
-        When ``internal`` is True the call is part of recursive war resolution
-        and will not increment the public draw counter.
-        """
+    def play_round(self):
+        """Play a single draw round, yielding an event for each step.
 
+        A tie starts a war, which is resolved in the same round: both players
+        place a card face down and draw again until the face up cards differ
+        or a player runs out of cards. If a player has no cards left the round
+        isn't played; the winner is recorded and GameOver is yielded instead.
+        The round is played as the generator is consumed.
+        """
         player1_hand = self.__players[0].get_hand()
         player2_hand = self.__players[1].get_hand()
 
@@ -97,280 +171,129 @@ class Game:
         player2_name = self.__players[1].get_name()
 
         # Check if any player ran out of cards, game over condition
+        loser = None
         if len(player1_hand.get_hand()) == 0:
             # Player 2 wins, player 1 ran out of cards
-            self.__highscore.add_statistics(
-                player2_name, True, self.num_draws, datetime.date.today()
-            )
-
-            p2_win_msg = f""" 
-
-                    ██╗    ██╗██╗███╗   ██╗
-                    ██║    ██║██║████╗  ██║
-                    ██║ █╗ ██║██║██╔██╗ ██║
-                    ██║███╗██║██║██║╚██╗██║
-                    ╚███╔███╔╝██║██║ ╚████║
-                    ╚══╝╚══╝ ╚═╝╚═╝  ╚═══╝
-                    {player2_name + " won the game!"}
-                    {player1_name + " loses...."}
-                Enter 'start' to begin another game!
-                            """
-            print(p2_win_msg)
-            return
+            winner, loser = player2_name, player1_name
         elif len(player2_hand.get_hand()) == 0:
             # Player 1 wins, player 2 ran out of cards
+            winner, loser = player1_name, player2_name
+        if loser is not None:
             self.__highscore.add_statistics(
-                player1_name, True, self.num_draws, datetime.date.today()
+                winner, True, self.num_draws, datetime.date.today()
             )
-
-            p1_win_msg = f"""
-
-                    ██╗    ██╗██╗███╗   ██╗
-                    ██║    ██║██║████╗  ██║
-                    ██║ █╗ ██║██║██╔██╗ ██║
-                    ██║███╗██║██║██║╚██╗██║
-                    ╚███╔███╔╝██║██║ ╚████║
-                    ╚══╝╚══╝ ╚═╝╚═╝  ╚═══╝
-                    {player1_name + " won the game!"}
-                    {player2_name + " loses...."}
-                Enter 'start' to begin another game!
-                            """
-            print(p1_win_msg)
+            yield GameOver(winner, loser, self.num_draws)
             return
 
-        screen1 = f"""
-        {player2_name:^50}
-        ▐▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▌
-        ▐                                                ▌
-        ▐         {player2_hand.get_amount():<2}🂠                                    ▌
-        ▐                                                ▌
-        ▐                                                ▌
-        ▐                                                ▌
-        ▐                      Draw!                     ▌
-        ▐                                                ▌
-        ▐                                                ▌
-        ▐                                                ▌
-        ▐                                    🂠{player1_hand.get_amount():>2}         ▌
-        ▐                                                ▌
-        ▐▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▌
-        {player1_name:^50}
-                    """
-        print(screen1)
-        self._pause()
-
-        # Each player draws a card. If a player provides a choose_index method (AI), use it.
-        idx1 = None
-        idx2 = None
-        try:
-            if hasattr(self.__players[0], "choose_index"):
-                idx1 = self.__players[0].choose_index()
-        except Exception:
+        def table():
+            """Return the fields shared by the events of this round."""
+            return (
+                player1_name,
+                player2_name,
+                player1_hand.get_amount(),
+                player2_hand.get_amount(),
+            )
+
+        # A round counts as one draw however many wars it takes
+        self.num_draws += 1
+        yield RoundStarted(*table())
+
+        # Each pass draws a face up card per player. Ties loop back for the
+        # next pair, so long wars need no recursion. Every drawn card stays in
+        # the hands' active cards, the pot, until the winner collects it in a
+        # single transfer.
+        depth = 0
+        while True:
+            # Each player draws a card. If a player provides a choose_index method (AI), use it.
             idx1 = None
-        try:
-            if hasattr(self.__players[1], "choose_index"):
-                idx2 = self.__players[1].choose_index()
-        except Exception:
             idx2 = None
+            try:
+                if hasattr(self.__players[0], "choose_index"):
+                    idx1 = self.__players[0].choose_index()
+            except Exception:
+                idx1 = None
+            try:
+                if hasattr(self.__players[1], "choose_index"):
+                    idx2 = self.__players[1].choose_index()
+            except Exception:
+                idx2 = None
+
+            player1_card = (
+                player1_hand.draw_card(idx1)
+                if idx1 is not None
+                else player1_hand.draw_card()
+            )
+            player2_card = (
+                player2_hand.draw_card(idx2)
+                if idx2 is not None
+                else player2_hand.draw_card()
+            )
+            for player in self.__players:
+                if hasattr(player, "reveal"):  # AI that counts cards
+                    player.reveal(player1_card, player2_card)
+            yield CardsRevealed(*table(), player1_card, player2_card)
+
+            # Compare card values using correct get_value() method
+            if player1_card.get_value() > player2_card.get_value():
+                save_len = len(player2_hand.get_active_card())
+                player1_hand.collect_pot(player2_hand)
+                yield PotWon(*table(), player1_card, player2_card, 1, save_len)
+                return
+            elif player1_card.get_value() < player2_card.get_value():
+                save_len = len(player1_hand.get_active_card())
+                player2_hand.collect_pot(player1_hand)
+                yield PotWon(*table(), player1_card, player2_card, 2, save_len)
+                return
 
-        player1_card = (
-            player1_hand.draw_card(idx1)
-            if idx1 is not None
-            else player1_hand.draw_card()
-        )
-        player2_card = (
-            player2_hand.draw_card(idx2)
-            if idx2 is not None
-            else player2_hand.draw_card()
-        )
-        # Only count the draw for top-level (external) invocations. Internal recursive
-        # draws during war resolution should not increment the public draw counter.
-        if not internal:
-            self.num_draws += 1
-
-        screen2 = f"""
-        {player2_name:^50}
-        ▐▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▌
-        ▐                       ?                        ▌
-        ▐         {player2_hand.get_amount():<2}🂠           🂠                        ▌
-        ▐                                                ▌
-        ▐                                                ▌
-        ▐                                                ▌
-        ▐                    Reveal...                   ▌
-        ▐                                                ▌
-        ▐                                                ▌
-        ▐                                                ▌
-        ▐                       🂠           🂠{player1_hand.get_amount():>2}          ▌
-        ▐                       ?                        ▌
-        ▐▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▌
-        {player1_name:^50}
-                    """
-        print(screen2)
-        self._pause()
-
-        # Compare card values using correct get_value() method
-        if player1_card.get_value() > player2_card.get_value():
-            player2_active_cards = player2_hand.get_active_card()
-            save_len = len(player2_active_cards)
-            i, tmp = 0, len(player2_active_cards)
-            while i < tmp:
-                player1_hand.add_card(player2_hand.remove_card())
-                i += 1
-            player1_hand.return_cards()
-
-            screen3alt1 = f"""
-        {player2_name:^50}
-        ▐▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▌
-        ▐                       {player2_card.get_value():<2}                       ▌
-        ▐         {player2_hand.get_amount():<2}🂠           {player2_card.get_symbol()}                        ▌
-        ▐                                                ▌
-        ▐                                                ▌
-        ▐                                                ▌
-        ▐{(player1_name + " wins! They get " + str(save_len) + " card(s)"):^48}▌
-        ▐                                                ▌
-        ▐                                                ▌
-        ▐                                                ▌
-        ▐                       {player1_card.get_symbol()}           🂠{player1_hand.get_amount():>2}          ▌
-        ▐                       {player1_card.get_value():<2}                       ▌
-        ▐▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▌
-        {player1_name:^50}
-                        """
-            print(screen3alt1)
-
-        elif player1_card.get_value() < player2_card.get_value():
-            player1_active_cards = player1_hand.get_active_card()
-            save_len = len(player1_active_cards)
-            i, tmp = 0, len(player1_active_cards)
-            while i < tmp:
-                player2_hand.add_card(player1_hand.remove_card())
-                i += 1
-            player2_hand.return_cards()
-
-            screen3alt2 = f"""
-        {player2_name:^50}
-        ▐▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▌
-        ▐                       {player2_card.get_value():<2}                       ▌
-        ▐         {player2_hand.get_amount():<2}🂠           {player2_card.get_symbol()}                        ▌
-        ▐                                                ▌
-        ▐                                                ▌
-        ▐                                                ▌
-        ▐{(player2_name + " wins! They get " + str(save_len) + " card(s)"):^48}▌
-        ▐                                                ▌
-        ▐                                                ▌
-        ▐                                                ▌
-        ▐                       {player1_card.get_symbol()}           🂠{player1_hand.get_amount():>2}          ▌
-        ▐                       {player1_card.get_value():<2}                       ▌
-        ▐▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▌
-        {player1_name:^50}
-                        """
-            print(screen3alt2)
-
-        else:
-            screen3alt3 = f"""
-        {player2_name:^50}
-        ▐▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▌
-        ▐                       {player2_card.get_value():<2}                       ▌
-        ▐         {player2_hand.get_amount():<2}🂠           {player2_card.get_symbol()}                        ▌
-        ▐                                                ▌
-        ▐                                                ▌
-        ▐                                                ▌
-        ▐                      War!                      ▌
-        ▐                                                ▌
-        ▐                                                ▌
-        ▐                                                ▌
-        ▐                       {player1_card.get_symbol()}           🂠{player1_hand.get_amount():>2}          ▌
-        ▐                       {player1_card.get_value():<2}                       ▌
-        ▐▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▌
-        {player1_name:^50}
-                        """
-            print(screen3alt3)
-            self._pause()
+            depth += 1
+            yield War(*table(), player1_card, player2_card, depth)
 
             # Check if players have enough cards for war
             if len(player1_hand.get_hand()) < 2:  # Player 1 doesn't have enough
-                for card in player1_hand.get_active_card():
-                    player2_hand.add_card(player1_hand.remove_card())
-                player2_hand.return_cards()
-
-                screen3alt3 = f"""
-        {player2_name:^50}
-        ▐▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▌
-        ▐                       {player2_card.get_value():<2}                       ▌
-        ▐         {player2_hand.get_amount():<2}🂠           {player2_card.get_symbol()}                        ▌
-        ▐                                                ▌
-        ▐                                                ▌
-        ▐                                                ▌
-        ▐{(player1_name + " doesn't have enough cards!"):^48}▌
-        ▐                                                ▌
-        ▐                                                ▌
-        ▐                                                ▌
-        ▐                       {player1_card.get_symbol()}           🂠{player1_hand.get_amount():>2}          ▌
-        ▐                       {player1_card.get_value():<2}                       ▌
-        ▐▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▌
-        {player1_name:^50}
-                        """
-                print(screen3alt3)
-
+                save_len = len(player1_hand.get_active_card())
+                player2_hand.collect_pot(player1_hand)
+                yield NotEnoughCards(*table(), player1_card, player2_card, 2, save_len)
                 return
             elif len(player2_hand.get_hand()) < 2:  # Player 2 doesn't have enough cards
-                for card in player2_hand.get_active_card():
-                    player1_hand.add_card(player2_hand.remove_card())
-                player1_hand.return_cards()
-
-                screen3alt3 = f"""
-        {player2_name:^50}
-        ▐▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▌
-        ▐                       {player2_card.get_value():<2}                       ▌
-        ▐         {player2_hand.get_amount():<2}🂠           {player2_card.get_symbol()}                        ▌
-        ▐                                                ▌
-        ▐                                                ▌
-        ▐                                                ▌
-        ▐{(player2_name + " doesn't have enough cards!"):^48}▌
-        ▐                                                ▌
-        ▐                                                ▌
-        ▐                                                ▌
-        ▐                       {player1_card.get_symbol()}           🂠{player1_hand.get_amount():>2}          ▌
-        ▐                       {player1_card.get_value():<2}                       ▌
-        ▐▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▌
-        {player1_name:^50}
-                        """
-                print(screen3alt3)
-
+                save_len = len(player2_hand.get_active_card())
+                player1_hand.collect_pot(player2_hand)
+                yield NotEnoughCards(*table(), player1_card, player2_card, 1, save_len)
                 return
 
-            # Each player places one card face down (internal mechanics, do not
-            # increment the public draw counter)
+            # Each player places one card face down, then the war goes on with
+            # the next face up cards
             player1_hand.draw_card()
             player2_hand.draw_card()
+            yield FaceDown(*table())
+
+    def simulate(self):
+        """Play the active game to the end without rendering any screens.
 
-            screen2 = f"""
-        {player2_name:^50}
-        ▐▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▌
-        ▐                       ?                        ▌
-        ▐         {player2_hand.get_amount():<2}🂠           🂠                        ▌
-        ▐                                                ▌
-        ▐                                                ▌
-        ▐                                                ▌
-        ▐             Place cards face down...           ▌
-        ▐                                                ▌
-        ▐                                                ▌
-        ▐                                                ▌
-        ▐                       🂠           🂠{player1_hand.get_amount():>2}          ▌
-        ▐                       ?                        ▌
-        ▐▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▌
-        {player1_name:^50}
-                    """
-            print(screen2)
-            self._pause()
-
-            # Recursively call draw_cards to determine who wins the war. Mark
-            # this as internal so the public draw counter isn't incremented again.
-            self.draw_cards(internal=True)
+        The rounds are resolved by the headless Engine using the current hands
+        of both players, without any round events. The winner is recorded in
+        the highscores and GameOver is published, just like the final call to
+        draw_cards would do. A game that loops or hits the round cap has no
+        winner, so nothing is recorded.
+
+        :return: GameResult whose num_draws covers the whole game
+        """
+        result = Engine(*self.__players).run()
+        self.num_draws += result.num_draws
+        if result.winner:
+            winner_name = self.__players[result.winner - 1].get_name()
+            loser_name = self.__players[2 - result.winner].get_name()
+            self.__highscore.add_statistics(
+                winner_name, True, self.num_draws, datetime.date.today()
+            )
+            self._publish(GameOver(winner_name, loser_name, self.num_draws))
+        return result._replace(num_draws=self.num_draws)
 
     def name_change(self, current_name, new_name):
         """Change a player's name and persist the updated highscores.
 
-        This updates the player's key in the Highscore object and triggers
-        a save to the configured highscores file.
+        This updates the player's key in the Highscore object and requests a
+        save in the background, unless the Highscore keeps a journal, where
+        the rename is already persisted.
 
         Parameters
         ----------
@@ -380,13 +303,51 @@ class Game:
             The new player name.
         """
         self.__highscore.update_player_name(current_name, new_name)
-        self.save_highscore()
+        if not self.__highscore.get_journal():
+            self.__highscore.request_save()
 
     # Functions for manipulating highscores
-    def show_highscore(self):
-        """Prints the current values of the highscore object as a String."""
-        print(self.__highscore)
+    def show_highscore(self, since=None, until=None):
+        """Prints the top LEADERBOARD_SIZE players of the leaderboard.
+
+        :param since: first day of the games that count, all games if None
+        :param until: last day of the games that count, up to now if None
+        """
+        board = self.__highscore.get_leaderboard()
+        print(board.table(self.LEADERBOARD_SIZE, since, until))
+
+    def compact_highscores(self, days):
+        """Roll games older than `days` days into per-day totals.
+
+        Only highscores that can compact (see can_compact), such as a
+        ShardedHighscore, can do this; for others a message is printed.
+
+        :param days: number of most recent days whose games are kept
+        """
+        if not self.__highscore.can_compact():
+            print(
+                "These highscores can't be compacted. Start the game with "
+                "'python -m war --highscores sharded' to keep them in shards."
+            )
+            return
+        before = datetime.date.today() - datetime.timedelta(days=days)
+        compacted = self.__highscore.compact(before)
+        self.__highscore.save_highscores()
+        print(f"Compacted {compacted} games played before {before.isoformat()}.")
 
     def save_highscore(self):
-        """Saves the current values of the highscore object."""
+        """Saves the current values of the highscore object.
+
+        Also waits for a save the highscore is writing in the background.
+        """
         self.__highscore.save_highscores()
+        self.__highscore.flush()
+
+    def close(self):
+        """Write the highscore saves still pending and close the highscores.
+
+        The Game can still be played afterwards: the journal highscores start
+        a new writer thread on the next save and the SQLite highscores open
+        their database again.
+        """
+        self.__highscore.close()
@@ -3,16 +3,180 @@
 Provides the Highscore class used to load/save player statistics to JSON and
 reconstruct Statistics objects on load. This module contains IO code and
 serialization helpers used by Game and Shell.
+
+Optionally every change is also appended to a JSON-Lines journal next to the
+JSON file, so changes are persisted without rewriting the whole file. Saving
+compacts the journal into the JSON snapshot.
+
+Highscores are loaded on first use, and the parsed store is shared by every
+Highscore of the process that uses the same file, for as long as the file
+has not changed.
+
+Saves can also be requested to happen later on a background thread, which
+coalesces a burst of requests into one write.
+
+The JSON file is parsed as a stream, one record at a time, so loading never
+holds the parsed file and the loaded highscores in memory together.
+
+Several processes can share one file: saves are serialized with an advisory
+lock, and a save merges its changes into whatever another process saved.
 """
 
+import atexit
+import contextlib
+import datetime
 import json
 import os
+import tempfile
+import threading
+import time
+import weakref
 from typing import Any
 
 try:
-    from Statistics import Statistics
+    import fcntl
+except ImportError:  # Windows: saves are then only serialized within a process
+    fcntl = None
+
+try:
+    from Leaderboard import Leaderboard
+    from Statistics import Statistics, StatisticsColumns
 except:
-    from .Statistics import Statistics
+    from .Leaderboard import Leaderboard
+    from .Statistics import Statistics, StatisticsColumns
+
+
+class _JsonStream:
+    """Reads a JSON document from a text file piece by piece.
+
+    Only the chunk being parsed is held in memory. The caller walks the
+    structure with peek/expect and decodes the values it wants whole.
+    """
+
+    CHUNK = 1 << 16  # Characters read at a time
+
+    def __init__(self, file, progress=None):
+        """Read from `file`, calling progress(characters read) per chunk."""
+        self.__file = file
+        self.__progress = progress
+        self.__decoder = json.JSONDecoder()
+        self.__buffer = ""
+        self.__pos = 0
+        self.__read = 0
+        self.__eof = False
+
+    def _fill(self):
+        """Append the next chunk to the buffer, return False at the end."""
+        if self.__eof:
+            return False
+        chunk = self.__file.read(self.CHUNK)
+        if not chunk:
+            self.__eof = True
+            return False
+        self.__buffer = self.__buffer[self.__pos :] + chunk
+        self.__pos = 0
+        self.__read += len(chunk)
+        if self.__progress is not None:
+            self.__progress(self.__read)
+        return True
+
+    def peek(self):
+        """Return the next character that isn't whitespace, "" at the end."""
+        while True:
+            while self.__pos < len(self.__buffer):
+                char = self.__buffer[self.__pos]
+                if char not in " \t\n\r":
+                    return char
+                self.__pos += 1
+            if not self._fill():
+                return ""
+
+    def expect(self, char):
+        """Consume `char`, which must be the next character."""
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} in JSON stream")
+        self.__pos += 1
+
+    def buffered_value(self):
+        """Decode the next value if it is complete in the buffer.
+
+        :return: (True, value), or (False, None) without consuming anything
+            when the value goes on past the buffer
+        """
+        self.peek()
+        try:
+            value, end = self.__decoder.raw_decode(self.__buffer, self.__pos)
+        except json.JSONDecodeError:
+            return False, None
+        if end == len(self.__buffer) and not self.__eof:
+            return False, None  # May be a number that goes on
+        self.__pos = end
+        return True, value
+
+    def value(self):
+        """Decode and return the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.__decoder.raw_decode(self.__buffer, self.__pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number at the end of the buffer may go on in the next chunk
+            if end < len(self.__buffer) or not self._fill():
+                self.__pos = end
+                return value
+
+
+# Parsed stores shared within the process: absolute path to a tuple of
+# (signature, _Store), see Highscore._signature
+_CACHE = {}
+_CACHE_LOCK = threading.Lock()
+
+# Highscores with a running writer thread, closed when the interpreter exits
+# so no requested save is lost
+_WRITERS = weakref.WeakSet()
+
+
+@atexit.register
+def _close_writers():
+    """Write the requested saves and stop every writer thread."""
+    for highscore in list(_WRITERS):
+        highscore.close()
+
+
+def _wake(writer_state):
+    """Wake a writer thread, whose Highscore has been dropped."""
+    with writer_state:
+        writer_state.notify_all()
+
+
+class _Store:
+    """The loaded highscores of a file and the state of their changes.
+
+    Everything that describes the store is kept here rather than on a
+    Highscore, so Highscores that share the store also share its lock,
+    change log, version and what they know of the file on disk.
+    """
+
+    def __init__(self, highscores, disk_signature):
+        """Initialize the store of loaded highscores.
+
+        :param highscores: dict mapping player names to histories
+        :param disk_signature: signature of the files they were read from
+        """
+        self.highscores = highscores
+        self.leaderboard = Leaderboard()
+        self.leaderboard.load(highscores)
+        self.lock = threading.RLock()  # Held by changes to the store
+        self.version = 0  # Changes made, to tell if a save is still current
+        self.file_lock = threading.Lock()  # Held while the file is replaced
+        self.written_version = -1  # Version of the last save written
+        self.changes = []  # Journal records of the changes not on disk yet
+        self.replaced = None  # Version of a set_highscores not saved yet
+        self.disk_signature = disk_signature  # Of the files last read or written
+        self.journal_records = 0  # Records in the journal since the last save
 
 
 class Highscore:
@@ -20,20 +184,84 @@ class Highscore:
 
     Stores highscores in a private dictionary mapping player names to lists
     of Statistics objects. Provides load/save and simple management helpers.
+
+    With journaling on, each change appends one small record to the journal
+    file instead of requiring a full save. Loading replays the journal on top
+    of the JSON snapshot, and saving writes a new snapshot and empties the
+    journal. The journal is compacted this way automatically once it holds
+    COMPACT_EVERY records.
+
+    With columnar storage on, each player's history is a StatisticsColumns
+    instead of a list, which needs far less memory for long histories.
+
+    The Leaderboard of the players is kept up to date by every change, see
+    get_leaderboard.
+
+    Saves, and journal appends, hold an exclusive advisory lock on the lock
+    file (see get_lock_filename), so processes sharing the file take turns.
+    Each change is also kept in a change log until it is on disk. If another
+    process saved since the file was loaded, a save first reads the file
+    again and replays the change log onto it, so neither process loses the
+    other's games; a removed game is found again by its contents, not its
+    index. A set_highscores replacement is saved as it is.
+
+    A new Highscore takes its store from the process-wide cache if another
+    Highscore loaded the same file and it hasn't changed since, judged by
+    its modification time and size; both Highscores then share one store,
+    with its lock, change log and version, and see each other's changes and
+    replacements. Creating a Highscore reads nothing: the cache is looked up
+    and the file parsed on first use. A change that is not yet on disk
+    removes the store from the cache, and saving puts it back.
+
+    request_save marks the highscores dirty and returns at once. A writer
+    thread saves them once no new request came for `save_delay` seconds, so
+    a burst of changes costs one write; flush and close wait for it, and
+    the interpreter closes every writer thread when it exits. The thread
+    ends by itself once its Highscore is dropped. Every
+    save writes a temporary file and renames it over the old one, so the
+    file is never left half written. Changes hold a lock, which the writer
+    only takes to copy the player lists before it serializes them.
     """
 
-    def __init__(self, filename="war/highscores.json"):
-        """Initialize Highscore and load existing data from filename.
+    COMPACT_EVERY = 10000  # Journal records that trigger a compaction
+    PROGRESS_BYTES = 16 << 20  # Larger files report their loading progress
+
+    def __init__(
+        self,
+        filename="war/highscores.json",
+        journal=False,
+        columnar=False,
+        save_delay=0.5,
+    ):
+        """Initialize Highscore; data is loaded from filename on first use.
 
         :param filename: path to JSON file used for persistence
+        :param journal: append every change to the journal file (see
+            get_journal_filename), off by default
+        :param columnar: keep histories of Statistics in StatisticsColumns,
+            off by default
+        :param save_delay: seconds without a new request_save before the
+            writer thread saves
         """
         self.__filename = filename
-        self.load_highscores()
+        self.__journal = journal
+        self.__columnar = columnar
+        self.__save_delay = save_delay
+        self.__writer = None  # Write-behind thread, started by request_save
+        self.__writer_state = threading.Condition()
+        self.__dropped = None  # Wakes the writer thread, see request_save
+        self.__save_requested = None  # Time of the last request_save
+        self.__writing = False
+        self.__hurry = False  # Set by flush and close: save without delay
+        self.__replaying = False
+        self.__store = None  # Loaded on first use, see _ensure_loaded
+        self.__loading = threading.RLock()  # Held while the store is looked up
 
     def __str__(self):
         """Return a human-readable representation of all highscores."""
+        store = self._ensure_loaded()
         tmp = []
-        for name, statistics in self.__highscores.items():
+        for name, statistics in store.highscores.items():
             lines = [f"{name}:"]
             for stat_obj in statistics:
                 if isinstance(stat_obj, Statistics):
@@ -44,14 +272,97 @@ class Highscore:
         return "\n".join(tmp)
 
     def save_highscores(self):
-        """Save highscores to the configured JSON file."""
+        """Save highscores to the configured JSON file.
+
+        With journaling on this is the compaction: the journal is emptied once
+        the snapshot has been written. A pending request_save is covered by
+        this save and dropped.
+        """
+        with self.__writer_state:
+            self.__save_requested = None
+        self._save(announce=True)
+
+    def _save(self, announce):
+        """Write the highscores to the JSON file, under the file lock.
+
+        Changes another process saved meanwhile are merged in first. The
+        player lists are copied under the lock and serialized after it is
+        released. With journaling on, the whole save holds the lock, as the
+        journal must be emptied together with the write.
+
+        :param announce: print a message when the save succeeds
+        """
+        store = self._ensure_loaded()
+        held = store.lock
+        held.acquire()
+        try:
+            with self._locked_file():
+                if self._changed_on_disk(store):
+                    self._merge(store)
+                version = store.version
+                logged = store.changes[:]
+                snapshot = {
+                    name: lst[:] if isinstance(lst, (list, StatisticsColumns)) else lst
+                    for name, lst in store.highscores.items()
+                }
+                if not self.__journal:
+                    held.release()
+                    held = None
+                saved = self._write(store, snapshot, version)
+                signature = self._signature() if saved else None
+        finally:
+            if held is not None:
+                held.release()
+        if saved:
+            with store.lock:
+                self._saved(store, version, logged, signature)
+            if announce:
+                print(f"Highscores successfully saved to file {self.__filename}")
+
+    def _write(self, store, snapshot, version):
+        """Serialize a copy of the highscores and replace the file with it.
+
+        A copy older than the last one written is dropped, so a slow
+        background save can't overwrite a newer save.
+
+        :return: True when the copy was written
+        """
+        with store.file_lock:
+            if version < store.written_version:
+                return False
+            saved = self._write_file(store, snapshot)
+            if saved:
+                store.written_version = version
+        return saved
+
+    def _saved(self, store, version, logged, signature):
+        """Forget the changes a save has written, and share the store again.
+
+        :param version: version of the store that was written
+        :param logged: the change log records it included
+        :param signature: signature of the files right after the write
+        """
+        written = {id(record) for record in logged}
+        store.changes[:] = [r for r in store.changes if id(r) not in written]
+        if store.replaced is not None and store.replaced <= version:
+            store.replaced = None
+        if version == store.written_version:
+            store.disk_signature = signature
+        if version == store.version:
+            self._recache(store, signature)
+
+    def _write_file(self, store, snapshot):
+        """Write a copy of the highscores to the file, return True on success."""
         try:
             # Ensure directory exists
             os.makedirs(os.path.dirname(self.__filename), exist_ok=True)
 
             # Convert any Statistics objects to dicts for JSON serialization
             serializable: dict[str, Any] = {}
-            for name, lst in self.__highscores.items():
+            for name, lst in snapshot.items():
+                if isinstance(lst, StatisticsColumns):
+                    serializable[name] = lst.to_dicts()
+                    continue
                 converted = []
                 for item in lst:
                     if isinstance(item, Statistics):
@@ -60,45 +371,582 @@ class Highscore:
                         converted.append(item)
                 serializable[name] = converted
 
-            with open(self.__filename, "w", encoding="utf-8") as file:
-                json.dump(serializable, file, ensure_ascii=False)
+            self._replace_file(serializable)
+            # The snapshot now holds every journaled change
+            if self.__journal:
+                open(self.get_journal_filename(), "w", encoding="utf-8").close()
+                store.journal_records = 0
         except (IOError, TypeError) as e:
             print(f"Unable to save highscores to file {self.__filename}: {e}")
+            return False
+        return True
+
+    def _replace_file(self, serializable):
+        """Write JSON to a temporary file, then rename it over the old file."""
+        directory = os.path.dirname(self.__filename) or "."
+        fd, temp = tempfile.mkstemp(
+            dir=directory, prefix=os.path.basename(self.__filename), suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(serializable, file, ensure_ascii=False)
+            # mkstemp creates the file private to the user; keep the old mode
+            try:
+                mode = os.stat(self.__filename).st_mode & 0o777
+            except OSError:
+                mode = 0o644
+            os.chmod(temp, mode)
+            os.replace(temp, self.__filename)
+        except BaseException:
+            os.unlink(temp)
+            raise
+
+    @contextlib.contextmanager
+    def _locked_file(self):
+        """Hold an exclusive advisory lock on the lock file.
+
+        Without fcntl, or when the lock file can't be opened, nothing is
+        locked.
+        """
+        try:
+            if fcntl is None:
+                raise OSError("no fcntl")
+            file = open(self.get_lock_filename(), "a")
+        except OSError:
+            yield
+            return
+        with file:
+            fcntl.flock(file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(file, fcntl.LOCK_UN)
+
+    def _changed_on_disk(self, store):
+        """Return True when another process wrote the files since they were read.
+
+        Missing files and a set_highscores replacement leave nothing to
+        merge.
+        """
+        if store.replaced is not None:
+            return False
+        signature = self._signature()
+        if all(stat is None for stat in signature[2:]):
+            return False
+        return signature != store.disk_signature
+
+    def _merge(self, store):
+        """Read the files again and replay the change log onto them.
+
+        Only the changes of this store that are not on disk are applied, so
+        the cost is that of a load plus one call per change. The files are
+        loaded by a new Highscore, and the store is updated in place, as
+        other Highscores may share it.
+        """
+        reader = Highscore(self.__filename, self.__journal, self.__columnar)
+        if not reader._load():
+            # Better to keep this store than to merge into an empty one
+            print(f"Unable to merge highscores from file {self.__filename}")
+            return
+        loaded = reader.__store
+        store.highscores.clear()
+        store.highscores.update(loaded.highscores)
+        store.leaderboard.load(store.highscores)
+        store.disk_signature = loaded.disk_signature
+        store.journal_records = loaded.journal_records
+        replaying, self.__replaying = self.__replaying, True
+        try:
+            for record in store.changes:
+                self._apply(record)
+        finally:
+            self.__replaying = replaying
+
+    def request_save(self):
+        """Save the highscores soon, on the writer thread, and return at once.
+
+        Requests less than `save_delay` seconds apart are coalesced into a
+        single write.
+        """
+        with self.__writer_state:
+            self.__save_requested = time.monotonic()
+            if self.__writer is None:
+                self.__writer = threading.Thread(
+                    target=Highscore._write_behind,
+                    args=(weakref.ref(self), self.__writer_state),
+                    name="highscore-writer",
+                    daemon=True,
+                )
+                self.__writer.start()
+                if self.__dropped is None:
+                    self.__dropped = weakref.finalize(self, _wake, self.__writer_state)
+                _WRITERS.add(self)
+            self.__writer_state.notify_all()
+
+    def flush(self):
+        """Wait until a requested save, if any, has been written."""
+        with self.__writer_state:
+            if self.__writer is None:
+                return
+            self.__hurry = True
+            self.__writer_state.notify_all()
+            while self.__save_requested is not None or self.__writing:
+                self.__writer_state.wait()
+            self.__hurry = False
+
+    def close(self):
+        """Write a requested save and stop the writer thread.
+
+        A later request_save starts a new writer thread. Writer threads that
+        are still running when the interpreter exits are closed then.
+        """
+        with self.__writer_state:
+            writer, self.__writer = self.__writer, None
+            if writer is None:
+                return
+            _WRITERS.discard(self)
+            self.__hurry = True
+            self.__writer_state.notify_all()
+        writer.join()
+        with self.__writer_state:
+            self.__hurry = False
+
+    @staticmethod
+    def _write_behind(ref, writer_state):
+        """Run the writer thread: save once requests have settled.
+
+        The thread only holds its Highscore while a save is requested, and a
+        weak reference while it waits for a request. The thread ends when
+        close has been called and nothing is left to save, or when the
+        Highscore has been dropped.
+
+        :param ref: weak reference to the Highscore
+        :param writer_state: the Highscore's condition of the writer state
+        """
+        this = threading.current_thread()
+        with writer_state:
+            while True:
+                highscore = ref()
+                if highscore is None:  # Dropped
+                    break
+                requested = highscore.__save_requested
+                if requested is None:
+                    if highscore.__writer is not this:  # Closed
+                        break
+                    del highscore
+                    writer_state.wait()
+                    continue
+                wait = requested + highscore.__save_delay - time.monotonic()
+                if wait > 0 and not highscore.__hurry and highscore.__writer is this:
+                    writer_state.wait(wait)
+                    continue
+                highscore.__save_requested = None
+                highscore.__writing = True
+                writer_state.release()
+                try:
+                    highscore._save(announce=False)
+                finally:
+                    writer_state.acquire()
+                    highscore.__writing = False
+                    writer_state.notify_all()
+
+    def load_highscores(self, progress=None):
+        """Load highscores from JSON, returning an empty dict on failure.
+
+        The files are read again into a new store, which this Highscore no
+        longer shares with others that used the old one. Changes not saved
+        before the reload are dropped.
+
+        :param progress: called as progress(characters read, file size) while
+            the file is parsed; by default files over PROGRESS_BYTES print
+            their progress
+        """
+        loaded = self._load(progress)
+        if loaded:
+            print(f"Highscores successfully loaded from file {self.__filename}")
         else:
-            print(f"Highscores successfully saved to file {self.__filename}")
+            print(f"Unable to load highscores from file {self.__filename}")
+        store = self.__store
+        self._recache(store, store.disk_signature)
+        return store.highscores
 
-    def load_highscores(self):
-        """Load highscores from JSON, returning an empty dict on failure."""
+    def _load(self, progress=None):
+        """Replace the store with a new one holding the contents of the files.
+
+        A JSON file that can't be read gives empty highscores, with the
+        journal replayed onto them.
+
+        :return: True when the JSON file was loaded
+        """
+        signature = self._signature()
         try:
+            size = os.path.getsize(self.__filename)
             with open(self.__filename, "r", encoding="utf-8") as file:
-                raw = json.load(file)
+                reconstructed = self._parse(file, size, progress)
         except (IOError, ValueError, TypeError):
-            self.__highscores = {}
-            print(f"Unable to load highscores from file {self.__filename}")
-            return self.__highscores
+            reconstructed = None
+        journal_text = None
+        if self.__journal:
+            try:
+                with open(self.get_journal_filename(), "r", encoding="utf-8") as file:
+                    journal_text = file.read()
+            except (IOError, OSError):
+                pass
 
-        # Convert any dict representations back into Statistics objects when appropriate
-        reconstructed: dict[str, list[Any]] = {}
-        for name, lst in raw.items():
-            new_list = []
-            if isinstance(lst, list):
-                for item in lst:
-                    if isinstance(item, dict) and (
-                        "has_won" in item or "draws" in item
-                    ):
-                        try:
-                            new_list.append(Statistics.from_dict(item))
-                        except Exception:
-                            new_list.append(item)
+        self.__store = _Store(
+            reconstructed if reconstructed is not None else {}, signature
+        )
+        if self.__journal:
+            self._replay_journal(journal_text)
+        return reconstructed is not None
+
+    def _parse(self, file, size, progress=None):
+        """Parse a highscores JSON object from a text file, record by record.
+
+        Records become Statistics through the fast path of from_trusted, or
+        go straight into StatisticsColumns. Dates are parsed once per
+        distinct date string. Records of another shape are handled like
+        Statistics.from_dict did, or kept as they are.
+
+        :param size: size of the file, for progress reports
+        """
+        if progress is None and size > self.PROGRESS_BYTES:
+            progress = self._progress_printer()
+        report = None
+        if progress is not None:
+            report = lambda done: progress(min(done, size), size)
+        stream = _JsonStream(file, report)
+        dates = {}  # ISO date string to date, see _date
+        highscores = {}
+        stream.expect("{")
+        if stream.peek() == "}":
+            return highscores
+        while True:
+            name = stream.value()
+            if not isinstance(name, str):
+                raise ValueError("Expected a player name in JSON stream")
+            stream.expect(":")
+            history = StatisticsColumns() if self.__columnar else []
+            if stream.peek() != "[":
+                history = stream.value()
+            else:
+                # A history that is all in the buffer is decoded in one go,
+                # a longer one record by record
+                complete, items = stream.buffered_value()
+                if complete:
+                    history = self._add_records(history, items, dates)
+                else:
+                    stream.expect("[")
+                    while stream.peek() != "]":
+                        item = stream.value()
+                        history = self._add_record(history, item, dates)
+                        if stream.peek() == ",":
+                            stream.expect(",")
+                        elif stream.peek() != "]":
+                            raise ValueError("Expected ',' or ']' in JSON stream")
+                    stream.expect("]")
+            highscores[name] = history
+            if stream.peek() == ",":
+                stream.expect(",")
+                continue
+            stream.expect("}")
+            return highscores
+
+    @classmethod
+    def _add_records(cls, history, items, dates):
+        """Append a list of parsed records to a history and return it.
+
+        Records as written by save_highscores take a tight fast path; from
+        the first other record on, each goes through _add_record.
+        """
+        columnar = isinstance(history, StatisticsColumns)
+        append = history.append_values if columnar else history.append
+        trusted = Statistics.from_trusted
+        for index, item in enumerate(items):
+            try:
+                has_won, draws, date = item["has_won"], item["draws"], item["date"]
+            except (TypeError, KeyError):
+                break
+            if type(has_won) is not bool or type(draws) is not int:
+                break
+            if date is not None:
+                if type(date) is not str:
+                    break
+                date = dates[date] if date in dates else cls._date(dates, date)
+            if columnar:
+                append(has_won, draws, date)
+            else:
+                append(trusted(has_won, draws, date))
+        else:
+            return history
+        for item in items[index:]:
+            history = cls._add_record(history, item, dates)
+        return history
+
+    @classmethod
+    def _add_record(cls, history, item, dates):
+        """Append a parsed record to a history and return the history.
+
+        A columnar history that meets a record that isn't a game result is
+        turned into a list of Statistics first.
+        """
+        if isinstance(item, dict) and ("has_won" in item or "draws" in item):
+            has_won, draws = item.get("has_won", False), item.get("draws", 0)
+            date = item.get("date")
+            if type(has_won) is bool and type(draws) is int:
+                if date is None or isinstance(date, str):
+                    if date is not None:
+                        date = cls._date(dates, date)
+                    if isinstance(history, StatisticsColumns):
+                        history.append_values(has_won, draws, date)
                     else:
-                        new_list.append(item)
+                        history.append(Statistics.from_trusted(has_won, draws, date))
+                    return history
+            try:
+                item = Statistics.from_dict(item)
+            except Exception:
+                pass
+        if isinstance(history, StatisticsColumns):
+            if not isinstance(item, Statistics):
+                rows = [history.pop() for _ in range(len(history))]
+                history = rows[::-1]
+        history.append(item)
+        return history
+
+    @staticmethod
+    def _date(dates, text):
+        """Return the date of an ISO string, parsing each string only once.
+
+        :param dates: cache of the strings parsed so far
+        """
+        date = dates.get(text, False)
+        if date is False:
+            try:
+                date = datetime.date.fromisoformat(text)
+            except ValueError:
+                date = None
+            dates[text] = date
+        return date
+
+    @staticmethod
+    def _progress_printer():
+        """Return a progress callback that prints every 10% of the file."""
+        printed = [0]
+
+        def progress(done, size):
+            percent = done * 100 // size // 10 * 10
+            if percent > printed[0]:
+                printed[0] = percent
+                print(f"Loading highscores: {percent}%")
+
+        return progress
+
+    def _ensure_loaded(self):
+        """Return the store, loaded on first use, from the cache if current."""
+        with self.__loading:
+            if self.__store is None and not self._from_cache(self._signature()):
+                self.load_highscores()
+            return self.__store
+
+    def _from_cache(self, signature):
+        """Take the cached store of the file if it has the given signature.
+
+        :return: True when the store was taken from the cache
+        """
+        with _CACHE_LOCK:
+            entry = _CACHE.get(os.path.abspath(self.__filename))
+        if entry is None or entry[0] != signature:
+            return False
+        self.__store = entry[1]
+        return True
+
+    def _signature(self):
+        """Return what the cached store of the file depends on.
+
+        That is the options that change how it is loaded and the inode,
+        modification time and size of the JSON file and, with journaling on,
+        the journal. A save replaces the file, so it always gets a new inode.
+        """
+        files = [self.__filename]
+        if self.__journal:
+            files.append(self.get_journal_filename())
+        signature = [self.__journal, self.__columnar]
+        for filename in files:
+            try:
+                stat = os.stat(filename)
+            except OSError:
+                signature.append(None)
             else:
-                new_list = lst
-            reconstructed[name] = new_list
+                signature.append((stat.st_ino, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def _recache(self, store, signature=None):
+        """Share a loaded store, which matches the file on disk.
+
+        :param signature: signature of the files the store matches, those
+            on disk right now when None
+        """
+        if signature is None:
+            signature = self._signature()
+        with _CACHE_LOCK:
+            _CACHE[os.path.abspath(self.__filename)] = (signature, store)
+
+    def _uncache(self, store):
+        """Stop sharing a store once it has changes that aren't on disk."""
+        path = os.path.abspath(self.__filename)
+        with _CACHE_LOCK:
+            entry = _CACHE.get(path)
+            if entry is not None and entry[1] is store:
+                del _CACHE[path]
+
+    @staticmethod
+    def clear_cache():
+        """Forget every shared store, so the next use reads the files again."""
+        with _CACHE_LOCK:
+            _CACHE.clear()
 
-        self.__highscores = reconstructed
-        print(f"Highscores successfully loaded from file {self.__filename}")
-        return self.__highscores
+    def _replay_journal(self, text):
+        """Apply the records of the journal to the loaded highscores.
+
+        A damaged record, such as the last line of an interrupted write, ends
+        the replay.
+
+        :param text: contents of the journal file, None when there is none
+        """
+        self.__store.journal_records = 0
+        if text is None:
+            return
+        replaying, self.__replaying = self.__replaying, True
+        try:
+            for line in text.splitlines():
+                try:
+                    record = json.loads(line)
+                    self._apply(record)
+                except (ValueError, TypeError, KeyError, AttributeError):
+                    print(
+                        f"Stopped reading damaged journal {self.get_journal_filename()}"
+                    )
+                    break
+                self.__store.journal_records += 1
+        finally:
+            self.__replaying = replaying
+
+    def _apply(self, record):
+        """Apply a single journal record by calling the matching method."""
+        op = record["op"]
+        if op == "add_player":
+            self.add_player(record["name"], self._revive(record["statistics"]))
+        elif op == "rename":
+            self.update_player_name(record["name"], record["new_name"])
+        elif op == "remove_player":
+            self.remove_player(record["name"])
+        elif op == "add_statistics":
+            stat = Statistics.from_dict(record["statistics"])
+            self.add_statistics(
+                record["name"], stat.get_has_won(), stat.get_draws(), stat.get_date()
+            )
+        elif op == "remove_statistics":
+            index = record["index"]
+            if "statistics" in record:
+                index = self._find_statistics(
+                    record["name"], index, record["statistics"]
+                )
+            if index is not None:
+                self.remove_statistics(record["name"], index)
+        else:
+            raise KeyError(op)
+
+    def _find_statistics(self, name, index, content):
+        """Return the index of a record with the given serialized content.
+
+        A removal is replayed by content, as another process may have
+        removed records of the player since: the record at `index` is
+        taken if it still matches, otherwise the first record that does.
+
+        :param content: the record as it was serialized when removed
+        :return: the index, or None when no record matches any more
+        """
+        history = self._ensure_loaded().highscores.get(name)
+        if not isinstance(history, (list, StatisticsColumns)):
+            return index  # Let remove_statistics report it
+
+        def matches(item):
+            if isinstance(item, Statistics):
+                return item.to_dict() == content
+            return item == content
+
+        try:
+            if matches(history[index]):
+                return index
+        except (IndexError, TypeError):
+            pass
+        for position, item in enumerate(history):
+            if matches(item):
+                return position
+        return None
+
+    @staticmethod
+    def _revive(items):
+        """Turn serialized statistics back into Statistics objects."""
+        return [
+            (
+                Statistics.from_dict(item)
+                if isinstance(item, dict) and ("has_won" in item or "draws" in item)
+                else item
+            )
+            for item in items
+        ]
+
+    def _store(self, statistics):
+        """Return a history the way it is kept, columns if columnar is on.
+
+        Only lists made up of Statistics objects are converted to columns.
+        """
+        if (
+            self.__columnar
+            and isinstance(statistics, list)
+            and all(isinstance(item, Statistics) for item in statistics)
+        ):
+            return StatisticsColumns(statistics)
+        return statistics
+
+    def _journal(self, store, op, name, **fields):
+        """Record a change: log it and append it to the journal, if it is on.
+
+        Nothing is recorded while the journal itself is being replayed. A
+        change stays in the change log until it is on disk, and the shared
+        store is kept in the cache only if the change reached the disk.
+        """
+        if self.__replaying:
+            return
+        store.version += 1
+        record = {"op": op, "name": name, **fields}
+        if not self.__journal:
+            store.changes.append(record)
+            self._uncache(store)
+            return
+        try:
+            with self._locked_file():
+                before = self._signature()
+                with open(self.get_journal_filename(), "a", encoding="utf-8") as file:
+                    file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                # Only this append changed the files since they were read
+                if before == store.disk_signature:
+                    store.disk_signature = self._signature()
+        except (IOError, TypeError) as e:
+            print(f"Unable to write to journal {self.get_journal_filename()}: {e}")
+            store.changes.append(record)
+            self._uncache(store)
+            return
+        store.journal_records += 1
+        if store.journal_records >= self.COMPACT_EVERY:
+            self.save_highscores()
+        elif not store.changes:
+            self._recache(store, store.disk_signature)
+
+    def _say(self, message):
+        """Print a message, except while the journal is being replayed."""
+        if not self.__replaying:
+            print(message)
 
     def add_player(self, name: str = "Anonymous", statistics=None):
         """Add a player key to the highscores dict.
@@ -106,14 +954,27 @@ class Highscore:
         If the player exists this is a no-op. `statistics` should be a list
         of Statistics objects or None.
         """
+        store = self._ensure_loaded()
+        with store.lock:
 
-        if statistics is None:
-            statistics = []
+            if statistics is None:
+                statistics = []
 
-        if name not in self.__highscores:
-            self.__highscores[name] = statistics
-        else:
-            print(f"Player {name} already exists in dictionary")
+            if name not in store.highscores:
+                statistics = self._store(statistics)
+                store.highscores[name] = statistics
+                store.leaderboard.add_player(name, statistics)
+                self._journal(
+                    store,
+                    "add_player",
+                    name,
+                    statistics=[
+                        item.to_dict() if isinstance(item, Statistics) else item
+                        for item in statistics
+                    ],
+                )
+            else:
+                self._say(f"Player {name} already exists in dictionary")
 
     def update_player_name(self, name, new_name):
         """Rename a player key while preserving their statistics.
@@ -121,30 +982,43 @@ class Highscore:
         If `name` does not exist tests expect `new_name` to be created as an
         empty entry.
         """
-        if name in self.__highscores:
-            # move existing entry to new name
-            self.__highscores[new_name] = self.__highscores.pop(name)
-            print(f"Changed {name} to {new_name}")
-        else:
-            # If the original name isn't present, ensure the requested new_name exists
-            # (tests expect a key to be created even when the source name is missing).
-            if new_name not in self.__highscores:
-                self.__highscores[new_name] = []
-                print(
-                    f"Could not find player {name}. Created empty entry for {new_name}."
-                )
+        store = self._ensure_loaded()
+        with store.lock:
+            if name in store.highscores:
+                # move existing entry to new name
+                store.highscores[new_name] = store.highscores.pop(name)
+                store.leaderboard.update_player_name(name, new_name)
+                self._journal(store, "rename", name, new_name=new_name)
+                self._say(f"Changed {name} to {new_name}")
             else:
-                print(f"Could not find player {name}. {new_name} already exists.")
+                # If the original name isn't present, ensure the requested new_name exists
+                # (tests expect a key to be created even when the source name is missing).
+                if new_name not in store.highscores:
+                    store.highscores[new_name] = self._store([])
+                    store.leaderboard.add_player(new_name)
+                    self._journal(store, "rename", name, new_name=new_name)
+                    self._say(
+                        f"Could not find player {name}. Created empty entry for {new_name}."
+                    )
+                else:
+                    self._say(
+                        f"Could not find player {name}. {new_name} already exists."
+                    )
 
     def remove_player(self, name):
         """Remove a player key from the highscores dictionary.
 
         Prints a message when the key is not present rather than raising.
         """
-        try:
-            self.__highscores.pop(name)
-        except KeyError:
-            print(f"Unable to find or remove key named {name}")
+        store = self._ensure_loaded()
+        with store.lock:
+            try:
+                store.highscores.pop(name)
+            except KeyError:
+                self._say(f"Unable to find or remove key named {name}")
+            else:
+                store.leaderboard.remove_player(name)
+                self._journal(store, "remove_player", name)
 
     def add_statistics(self, name, has_won=False, draws=0, date=None):
         """Append a Statistics record for the given player name.
@@ -152,40 +1026,98 @@ class Highscore:
         If the player key does not exist a message is printed and no-op is
         performed.
         """
-        try:
-            tmp = self.__highscores.get(name)
-            if tmp is None:
-                raise KeyError(name)
-            tmp.append(Statistics(has_won, draws, date))
-            self.__highscores[name] = tmp
-        except (KeyError, AttributeError):
-            print(f"No key in dictionary named {name}. Statistics not appended.")
+        store = self._ensure_loaded()
+        with store.lock:
+            try:
+                tmp = store.highscores.get(name)
+                if tmp is None:
+                    raise KeyError(name)
+                stat = Statistics(has_won, draws, date)
+                tmp.append(stat)
+                store.highscores[name] = tmp
+            except (KeyError, AttributeError):
+                self._say(
+                    f"No key in dictionary named {name}. Statistics not appended."
+                )
+            else:
+                store.leaderboard.add_statistics(
+                    name, stat.get_has_won(), stat.get_draws(), stat.get_date()
+                )
+                self._journal(store, "add_statistics", name, statistics=stat.to_dict())
 
     def remove_statistics(self, name, stat_num=0):
         """Remove a statistics entry at index `stat_num` for `name`.
 
         Safe: prints a message on KeyError/IndexError instead of raising.
         """
-        try:
-            tmp = self.__highscores.get(name)
-            tmp.pop(stat_num)
-            self.__highscores[name] = tmp
-        except (KeyError, IndexError, AttributeError):
-            print(
-                f"Unable to either find key named {name} or index to remove is out of range."
-            )
+        store = self._ensure_loaded()
+        with store.lock:
+            try:
+                tmp = store.highscores.get(name)
+                removed = tmp.pop(stat_num)
+                store.highscores[name] = tmp
+            except (KeyError, IndexError, AttributeError):
+                self._say(
+                    f"Unable to either find key named {name} or index to remove is out of range."
+                )
+            else:
+                if isinstance(removed, Statistics):
+                    store.leaderboard.remove_statistics(
+                        name,
+                        removed.get_has_won(),
+                        removed.get_draws(),
+                        removed.get_date(),
+                    )
+                self._journal(
+                    store,
+                    "remove_statistics",
+                    name,
+                    index=stat_num,
+                    statistics=(
+                        removed.to_dict()
+                        if isinstance(removed, Statistics)
+                        else removed
+                    ),
+                )
 
     def set_highscores(self, highscores):
         """Replace the in-memory highscores dictionary.
 
+        The replacement is made in the store, so Highscores sharing it see
+        it too, and the changes logged before it are dropped. A replacement
+        can't be journaled record by record, so with journaling on the new
+        highscores are saved as a snapshot right away.
+
         :param highscores: dict mapping player names to lists of statistics
         """
-        self.__highscores = highscores
-        return self.__highscores
+        with self.__loading:
+            if self.__store is None:
+                # Nothing needs to be read for a replacement
+                self.__store = _Store({}, None)
+            store = self.__store
+        with store.lock:
+            if self.__columnar:
+                highscores = {
+                    name: self._store(lst) for name, lst in highscores.items()
+                }
+            self._uncache(store)
+            store.version += 1
+            store.replaced = store.version
+            store.changes.clear()
+            store.highscores = highscores
+            store.leaderboard = Leaderboard()
+            store.leaderboard.load(highscores)
+            if self.__journal:
+                self.save_highscores()
+            return store.highscores
 
     def get_highscores(self):
         """Return the current highscores dictionary."""
-        return self.__highscores
+        return self._ensure_loaded().highscores
+
+    def get_leaderboard(self):
+        """Return the Leaderboard, kept up to date with the highscores."""
+        return self._ensure_loaded().leaderboard
 
     def set_filename(self, filename):
         """Set the filename used for loading/saving highscores.
@@ -199,3 +1131,26 @@ class Highscore:
     def get_filename(self):
         """Return the current highscores filename."""
         return self.__filename
+
+    def get_columnar(self):
+        """Return True when histories are kept in StatisticsColumns."""
+        return self.__columnar
+
+    def get_journal(self):
+        """Return True when changes are appended to the journal file."""
+        return self.__journal
+
+    def can_compact(self):
+        """Return False: games are kept one by one and can't be compacted.
+
+        See ShardedHighscore.compact for highscores that can.
+        """
+        return False
+
+    def get_journal_filename(self):
+        """Return the journal path, the JSON filename with a .jsonl extension."""
+        return os.path.splitext(self.__filename)[0] + ".jsonl"
+
+    def get_lock_filename(self):
+        """Return the lock file path, the JSON filename with a .lock extension."""
+        return os.path.splitext(self.__filename)[0] + ".lock"
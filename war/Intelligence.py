@@ -1,9 +1,22 @@
 """AI (Intelligence) module.
 
 Contains the Intelligence class implementing selectable AI levels used in
-single-player mode. Levels supported include 'top', 'random', and 'greedy'.
+single-player mode. Levels supported include 'top', 'random', 'greedy',
+'lookahead', 'counting' and 'table'.
 """
 
+import random
+from collections import Counter
+
+try:  # Try imports for executing Main normally
+    from Card import CARD_TABLE
+    from PolicyTable import PolicyTable
+    from Seeding import make_rng
+except:  # Except imports for UnitTesting. To prevent module not found Error.
+    from .Card import CARD_TABLE
+    from .PolicyTable import PolicyTable
+    from .Seeding import make_rng
+
 
 class Intelligence:
     """AI logic with selectable intelligence levels.
@@ -11,13 +24,51 @@ class Intelligence:
     Levels supported:
     - 'random': chooses a random valid index from its hand
     - 'greedy': chooses the card with the highest value
+    - 'lookahead': chooses the card with the best result in Monte Carlo
+      rollouts of the rest of the game (see Lookahead)
+    - 'counting': remembers every card revealed face up and weighs winning
+      against the opponent's likely next card with keeping its high cards
+    - 'table': looks the card up in a precomputed PolicyTable
     """
 
-    def __init__(self, name="AI", hand=None, level="random"):
-        """Initializes the AI's name, hand and intelligence level."""
+    # Cards of each value (2-14) in the standard deck that is dealt
+    DECK_COUNTS = (0, 0) + (4,) * 13
+    # Bit of every shared card in `seen`, found without computing its code
+    CARD_BITS = {card: 1 << code for code, card in enumerate(CARD_TABLE)}
+
+    def __init__(
+        self,
+        name="AI",
+        hand=None,
+        level="random",
+        rng=None,
+        lookahead=None,
+        policy_table=None,
+        pool=None,
+    ):
+        """Initializes the AI's name, hand and intelligence level.
+
+        :param rng: seed or random.Random-like object for the 'random' and
+            'lookahead' levels, the global random module when None (see
+            Seeding.make_rng)
+        :param lookahead: Lookahead used by the 'lookahead' level, one with
+            `rng` and `pool` when None. It takes the default time budget, or
+            Lookahead.ROLLOUTS rollouts per decision when `rng` is given, so
+            seeded games can be replayed.
+        :param policy_table: PolicyTable used by the 'table' level,
+            PolicyTable.default() when None
+        :param pool: object with a map method that plays the rollouts of the
+            'lookahead' level in parallel, see Lookahead
+        """
         self.set_name(name)
         self.set_hand(hand)
         self.set_level(level)
+        self.rng = make_rng(rng)
+        self.lookahead = lookahead
+        self.policy_table = policy_table
+        self.pool = pool
+        self.seen = 0  # Bitset of the card codes revealed so far
+        self.unseen = list(self.DECK_COUNTS)  # Value -> cards not revealed yet
 
     def set_name(self, name):
         """Set the AI name."""
@@ -38,15 +89,59 @@ class Intelligence:
     def set_level(self, level: str):
         """Set the intelligence level. Defaults to 'top' (play top card) if unknown.
 
-        Supported levels: 'top', 'random', 'greedy'.
+        Supported levels: 'top', 'random', 'greedy', 'lookahead', 'counting',
+        'table'.
         """
-        if level not in ("random", "greedy", "top"):
+        if level not in ("random", "greedy", "top", "lookahead", "counting", "table"):
             level = "top"
         self.level = level
 
     def get_level(self) -> str:
         return getattr(self, "level", "random")
 
+    def get_lookahead(self):
+        """Return the Lookahead of the 'lookahead' level, creating it if needed."""
+        if getattr(self, "lookahead", None) is None:
+            # Imported here: Lookahead plays rollouts with the Engine, which
+            # imports this module
+            try:
+                from Lookahead import Lookahead
+            except:
+                from .Lookahead import Lookahead
+
+            rng = getattr(self, "rng", None)
+            # A seeded game counts rollouts, as a time budget depends on the
+            # speed of the machine
+            seeded = rng is not None and rng is not random
+            self.lookahead = Lookahead(
+                pool=getattr(self, "pool", None),
+                rng=rng,
+                rollouts=Lookahead.ROLLOUTS if seeded else None,
+            )
+        return self.lookahead
+
+    def get_policy_table(self):
+        """Return the PolicyTable of the 'table' level, the default one if unset."""
+        if getattr(self, "policy_table", None) is None:
+            self.policy_table = PolicyTable.default()
+        return self.policy_table
+
+    def reveal(self, *cards):
+        """Remember cards that were revealed face up, for the 'counting' level.
+
+        Each card sets its bit in `seen` and, the first time, takes one off
+        the unseen count of its value, so a reveal costs O(1) per card.
+        Cards outside the standard deck are ignored.
+        """
+        for card in cards:
+            try:
+                bit = 1 << card.get_code()
+            except (AttributeError, ValueError):
+                continue
+            if not self.seen & bit:
+                self.seen |= bit
+                self.unseen[card.value] -= 1
+
     def choose_index(self):
         """Choose an index from current hand according to intelligence level.
 
@@ -54,22 +149,42 @@ class Intelligence:
         """
         hand = None
         try:
-            hand = self.hand.getHand()
+            if hasattr(self.hand, "highest_index"):
+                # A CardHand is read as it is, without copying its cards
+                hand = self.hand
+            else:
+                # Older hand objects provide get_hand or only getHand
+                get = getattr(self.hand, "get_hand", None) or self.hand.getHand
+                hand = get()
         except Exception:
             hand = None
 
         if not hand:
             return None
 
-        if self.get_level() == "random":
-            import random
-
-            return random.randrange(0, len(hand))
+        level = self.get_level()
+        if level == "random":
+            return getattr(self, "rng", make_rng()).randrange(0, len(hand))
 
-        if self.get_level() == "top":
+        if level == "top":
             return 0
 
-        # greedy: choose the index of the highest-value card
+        if level == "table":
+            table = self.get_policy_table()
+            return table.choose(self.hand if hasattr(self.hand, "rank_mask") else hand)
+
+        if level == "lookahead":
+            active = getattr(self.hand, "get_active_card", list)()
+            return self.get_lookahead().choose(list(hand), active)
+
+        if level == "counting":
+            return self._counting_index(hand)
+
+        # greedy: choose the index of the highest-value card, from the value
+        # index of a CardHand when there is one
+        highest_index = getattr(self.hand, "highest_index", None)
+        if highest_index is not None:
+            return highest_index()
         best_idx = 0
         best_val = -float("inf")
         for i, card in enumerate(hand):
@@ -81,3 +196,81 @@ class Intelligence:
                 best_val = v
                 best_idx = i
         return best_idx
+
+    def _counting_index(self, hand):
+        """Return the index of the card that best trades winning for keeping.
+
+        The opponent holds every card of the deck that is not in this hand or
+        its pot. Revealed cards go to the bottom of a hand, so their next card
+        is taken to be one of the cards they hold that nobody has seen yet,
+        the unseen cards of the deck less this hand's own, or any card they
+        hold once all of them have been seen.
+
+        Winning takes the opponent's card, and losing gives this card away,
+        which also costs half its rank above 2, as high cards win the later
+        rounds and the wars. In a war the `pot` cards already put down go with
+        the round as well. With P(win) and P(lose) against the likely cards,
+        a card of value c scores:
+
+            (1 + pot) * (P(win) - P(lose)) - P(lose) * (c - 2) / 2
+
+        Ties start a war and count as 0. Equal scores go to the lower card.
+        The highest card is played when there is nothing left to beat.
+        """
+        count_values = getattr(self.hand, "count_values", None)
+        values = count_values() if count_values else Counter(c.value for c in hand)
+        active = getattr(self.hand, "get_active_card", list)()
+        own = Counter(values)
+        own.update(card.value for card in active)
+
+        # This hand's cards nobody has seen are not the opponent's
+        hidden, seen, bits = list(self.unseen), self.seen, self.CARD_BITS
+        for cards in (hand, active):
+            for card in cards:
+                bit = bits.get(card)
+                if bit is None:
+                    try:
+                        bit = 1 << card.get_code()
+                    except (AttributeError, ValueError):
+                        continue
+                if not seen & bit:
+                    hidden[card.value] -= 1
+
+        deck, size = self.DECK_COUNTS, len(self.DECK_COUNTS)
+        held, likely = [0] * size, [0] * size
+        for value in range(size):
+            n = deck[value] - own.get(value, 0)
+            if n > 0:
+                held[value] = n
+                likely[value] = max(0, min(n, hidden[value]))
+        weights = likely if any(likely) else held
+        total = sum(weights)
+        if not total:
+            return self._value_index(hand, max(values))
+
+        # One sweep over the values in ascending order. The scores are
+        # multiplied by 2 * total, which doesn't change their order.
+        pot = len(active)
+        best = best_score = None
+        below = 0  # Weight of the lower values
+        for value in range(size):
+            weight = weights[value]
+            if value in values:
+                above = total - below - weight
+                score = 2 * (1 + pot) * (below - above) - above * (value - 2)
+                if best_score is None or score > best_score:
+                    best, best_score = value, score
+            below += weight
+        for value in values:
+            if value >= size:  # Beats every card of the deck
+                score = 2 * (1 + pot) * total
+                if best_score is None or score > best_score:
+                    best, best_score = value, score
+        return self._value_index(hand, best)
+
+    def _value_index(self, hand, value):
+        """Return the index of the first card with the given value in `hand`."""
+        index_of_value = getattr(self.hand, "index_of_value", None)
+        if index_of_value is not None:
+            return index_of_value(value)
+        return next(i for i, card in enumerate(hand) if card.value == value)
@@ -0,0 +1,471 @@
+"""Leaderboard module.
+
+Contains the Leaderboard class which keeps per-player aggregates (games,
+wins, win rate, fewest draws in a won game and the last date played) and a
+ranking of all players. Both are updated a little on every change to the
+highscores instead of being recomputed from the whole history, so showing
+the top of the leaderboard costs the same however many games were played.
+
+Dated games can also be counted in daily, weekly and monthly buckets, so the
+leaderboard of a period is built from the few buckets that cover it.
+"""
+
+import datetime
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter, namedtuple
+
+# One row of the leaderboard. `fewest_draws` and `last_played` are None when
+# the player has not won, or has no dated game, yet.
+Standing = namedtuple(
+    "Standing",
+    ["rank", "name", "games", "wins", "win_rate", "fewest_draws", "last_played"],
+)
+
+
+class _Aggregate:
+    """Running totals of the games of one player.
+
+    The draws of won games and the dates are kept as counters, so removing a
+    game only needs a new minimum or maximum when the removed value was it.
+    """
+
+    def __init__(self):
+        self.games = 0
+        self.wins = 0
+        self.win_draws = Counter()
+        self.dates = Counter()
+        self.fewest_draws = None
+        self.last_played = None
+
+    def add(self, has_won, draws, date, count):
+        """Count `count` games with the given outcome."""
+        self.games += count
+        if has_won:
+            self.wins += count
+            self.win_draws[draws] += count
+            if self.fewest_draws is None or draws < self.fewest_draws:
+                self.fewest_draws = draws
+        if date is not None:
+            self.dates[date] += count
+            if self.last_played is None or date > self.last_played:
+                self.last_played = date
+
+    def remove(self, has_won, draws, date, count):
+        """Stop counting `count` games with the given outcome."""
+        self.games -= count
+        if has_won:
+            self.wins -= count
+            self.win_draws[draws] -= count
+            if self.win_draws[draws] <= 0:
+                del self.win_draws[draws]
+                if draws == self.fewest_draws:
+                    self.fewest_draws = min(self.win_draws, default=None)
+        if date is not None:
+            self.dates[date] -= count
+            if self.dates[date] <= 0:
+                del self.dates[date]
+                if date == self.last_played:
+                    self.last_played = self._last_date()
+
+    def _last_date(self):
+        """Return the latest date played, None without dated games."""
+        return max(self.dates, default=None)
+
+    def win_rate(self):
+        """Return the share of games won, 0.0 without games."""
+        return self.wins / self.games if self.games else 0.0
+
+    def key(self, name):
+        """Return the sort key of the player: most wins first."""
+        return _key(name, self.games, self.wins, self.fewest_draws)
+
+
+class _PlayerAggregate(_Aggregate):
+    """The _Aggregate of all games of a player, with a date index.
+
+    `days` is the sorted index of the dates played, and `dated` counts the
+    games per (date, has_won, draws), from which the Leaderboard's buckets
+    are built.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.days = []
+        self.dated = Counter()
+
+    @classmethod
+    def of(cls, groups):
+        """Return the _PlayerAggregate of a Counter of game counts.
+
+        :param groups: Counter of (has_won, draws, date) to number of games
+        """
+        aggregate = cls()
+        win_draws, dates, dated = aggregate.win_draws, aggregate.dates, {}
+        games = wins = 0
+        for (has_won, draws, date), count in groups.items():
+            games += count
+            if has_won:
+                wins += count
+                win_draws[draws] += count
+            if date is not None:
+                dates[date] += count
+                dated[(date, has_won, draws)] = count
+        aggregate.games, aggregate.wins = games, wins
+        aggregate.dated.update(dated)
+        aggregate.days = sorted(dates)
+        aggregate.fewest_draws = min(win_draws, default=None)
+        aggregate.last_played = aggregate._last_date()
+        return aggregate
+
+    def add(self, has_won, draws, date, count):
+        """Count `count` games with the given outcome."""
+        if date is not None:
+            if date not in self.dates:
+                insort(self.days, date)
+            game = (date, has_won, draws)
+            self.dated[game] = self.dated.get(game, 0) + count
+        super().add(has_won, draws, date, count)
+
+    def remove(self, has_won, draws, date, count):
+        """Stop counting `count` games with the given outcome."""
+        if date is not None:
+            game = (date, has_won, draws)
+            self.dated[game] -= count
+            if self.dated[game] <= 0:
+                del self.dated[game]
+            if date in self.dates and self.dates[date] <= count:
+                del self.days[bisect_left(self.days, date)]
+        super().remove(has_won, draws, date, count)
+
+    def _last_date(self):
+        """Return the latest date played, from the end of the index."""
+        return self.days[-1] if self.days else None
+
+
+def _key(name, games, wins, fewest_draws):
+    """Return the sort key of a player: wins, win rate, then fewest draws."""
+    rate = wins / games if games else 0.0
+    fewest = fewest_draws if fewest_draws is not None else float("inf")
+    return (-wins, -rate, fewest, name)
+
+
+def _periods(date):
+    """Return the bucket starts of a date: its day, week (Monday) and month."""
+    return (
+        ("day", date),
+        ("week", date - datetime.timedelta(days=date.weekday())),
+        ("month", date.replace(day=1)),
+    )
+
+
+def _next_month(date):
+    """Return the first day of the month after that of `date`."""
+    return (date.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+
+
+class Leaderboard:
+    """Ranks players by wins, then win rate, then fewest draws in a win.
+
+    The ranking is a sorted list of sort keys, kept in order with bisect as
+    players' aggregates change, so the top K players are its first K entries.
+    The methods mirror those of Highscore and are called by it on every
+    change; entries that are not Statistics objects are not counted.
+
+    For window, dated games are also counted per player in a bucket for
+    their day, week and month. The buckets are built by the first window
+    and then kept up to date like the ranking. window ranks the players of a
+    period from the largest buckets that fit in it, found with a sorted
+    index of the days played, so its cost follows the length of the period
+    rather than the history.
+    """
+
+    def __init__(self):
+        """Initialize an empty Leaderboard."""
+        self.__players = {}  # Player name to _Aggregate
+        self.__index = []  # Sort keys of all players, best first
+        self.__buckets = None  # Period to bucket start to {name: _Aggregate}
+        self.__days = []  # Sorted days with games, the keys of the day buckets
+
+    def __len__(self):
+        """Return the number of players on the leaderboard."""
+        return len(self.__players)
+
+    def load(self, highscores):
+        """Replace the leaderboard with the aggregates of a highscores dict.
+
+        :param highscores: dict mapping player names to lists of Statistics
+            or StatisticsColumns
+        """
+        self._clear()
+        for name, statistics in highscores.items():
+            if hasattr(statistics, "group_counts"):  # StatisticsColumns
+                groups = statistics.group_counts()
+            else:
+                groups = Counter(
+                    (stat.get_has_won(), stat.get_draws(), stat.get_date())
+                    for stat in (statistics if isinstance(statistics, list) else [])
+                    if hasattr(stat, "get_has_won")
+                )
+            self._load_groups(name, groups)
+        self._reindex()
+
+    def load_counts(self, names, counts):
+        """Replace the leaderboard with pre-grouped game counts.
+
+        Used by stores that can count games themselves, like an SQL GROUP BY.
+
+        :param names: every player name, including players without games
+        :param counts: rows of (name, has_won, draws, date, number of games)
+        """
+        self._clear()
+        players = {name: Counter() for name in names}
+        for name, has_won, draws, date, count in counts:
+            if isinstance(date, str):
+                date = datetime.date.fromisoformat(date)
+            players[name][(bool(has_won), draws, date)] += count
+        for name, groups in players.items():
+            self._load_groups(name, groups)
+        self._reindex()
+
+    def add_player(self, name, statistics=None):
+        """Add a player, with an optional list of Statistics objects.
+
+        If the player exists this is a no-op.
+        """
+        if name in self.__players:
+            return
+        aggregate = self.__players[name] = _PlayerAggregate()
+        for stat in statistics or []:
+            if hasattr(stat, "get_has_won"):
+                game = (stat.get_has_won(), stat.get_draws(), stat.get_date())
+                aggregate.add(*game, 1)
+                self._bucket(name, "add", *game, 1)
+        insort(self.__index, aggregate.key(name))
+
+    def update_player_name(self, name, new_name):
+        """Move a player's aggregates to `new_name`.
+
+        Like Highscore, a missing `name` adds `new_name` without games, and
+        an existing `new_name` is replaced with all its games.
+        """
+        aggregate = self.__players.get(name)
+        if aggregate is None:
+            self.add_player(new_name)
+            return
+        if new_name != name:
+            # Drops the replaced player's entries in the ranking and buckets
+            self.remove_player(new_name)
+        self._unindex(name)
+        del self.__players[name]
+        self.__players[new_name] = aggregate
+        insort(self.__index, aggregate.key(new_name))
+        if self.__buckets is not None:
+            for bucket in self._buckets_of(aggregate):
+                bucket[new_name] = bucket.pop(name)
+
+    def remove_player(self, name):
+        """Remove a player from the leaderboard, if present."""
+        if name in self.__players:
+            self._unindex(name)
+            aggregate = self.__players.pop(name)
+            if self.__buckets is None:
+                return
+            for period, start, bucket in self._buckets_of(aggregate, starts=True):
+                del bucket[name]
+                if not bucket:
+                    self._drop_bucket(period, start)
+
+    def add_statistics(self, name, has_won=False, draws=0, date=None, count=1):
+        """Count a game of `name`; unknown players are ignored."""
+        self._update(name, "add", has_won, draws, date, count)
+
+    def remove_statistics(self, name, has_won=False, draws=0, date=None, count=1):
+        """Stop counting a game of `name`; unknown players are ignored."""
+        self._update(name, "remove", has_won, draws, date, count)
+
+    def get_standing(self, name):
+        """Return the Standing of one player, or None for an unknown player."""
+        aggregate = self.__players.get(name)
+        if aggregate is None:
+            return None
+        rank = bisect_left(self.__index, aggregate.key(name)) + 1
+        return self._standing(rank, name)
+
+    def top(self, k=20):
+        """Return the Standings of the `k` best players, best first."""
+        return [
+            self._standing(rank, key[-1])
+            for rank, key in enumerate(self.__index[:k], start=1)
+        ]
+
+    def window(self, since=None, until=None, k=20):
+        """Return the Standings of the `k` best players of a period.
+
+        Only dated games count. The period is covered with whole months,
+        then whole weeks, then days, whichever bucket fits first.
+
+        :param since: first day of the period, the first day played if None
+        :param until: last day of the period, the last day played if None
+        """
+        if self.__buckets is None:
+            self._build_buckets()
+        days = self.__days
+        first = bisect_left(days, since) if since is not None else 0
+        last = bisect_right(days, until) if until is not None else len(days)
+        if first >= last:
+            return []
+        day, end = days[first], days[last - 1]
+        totals = {}  # Player name to [games, wins, fewest draws, last played]
+        while day <= end:
+            following = _next_month(day)
+            if day.day == 1 and following <= end + datetime.timedelta(days=1):
+                period, start, day = "month", day, following
+            elif day.weekday() == 0 and day + datetime.timedelta(days=6) <= end:
+                period, start = "week", day
+                day = day + datetime.timedelta(days=7)
+            else:
+                period, start, day = "day", day, day + datetime.timedelta(days=1)
+            for name, a in self.__buckets[period].get(start, {}).items():
+                total = totals.get(name)
+                if total is None:
+                    totals[name] = [a.games, a.wins, a.fewest_draws, a.last_played]
+                    continue
+                total[0] += a.games
+                total[1] += a.wins
+                if a.fewest_draws is not None:
+                    if total[2] is None or a.fewest_draws < total[2]:
+                        total[2] = a.fewest_draws
+                total[3] = max(total[3], a.last_played)
+        ranked = sorted(totals.items(), key=lambda item: _key(item[0], *item[1][:3]))
+        return [
+            Standing(rank, name, games, wins, wins / games, fewest, last_played)
+            for rank, (name, (games, wins, fewest, last_played)) in enumerate(
+                ranked[:k], start=1
+            )
+        ]
+
+    def table(self, k=20, since=None, until=None):
+        """Return the top `k` players as a printable table.
+
+        With `since` or `until`, only the games of that period count, see
+        window.
+        """
+        if since is None and until is None:
+            standings = self.top(k)
+            if not standings:
+                return "No highscores yet."
+        else:
+            standings = self.window(since, until, k)
+            if not standings:
+                return "No games in this period."
+        lines = [
+            f"{'Rank':>4}  {'Player':<16} {'Games':>6} {'Wins':>6} "
+            f"{'Win rate':>9} {'Fewest draws':>13}  Last played"
+        ]
+        for s in standings:
+            fewest = s.fewest_draws if s.fewest_draws is not None else "-"
+            last = s.last_played.isoformat() if s.last_played is not None else "-"
+            lines.append(
+                f"{s.rank:>4}  {s.name:<16} {s.games:>6} {s.wins:>6} "
+                f"{s.win_rate:>9.1%} {fewest:>13}  {last}"
+            )
+        return "\n".join(lines)
+
+    def _update(self, name, method, *game):
+        """Apply a change to a player's aggregates and move them in the index."""
+        aggregate = self.__players.get(name)
+        if aggregate is None:
+            return
+        self._unindex(name)
+        getattr(aggregate, method)(*game)
+        insort(self.__index, aggregate.key(name))
+        self._bucket(name, method, *game)
+
+    def _load_groups(self, name, groups):
+        """Add a player from a Counter of (has_won, draws, date) game counts."""
+        self.__players[name] = _PlayerAggregate.of(groups)
+
+    def _build_buckets(self):
+        """Count every player's dated games in the buckets of their dates."""
+        self.__buckets = buckets = {"day": {}, "week": {}, "month": {}}
+        periods = {}  # Date to its bucket starts, see _periods
+        for name, aggregate in self.__players.items():
+            for (date, has_won, draws), count in aggregate.dated.items():
+                starts = periods.get(date)
+                if starts is None:
+                    starts = periods[date] = _periods(date)
+                for period, start in starts:
+                    bucket = buckets[period].get(start)
+                    if bucket is None:
+                        bucket = buckets[period][start] = {}
+                    total = bucket.get(name)
+                    if total is None:
+                        total = bucket[name] = _Aggregate()
+                    total.add(has_won, draws, date, count)
+        self.__days = sorted(buckets["day"])
+
+    def _bucket(self, name, method, has_won, draws, date, count):
+        """Count or stop counting games in the buckets of their date."""
+        if date is None or self.__buckets is None:
+            return
+        for period, start in _periods(date):
+            buckets = self.__buckets[period]
+            bucket = buckets.get(start)
+            if bucket is None:
+                bucket = buckets[start] = {}
+                if period == "day":
+                    insort(self.__days, date)
+            aggregate = bucket.get(name)
+            if aggregate is None:
+                aggregate = bucket[name] = _Aggregate()
+            getattr(aggregate, method)(has_won, draws, date, count)
+            if aggregate.games <= 0:
+                del bucket[name]
+                if not bucket:
+                    self._drop_bucket(period, start)
+
+    def _drop_bucket(self, period, start):
+        """Remove an empty bucket, and its day from the index of days."""
+        del self.__buckets[period][start]
+        if period == "day":
+            del self.__days[bisect_left(self.__days, start)]
+
+    def _buckets_of(self, aggregate, starts=False):
+        """Return the buckets that count games of a player.
+
+        :param aggregate: the player's _PlayerAggregate, whose days index
+            the buckets
+        :param starts: return (period, start, bucket) instead of buckets
+        """
+        found = {}
+        for day in aggregate.days:
+            for period, start in _periods(day):
+                found[(period, start)] = self.__buckets[period][start]
+        if starts:
+            return [(period, start, b) for (period, start), b in found.items()]
+        return list(found.values())
+
+    def _clear(self):
+        """Forget every player, ranking and bucket."""
+        self.__players = {}
+        self.__index = []
+        self.__buckets = None
+        self.__days = []
+
+    def _unindex(self, name):
+        """Remove the current sort key of `name` from the index."""
+        key = self.__players[name].key(name)
+        del self.__index[bisect_left(self.__index, key)]
+
+    def _reindex(self):
+        """Sort the keys of every player again after a bulk load."""
+        self.__index = sorted(
+            aggregate.key(name) for name, aggregate in self.__players.items()
+        )
+
+    def _standing(self, rank, name):
+        """Return the Standing of `name` at `rank`."""
+        a = self.__players[name]
+        return Standing(
+            rank, name, a.games, a.wins, a.win_rate(), a.fewest_draws, a.last_played
+        )
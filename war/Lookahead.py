@@ -0,0 +1,252 @@
+"""Monte Carlo lookahead module.
+
+Contains the Lookahead class used by the 'lookahead' level of Intelligence.
+For each distinct value in the AI's hand it deals plausible hands to the
+opponent, plays the rest of the game out with the headless Engine and picks
+the value with the best average result, all within a time budget per
+decision.
+"""
+
+import math
+import random
+import time
+from collections import Counter
+
+try:  # Try imports for executing Main normally
+    from Card import CARD_TABLE, RANKS, Card
+    from CardHand import CardHand
+    from Engine import WON, Engine
+    from Intelligence import Intelligence
+    from Player import Player
+    from Seeding import make_rng
+except:  # Except imports for UnitTesting. To prevent module not found Error.
+    from .Card import CARD_TABLE, RANKS, Card
+    from .CardHand import CardHand
+    from .Engine import WON, Engine
+    from .Intelligence import Intelligence
+    from .Player import Player
+    from .Seeding import make_rng
+
+
+def _card(value):
+    """Return a Card with the given value; rollouts only compare values."""
+    if 2 <= value <= 14:
+        return CARD_TABLE[value - 2]
+    return Card(value, "", "", "")
+
+
+class _Rollout(Intelligence):
+    """Greedy AI that first plays its top card, the move being tried."""
+
+    def __init__(self, hand):
+        """Initialize the AI of a rollout with its CardHand."""
+        super().__init__("AI", hand, level="greedy")
+        self.first = True
+
+    def choose_index(self):
+        """Return 0 for the first card, then the index of the highest card."""
+        if self.first:
+            self.first = False
+            return 0
+        return super().choose_index()
+
+
+def _rollouts(task):
+    """Play out one move several times and return the sum of the scores.
+
+    Module level so it can be sent to worker processes. The move is played as
+    the AI's top card, after which the opponent draws its top card and the AI
+    its highest card until the game ends or `horizon` rounds are played. A
+    won game scores 1 and a lost one 0; a game that loops or reaches the
+    horizon scores the AI's share of the cards.
+
+    :param task: tuple (first, rest, active, unknown, size, count, horizon,
+        seed) of card values: the card to play, the rest of the AI's hand,
+        the AI's cards in the pot, the cards the AI cannot see and the size
+        of the opponent's hand, followed by the number of rollouts, the round
+        horizon and the seed of the opponent deals
+    """
+    first, rest, active, unknown, size, count, horizon, seed = task
+    rng = random.Random(seed)
+    own_cards = [_card(value) for value in (first,) + rest]
+    own_pot = [_card(value) for value in active]
+    unknown = [_card(value) for value in unknown]
+    pot_end = size + len(active)
+    total = 0.0
+    for _ in range(count):
+        rng.shuffle(unknown)
+        opponent = CardHand(unknown[:size])
+        opponent.set_active_card(unknown[size:pot_end])
+        own = CardHand(own_cards)
+        own.set_active_card(own_pot)
+        # The AI is the second player, as in Game and Engine.from_deck
+        result = Engine(
+            Player("Opponent", opponent),
+            _Rollout(own),
+            max_rounds=horizon,
+        ).run()
+        if result.outcome == WON:
+            total += result.winner == 2
+        else:
+            total += own.get_amount() / (own.get_amount() + opponent.get_amount())
+    return total
+
+
+class Lookahead:
+    """Choose a card by Monte Carlo rollouts within a time budget.
+
+    The opponent's hand is unknown, so every rollout deals it at random from
+    the cards of a standard deck that are not in the AI's hand or pot. Cards
+    of the same value are interchangeable, so only the first card of each
+    value is tried. The candidates are played out in rounds of `batch`
+    rollouts each. Once every candidate has `min_rollouts`, candidates whose
+    mean is more than two standard errors below the best one are dropped,
+    and the search stops early when a single candidate is left.
+
+    The budget is checked after every batch, so a decision takes at most
+    about one batch longer than `budget`. With a `pool`, the batches of a
+    round are played in parallel by the pool's map method (a
+    multiprocessing.Pool or a concurrent.futures executor) and the budget is
+    checked after each round. With a `rollouts` budget instead, a decision
+    plays that many rollouts whatever the time, so a seeded decision is the
+    same on any machine.
+    """
+
+    DECK_SIZE = 52  # Cards in play, as dealt by Deck
+    ROLLOUTS = 200  # Rollout budget of seeded games, about `budget` seconds
+
+    def __init__(
+        self,
+        budget=0.05,
+        max_rollouts=2000,
+        batch=4,
+        min_rollouts=16,
+        horizon=50,
+        pool=None,
+        rng=None,
+        rollouts=None,
+    ):
+        """Initialize the Lookahead.
+
+        :param budget: seconds a decision may take
+        :param max_rollouts: rollouts after which a decision is made anyway
+        :param batch: rollouts of one candidate per task
+        :param min_rollouts: rollouts of every candidate before any is dropped
+        :param horizon: rounds after which a rollout is scored by card share
+        :param pool: object with a map method to play batches in parallel, or
+            None to play them in this thread
+        :param rng: seed or random.Random-like object for the opponent deals,
+            the global random module when None (see Seeding.make_rng)
+        :param rollouts: rollouts a decision plays, instead of taking
+            `budget` seconds, or None to use the time budget
+        """
+        self.budget = budget
+        self.rollouts = rollouts
+        self.max_rollouts = max_rollouts
+        self.batch = batch
+        self.min_rollouts = min_rollouts
+        self.horizon = horizon
+        self.pool = pool
+        self.rng = make_rng(rng)
+
+    def choose(self, hand, active=()):
+        """Return the index of the card to play from `hand`.
+
+        Returns the index of the highest card when there is nothing to deal
+        to the opponent, for example in a game that doesn't use one standard
+        deck, and None for an empty hand.
+
+        :param hand: sequence of Card objects, top card first
+        :param active: the AI's cards in the pot of the current round
+        """
+        candidates = {}  # value -> index of its first card
+        for index, card in enumerate(hand):
+            candidates.setdefault(card.value, index)
+        if len(candidates) <= 1:
+            return 0 if candidates else None
+
+        # Both players have the same number of cards in the pot
+        size = self.DECK_SIZE - len(hand) - 2 * len(active)
+        unknown = Counter(RANKS)
+        unknown.subtract(card.value for card in hand)
+        unknown.subtract(card.value for card in active)
+        unknown = tuple(sorted(unknown.elements()))
+        if size <= 0 or size + len(active) > len(unknown):
+            return candidates[max(candidates)]
+
+        values = tuple(card.value for card in hand)
+        pot = tuple(card.value for card in active)
+        moves = {
+            value: (value, values[:index] + values[index + 1 :])
+            for value, index in candidates.items()
+        }
+        greedy = max(candidates)
+        means = {value: [] for value in candidates}  # Mean score of every round
+        limit, deadline = self.max_rollouts, time.perf_counter() + self.budget
+        if self.rollouts is not None:
+            limit, deadline = min(limit, self.rollouts), math.inf
+        live = list(candidates)
+        played = 0
+        while played < limit:
+            # Every candidate is played against the same opponent deals
+            seed = self.rng.getrandbits(64)
+            tasks = [
+                moves[value] + (pot, unknown, size, self.batch, self.horizon, seed)
+                for value in live
+            ]
+            mapper = map if self.pool is None else self.pool.map
+            scores = []
+            for total in mapper(_rollouts, tasks):
+                scores.append(total / self.batch)
+                if time.perf_counter() >= deadline:
+                    break
+            if len(scores) < len(live):
+                break  # An unfinished round can't be compared
+            for value, score in zip(live, scores):
+                means[value].append(score)
+            played += self.batch * len(live)
+            if time.perf_counter() >= deadline:
+                break
+            leader = max(live, key=lambda value: self._mean(means[value]))
+            live = [
+                value
+                for value in live
+                if value == leader or not self._beats(means[leader], means[value])
+            ]
+            if len(live) == 1:
+                break
+
+        # Deviate from the highest card only for a move that is clearly better
+        choices = [
+            value
+            for value in live
+            if value == greedy or self._beats(means[value], means[greedy])
+        ]
+        if greedy not in live:
+            choices = live
+        return candidates[max(choices, key=lambda value: self._mean(means[value]))]
+
+    @staticmethod
+    def _mean(scores):
+        """Return the mean of a list of round scores, 0 for no rounds."""
+        return sum(scores) / len(scores) if scores else 0.0
+
+    def _beats(self, better, worse):
+        """Return whether one candidate is clearly better than another.
+
+        The candidates are compared by the differences of their scores in the
+        rounds both played, which used the same opponent deals. A candidate is
+        clearly better when the mean difference is more than two standard
+        errors above zero, after at least `min_rollouts` rollouts and two
+        rounds each, as one round has no standard error.
+
+        :param better: round scores of the candidate that may be better
+        :param worse: round scores of the other candidate
+        """
+        rounds = min(len(better), len(worse))
+        if rounds < 2 or rounds * self.batch < self.min_rollouts:
+            return False
+        differences = [better[i] - worse[i] for i in range(rounds)]
+        mean = sum(differences) / rounds
+        variance = sum((d - mean) ** 2 for d in differences) / (rounds - 1)
+        return mean > 2 * math.sqrt(variance / rounds)
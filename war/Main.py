@@ -1,16 +1,25 @@
 try:  # Try imports for executing Main normally
+    from Game import Game
     from Shell import Shell
 except:  # Except imports for UnitTesting. To prevent module not found Error.
+    from .Game import Game
     from .Shell import Shell
 
 
 class Main:
     """The Main Program When it runs"""
 
-    def run(self):
-        """Runs the main program"""
+    def run(self, highscore=None):
+        """Runs the main program
 
-        Shell().cmdloop()
+        :param highscore: highscores the game records results in, those of
+            the Shell's default game when None
+        """
+
+        if highscore is None:
+            Shell().cmdloop()
+        else:
+            Shell(Game(highscore)).cmdloop()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,207 @@
+"""Precomputed AI policy module.
+
+Contains the PolicyTable class used by the 'table' level of Intelligence. A
+policy such as 'greedy', 'counting' or 'lookahead' is compiled into a table
+with one entry for every set of values a hand can hold, 2**13 of them, which
+gives the value to play. Tables are saved as small files and memory-mapped
+when loaded, so a decision is one lookup and the worker processes of a
+simulation share the pages of a single file.
+"""
+
+import mmap
+import os
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+try:  # Try imports for executing Main normally
+    from Card import CARD_TABLE
+    from CardHand import RANK_BITS, CardHand
+    from Seeding import derive_seed
+except:  # Except imports for UnitTesting. To prevent module not found Error.
+    from .Card import CARD_TABLE
+    from .CardHand import RANK_BITS, CardHand
+    from .Seeding import derive_seed
+
+
+MAGIC = b"WARPOL1\n"  # First bytes of a policy table file
+MASKS = 1 << 13  # Sets of standard values (2-14) a hand can hold
+
+
+def rank_mask(cards):
+    """Return the mask of the standard values of some cards, as CardHand does."""
+    mask = 0
+    for card in cards:
+        mask |= RANK_BITS.get(card.value, 0)
+    return mask
+
+
+def _build_chunk(level, first, last, samples, seed):
+    """Return the entries of masks `first` to `last - 1` as bytes.
+
+    Module level so it can be sent to worker processes. For every mask,
+    `samples` hands that hold exactly its values (one to four cards of each,
+    in random order) are dealt and the AI of `level` chooses a card from
+    each. The value chosen most often, the highest of equal counts, is the
+    entry. The empty mask has the entry 0.
+    """
+    # Imported here: Intelligence uses this module for the 'table' level
+    try:
+        from Intelligence import Intelligence
+    except:
+        from .Intelligence import Intelligence
+
+    entries = bytearray(last - first)
+    for mask in range(max(first, 1), last):
+        rng = random.Random(derive_seed(seed, mask))
+        values = [value for value, bit in RANK_BITS.items() if mask & bit]
+        votes = Counter()
+        for _ in range(samples):
+            cards = [
+                CARD_TABLE[suit * 13 + value - 2]
+                for value in values
+                for suit in range(rng.randint(1, 4))
+            ]
+            rng.shuffle(cards)
+            ai = Intelligence("AI", CardHand(cards), level=level, rng=rng)
+            votes[cards[ai.choose_index() or 0].value] += 1
+        entries[mask - first] = max(votes, key=lambda value: (votes[value], value))
+    return bytes(entries)
+
+
+class PolicyTable:
+    """Value to play for every set of values in a hand.
+
+    A table holds one byte per mask of values (see CardHand.rank_mask): the
+    value of the card to play, whose first card in the hand is then played.
+    Looking up a decision takes the same time for any hand and policy.
+    """
+
+    FILENAME = "war/policy.table"  # Table used by default when it exists
+    _default = None  # Default table of this process, see PolicyTable.default
+
+    def __init__(self, entries):
+        """Initialize the PolicyTable with its entries.
+
+        :param entries: bytes-like object with one value per mask
+        """
+        if len(entries) != MASKS:
+            raise ValueError(f"A policy table has {MASKS} entries, not {len(entries)}")
+        self.__entries = entries
+        self.__mmap = None
+
+    @classmethod
+    def build(cls, level="greedy", samples=8, workers=1, seed=0, chunk_size=512):
+        """Compile the policy of an Intelligence level into a table.
+
+        Building calls the level's choose_index for `samples` hands per mask,
+        which is slow for 'lookahead', so the masks are split into chunks that
+        are built in parallel by `workers` processes.
+
+        :param level: intelligence level to compile
+        :param samples: hands dealt per mask
+        :param workers: worker processes, the masks are built in this process
+            when 1
+        :param seed: root seed of the hands, so a build can be repeated
+        :param chunk_size: masks per worker task
+        """
+        if level in ("top", "random", "table"):
+            raise ValueError(f"The '{level}' level can't be compiled into a table")
+        firsts = range(0, MASKS, chunk_size)
+        tasks = [
+            (level, first, min(first + chunk_size, MASKS), samples, seed)
+            for first in firsts
+        ]
+        if workers == 1:
+            chunks = [_build_chunk(*task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                chunks = list(executor.map(_build_chunk, *zip(*tasks)))
+        return cls(b"".join(chunks))
+
+    @classmethod
+    def greedy(cls):
+        """Return the greedy table, whose entry is the highest value of a mask."""
+        return cls(
+            bytes([0]) + bytes(mask.bit_length() + 1 for mask in range(1, MASKS))
+        )
+
+    @classmethod
+    def load(cls, filename):
+        """Memory-map a table saved with save.
+
+        The file is not read: its pages are loaded by the operating system
+        when they are looked up, and are shared by every process that maps
+        the same file.
+
+        :param filename: path of the table file
+        """
+        with open(filename, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(mapped) != len(MAGIC) + MASKS or mapped[: len(MAGIC)] != MAGIC:
+            mapped.close()
+            raise ValueError(f"{filename} is not a policy table")
+        table = cls(memoryview(mapped)[len(MAGIC) :])
+        table.__mmap = mapped
+        return table
+
+    @classmethod
+    def default(cls):
+        """Return the table of the 'table' level when none is given.
+
+        That is the table saved at FILENAME when there is one, or else the
+        greedy table. It is made once per process.
+        """
+        if cls._default is None:
+            if os.path.exists(cls.FILENAME):
+                cls._default = cls.load(cls.FILENAME)
+            else:
+                cls._default = cls.greedy()
+        return cls._default
+
+    def save(self, filename=None):
+        """Write the table to a file, FILENAME when None.
+
+        The table is written to a temporary file which then replaces the old
+        one, so processes that mapped the old table keep a valid mapping.
+        """
+        filename = filename or self.FILENAME
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = filename + ".tmp"
+        with open(temporary, "wb") as file:
+            file.write(MAGIC)
+            file.write(self.__entries)
+        os.replace(temporary, filename)
+        return filename
+
+    def close(self):
+        """Unmap a loaded table; it can't be used afterwards."""
+        if self.__mmap is not None:
+            self.__entries.release()
+            self.__mmap.close()
+            self.__mmap = None
+
+    def lookup(self, mask):
+        """Return the value to play for a mask of values, 0 for an empty mask."""
+        return self.__entries[mask]
+
+    def choose(self, hand):
+        """Return the index of the card to play, or None for an empty hand.
+
+        :param hand: CardHand, whose rank mask and index make the decision
+            O(1), or a sequence of Card objects
+        """
+        if hasattr(hand, "rank_mask"):
+            value = self.__entries[hand.rank_mask()]
+            index = hand.index_of_value(value) if value else None
+            return hand.highest_index() if index is None else index
+        cards = list(hand)
+        if not cards:
+            return None
+        value = self.__entries[rank_mask(cards)]
+        for index, card in enumerate(cards):
+            if card.value == value:
+                return index
+        return max(range(len(cards)), key=lambda index: (cards[index].value, -index))
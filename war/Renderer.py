@@ -0,0 +1,282 @@
+"""Terminal rendering module.
+
+Contains the Renderer class which draws the ASCII screens of the War game for
+the events emitted by Game. A Renderer is subscribed to a Game by the Shell;
+code that plays games without a terminal simply doesn't subscribe one.
+"""
+
+try:  # Try imports for executing Main normally
+    from Events import (
+        CardsRevealed,
+        CheatUsed,
+        FaceDown,
+        GameOver,
+        NotEnoughCards,
+        PotWon,
+        RoundStarted,
+        War,
+    )
+except:  # Except imports for UnitTesting. To prevent module not found Error.
+    from .Events import (
+        CardsRevealed,
+        CheatUsed,
+        FaceDown,
+        GameOver,
+        NotEnoughCards,
+        PotWon,
+        RoundStarted,
+        War,
+    )
+
+
+class Renderer:
+    """Prints the screens of the game for each event it receives."""
+
+    def __init__(self, pause=True):
+        """Initialize the Renderer.
+
+        :param pause: wait for the player to continue after some screens
+        """
+        self.__pause = pause
+        self.__screens = {
+            RoundStarted: self.round_started,
+            CardsRevealed: self.cards_revealed,
+            PotWon: self.pot_won,
+            War: self.war,
+            NotEnoughCards: self.not_enough_cards,
+            FaceDown: self.face_down,
+            GameOver: self.game_over,
+            CheatUsed: self.cheat_used,
+        }
+
+    def __call__(self, event):
+        """Render one event. Events without a screen are ignored."""
+        screen = self.__screens.get(type(event))
+        if screen is not None:
+            screen(event)
+
+    def pause(self):
+        """Pause helper that avoids blocking when running tests."""
+        if not self.__pause:
+            return
+        try:
+            import sys
+
+            # If unittest is running, skip pause to avoid blocking automated tests
+            if "unittest" in sys.modules:
+                return
+        except Exception:
+            pass
+        try:
+            input("Press to continue...")
+        except Exception:
+            return
+
+    def round_started(self, event):
+        """Show both players ready to draw."""
+        self.board(event)
+        self.pause()
+
+    def board(self, event):
+        """Show the names and card counts of both players.
+
+        :param event: any event with the player and amount fields
+        """
+        screen1 = f"""
+        {event.player2:^50}
+        ▐▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▌
+        ▐                                                ▌
+        ▐         {event.amount2:<2}🂠                                    ▌
+        ▐                                                ▌
+        ▐                                                ▌
+        ▐                                                ▌
+        ▐                      Draw!                     ▌
+        ▐                                                ▌
+        ▐                                                ▌
+        ▐                                                ▌
+        ▐                                    🂠{event.amount1:>2}         ▌
+        ▐                                                ▌
+        ▐▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▌
+        {event.player1:^50}
+                    """
+        print(screen1)
+
+    def cards_revealed(self, event):
+        """Show the face down cards just drawn."""
+        screen2 = f"""
+        {event.player2:^50}
+        ▐▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▌
+        ▐                       ?                        ▌
+        ▐         {event.amount2:<2}🂠           🂠                        ▌
+        ▐                                                ▌
+        ▐                                                ▌
+        ▐                                                ▌
+        ▐                    Reveal...                   ▌
+        ▐                                                ▌
+        ▐                                                ▌
+        ▐                                                ▌
+        ▐                       🂠           🂠{event.amount1:>2}          ▌
+        ▐                       ?                        ▌
+        ▐▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▌
+        {event.player1:^50}
+                    """
+        print(screen2)
+        self.pause()
+
+    def pot_won(self, event):
+        """Show both cards and the winner of the pot."""
+        if event.winner == 1:
+            screen3 = f"""
+        {event.player2:^50}
+        ▐▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▌
+        ▐                       {event.card2.get_value():<2}                       ▌
+        ▐         {event.amount2:<2}🂠           {event.card2.get_symbol()}                        ▌
+        ▐                                                ▌
+        ▐                                                ▌
+        ▐                                                ▌
+        ▐{(event.player1 + " wins! They get " + str(event.cards) + " card(s)"):^48}▌
+        ▐                                                ▌
+        ▐                                                ▌
+        ▐                                                ▌
+        ▐                       {event.card1.get_symbol()}           🂠{event.amount1:>2}          ▌
+        ▐                       {event.card1.get_value():<2}                       ▌
+        ▐▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▌
+        {event.player1:^50}
+                        """
+        else:
+            screen3 = f"""
+        {event.player2:^50}
+        ▐▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▌
+        ▐                       {event.card2.get_value():<2}                       ▌
+        ▐         {event.amount2:<2}🂠           {event.card2.get_symbol()}                        ▌
+        ▐                                                ▌
+        ▐                                                ▌
+        ▐                                                ▌
+        ▐{(event.player2 + " wins! They get " + str(event.cards) + " card(s)"):^48}▌
+        ▐                                                ▌
+        ▐                                                ▌
+        ▐                                                ▌
+        ▐                       {event.card1.get_symbol()}           🂠{event.amount1:>2}          ▌
+        ▐                       {event.card1.get_value():<2}                       ▌
+        ▐▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▌
+        {event.player1:^50}
+                        """
+        print(screen3)
+
+    def war(self, event):
+        """Show the tied cards that start a war."""
+        screen3 = f"""
+        {event.player2:^50}
+        ▐▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▌
+        ▐                       {event.card2.get_value():<2}                       ▌
+        ▐         {event.amount2:<2}🂠           {event.card2.get_symbol()}                        ▌
+        ▐                                                ▌
+        ▐                                                ▌
+        ▐                                                ▌
+        ▐                      War!                      ▌
+        ▐                                                ▌
+        ▐                                                ▌
+        ▐                                                ▌
+        ▐                       {event.card1.get_symbol()}           🂠{event.amount1:>2}          ▌
+        ▐                       {event.card1.get_value():<2}                       ▌
+        ▐▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▌
+        {event.player1:^50}
+                        """
+        print(screen3)
+        self.pause()
+
+    def not_enough_cards(self, event):
+        """Show that a player can't go to war and loses the pot."""
+        if event.winner == 2:
+            screen3 = f"""
+        {event.player2:^50}
+        ▐▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▌
+        ▐                       {event.card2.get_value():<2}                       ▌
+        ▐         {event.amount2:<2}🂠           {event.card2.get_symbol()}                        ▌
+        ▐                                                ▌
+        ▐                                                ▌
+        ▐                                                ▌
+        ▐{(event.player1 + " doesn't have enough cards!"):^48}▌
+        ▐                                                ▌
+        ▐                                                ▌
+        ▐                                                ▌
+        ▐                       {event.card1.get_symbol()}           🂠{event.amount1:>2}          ▌
+        ▐                       {event.card1.get_value():<2}                       ▌
+        ▐▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▌
+        {event.player1:^50}
+                        """
+        else:
+            screen3 = f"""
+        {event.player2:^50}
+        ▐▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▌
+        ▐                       {event.card2.get_value():<2}                       ▌
+        ▐         {event.amount2:<2}🂠           {event.card2.get_symbol()}                        ▌
+        ▐                                                ▌
+        ▐                                                ▌
+        ▐                                                ▌
+        ▐{(event.player2 + " doesn't have enough cards!"):^48}▌
+        ▐                                                ▌
+        ▐                                                ▌
+        ▐                                                ▌
+        ▐                       {event.card1.get_symbol()}           🂠{event.amount1:>2}          ▌
+        ▐                       {event.card1.get_value():<2}                       ▌
+        ▐▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▌
+        {event.player1:^50}
+                        """
+        print(screen3)
+
+    def face_down(self, event):
+        """Show the cards placed face down, then the next draw."""
+        screen2 = f"""
+        {event.player2:^50}
+        ▐▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▀▌
+        ▐                       ?                        ▌
+        ▐         {event.amount2:<2}🂠           🂠                        ▌
+        ▐                                                ▌
+        ▐                                                ▌
+        ▐                                                ▌
+        ▐             Place cards face down...           ▌
+        ▐                                                ▌
+        ▐                                                ▌
+        ▐                                                ▌
+        ▐                       🂠           🂠{event.amount1:>2}          ▌
+        ▐                       ?                        ▌
+        ▐▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▄▌
+        {event.player1:^50}
+                    """
+        print(screen2)
+        self.pause()
+        self.round_started(event)
+
+    def game_over(self, event):
+        """Show the winner of the game."""
+        win_msg = f"""
+
+                    ██╗    ██╗██╗███╗   ██╗
+                    ██║    ██║██║████╗  ██║
+                    ██║ █╗ ██║██║██╔██╗ ██║
+                    ██║███╗██║██║██║╚██╗██║
+                    ╚███╔███╔╝██║██║ ╚████║
+                    ╚══╝╚══╝ ╚═╝╚═╝  ╚═══╝
+                    {event.winner + " won the game!"}
+                    {event.loser + " loses...."}
+                Enter 'start' to begin another game!
+                            """
+        print(win_msg)
+
+    def fast_forward(self, rounds, wars, last):
+        """Show the summary of rounds played without screens.
+
+        :param rounds: number of rounds played
+        :param wars: number of wars in those rounds
+        :param last: last event of the rounds, the final board is drawn from it
+        """
+        print(f"Played {rounds} round(s) with {wars} war(s).")
+        if isinstance(last, GameOver):
+            self.game_over(last)
+        elif last is not None:
+            self.board(last)
+
+    def cheat_used(self, event):
+        """Tell the cheating player what happened."""
+        print("Shhh. Be sneaky... All your cards now have a value of 99.")
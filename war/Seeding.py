@@ -0,0 +1,38 @@
+"""Random number stream module.
+
+Contains the helpers that make games reproducible. Anything that shuffles or
+picks at random takes an optional `rng` argument, which may be a seed or a
+random.Random-like object. Independent seeds for many games are derived from
+one root seed, so the stream of a game only depends on the root seed and the
+game's number, not on which process plays it.
+"""
+
+import hashlib
+import random
+
+
+def make_rng(rng=None):
+    """Return a random number generator for `rng`.
+
+    :param rng: None for the global random module, an int, str or bytes seed
+        for a new random.Random, or an object with the random.Random methods
+        which is returned as is
+    """
+    if rng is None:
+        return random
+    if isinstance(rng, (int, str, bytes, bytearray)):
+        return random.Random(rng)
+    return rng
+
+
+def derive_seed(root, *path):
+    """Return a 64-bit seed derived from a root seed and a path of numbers.
+
+    Like NumPy's SeedSequence spawning, every path gives an independent
+    stream, e.g. derive_seed(root, 7) for game 7 of a run.
+
+    :param root: root seed of the run, an int or str
+    :param path: numbers identifying the stream below the root
+    """
+    key = "/".join(str(part) for part in (root,) + path).encode()
+    return int.from_bytes(hashlib.sha256(key).digest()[:8], "big")
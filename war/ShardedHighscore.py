@@ -0,0 +1,453 @@
+"""Sharded highscore persistence module.
+
+Provides the ShardedHighscore class, an alternative to Highscore for long
+histories. Players are spread over a fixed number of shard files by a hash
+of their name, and every file is compressed. A small summary file holds the
+grouped game counts of every player, which is all the Leaderboard needs, so
+showing the leaderboard or reading one player touches one or two files.
+Games older than a cutoff can be compacted into per-day totals.
+"""
+
+import datetime
+import json
+import lzma
+import os
+import tempfile
+import zlib
+from collections import Counter, namedtuple
+
+try:
+    from Leaderboard import Leaderboard
+    from Statistics import Statistics
+except:
+    from .Leaderboard import Leaderboard
+    from .Statistics import Statistics
+
+
+# The games of one player on one day, after compaction. `fewest_draws` is
+# None when none of them was won.
+DailyTotal = namedtuple("DailyTotal", ["date", "games", "wins", "fewest_draws"])
+
+
+class ShardedHighscore:
+    """Store player statistics in compressed files, sharded by player name.
+
+    The directory holds `shards` shard files, each a compressed JSON object
+    mapping player names to their games and their DailyTotals. A player's
+    shard is picked by the CRC-32 of the name. Shards are read on first use,
+    and save_highscores writes only the shards that changed.
+
+    The summary file keeps, for every player, the number of games per
+    (has_won, draws, date), from which the Leaderboard is built. A day
+    compacted by compact counts as its wins at the fewest draws and its
+    losses at zero draws, which ranks the same as the games did.
+    """
+
+    # Codec name to (file extension, compress, decompress)
+    CODECS = {
+        "zlib": (".json.z", zlib.compress, zlib.decompress),
+        "lzma": (".json.xz", lzma.compress, lzma.decompress),
+    }
+
+    def __init__(self, directory="war/highscores", shards=64, codec="zlib"):
+        """Initialize ShardedHighscore and read the summary of `directory`.
+
+        :param directory: directory of the shard and summary files
+        :param shards: number of shard files for a new directory; an existing
+            directory keeps the number it was created with
+        :param codec: 'zlib' or 'lzma'
+        """
+        if codec not in self.CODECS:
+            raise ValueError(f"Unknown codec {codec!r}, use one of {list(self.CODECS)}")
+        self.__codec = codec
+        self.__new_shards = shards
+        self.__directory = None
+        self.set_filename(directory)
+
+    def __str__(self):
+        """Return a human-readable representation of all highscores."""
+        tmp = []
+        for name, statistics in self.get_highscores().items():
+            lines = [f"{name}:"]
+            for stat_obj in statistics:
+                lines.append(f"    {str(stat_obj)}")
+            tmp.append("\n".join(lines))
+        return "\n".join(tmp)
+
+    def _open(self):
+        """Read the summary of the directory and build the Leaderboard."""
+        self.__shards = self.__new_shards
+        self.__summary = {}  # Player name to Counter of (has_won, draws, date)
+        self.__loaded = {}  # Shard number to its players, read on first use
+        self.__dirty = set()  # Shard numbers changed since the last save
+        self.__summary_dirty = False
+        summary = self._read(self._summary_path())
+        if summary is not None:
+            self.__shards = summary["shards"]
+            for name, groups in summary["players"].items():
+                self.__summary[name] = Counter(
+                    {
+                        (bool(has_won), draws, self._date(date)): count
+                        for has_won, draws, date, count in groups
+                    }
+                )
+        self.__leaderboard = Leaderboard()
+        self.__leaderboard.load_counts(
+            self.__summary,
+            (
+                (name, *game, count)
+                for name, groups in self.__summary.items()
+                for game, count in groups.items()
+            ),
+        )
+
+    def _extension(self):
+        """Return the file extension of the codec."""
+        return self.CODECS[self.__codec][0]
+
+    def _summary_path(self):
+        """Return the path of the summary file."""
+        return os.path.join(self.__directory, "summary" + self._extension())
+
+    def _shard_path(self, shard):
+        """Return the path of a shard file."""
+        return os.path.join(self.__directory, f"shard-{shard:03d}{self._extension()}")
+
+    def _shard_of(self, name):
+        """Return the number of the shard that holds `name`."""
+        return zlib.crc32(name.encode("utf-8")) % self.__shards
+
+    def _read(self, path):
+        """Return the decompressed JSON value of a file, None if it is missing."""
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            return None
+        return json.loads(self.CODECS[self.__codec][2](data).decode("utf-8"))
+
+    def _write(self, path, value):
+        """Compress a JSON value into a temporary file, then rename it to `path`."""
+        data = self.CODECS[self.__codec][1](
+            json.dumps(value, ensure_ascii=False).encode("utf-8")
+        )
+        fd, temp = tempfile.mkstemp(
+            dir=self.__directory, prefix=os.path.basename(path), suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.chmod(temp, 0o644)
+            os.replace(temp, path)
+        except BaseException:
+            os.unlink(temp)
+            raise
+
+    def _shard(self, shard):
+        """Return the players of a shard, reading the file on first use.
+
+        Each player maps to a dict with their "games", a list of Statistics,
+        and their "days", a list of DailyTotals.
+        """
+        players = self.__loaded.get(shard)
+        if players is None:
+            players = {}
+            for name, entry in (self._read(self._shard_path(shard)) or {}).items():
+                players[name] = {
+                    "games": [Statistics.from_dict(game) for game in entry["games"]],
+                    "days": [
+                        DailyTotal(self._date(date), games, wins, fewest)
+                        for date, games, wins, fewest in entry["days"]
+                    ],
+                }
+            self.__loaded[shard] = players
+        return players
+
+    def _entry(self, name):
+        """Return the stored games and days of a player known to the summary."""
+        return self._shard(self._shard_of(name))[name]
+
+    def _changed(self, *names):
+        """Mark the shards of `names` and the summary to be saved."""
+        self.__dirty.update(self._shard_of(name) for name in names)
+        self.__summary_dirty = True
+
+    @staticmethod
+    def _date(text):
+        """Return the date of an ISO string, or None."""
+        return datetime.date.fromisoformat(text) if text is not None else None
+
+    @staticmethod
+    def _count_day(groups, day, sign):
+        """Add (sign 1) or remove (sign -1) a DailyTotal from summary counts."""
+        for game, count in [
+            ((True, day.fewest_draws, day.date), day.wins),
+            ((False, 0, day.date), day.games - day.wins),
+        ]:
+            if count:
+                groups[game] += sign * count
+                if groups[game] <= 0:
+                    del groups[game]
+
+    def save_highscores(self):
+        """Write the shards that changed, then the summary."""
+        try:
+            os.makedirs(self.__directory, exist_ok=True)
+            for shard in sorted(self.__dirty):
+                self._write(
+                    self._shard_path(shard),
+                    {
+                        name: {
+                            "games": [stat.to_dict() for stat in entry["games"]],
+                            "days": [
+                                [day.date.isoformat(), *day[1:]]
+                                for day in entry["days"]
+                            ],
+                        }
+                        for name, entry in self.__loaded[shard].items()
+                    },
+                )
+            self.__dirty = set()
+            if self.__summary_dirty:
+                self._write(
+                    self._summary_path(),
+                    {
+                        "shards": self.__shards,
+                        "players": {
+                            name: [
+                                [has_won, draws, date and date.isoformat(), count]
+                                for (has_won, draws, date), count in groups.items()
+                            ]
+                            for name, groups in self.__summary.items()
+                        },
+                    },
+                )
+                self.__summary_dirty = False
+        except (IOError, TypeError) as e:
+            print(f"Unable to save highscores to directory {self.__directory}: {e}")
+
+    def load_highscores(self):
+        """Read the directory again, dropping unsaved changes.
+
+        Returns every player's games like get_highscores, which reads every
+        shard; the store itself doesn't need that.
+        """
+        self._open()
+        return self.get_highscores()
+
+    def add_player(self, name: str = "Anonymous", statistics=None):
+        """Add a player, with an optional list of Statistics objects.
+
+        If the player exists this is a no-op.
+        """
+        if name in self.__summary:
+            print(f"Player {name} already exists in dictionary")
+            return
+        games = [
+            Statistics.from_dict(stat) if isinstance(stat, dict) else stat
+            for stat in statistics or []
+        ]
+        self._shard(self._shard_of(name))[name] = {"games": games, "days": []}
+        self.__summary[name] = Counter(
+            (stat.get_has_won(), stat.get_draws(), stat.get_date()) for stat in games
+        )
+        self.__leaderboard.add_player(name, games)
+        self._changed(name)
+
+    def update_player_name(self, name, new_name):
+        """Rename a player while preserving their statistics and days.
+
+        If `name` does not exist, `new_name` is created as an empty entry,
+        like Highscore does.
+        """
+        if name in self.__summary:
+            if new_name in self.__summary:
+                print(f"Could not rename {name}. {new_name} already exists.")
+                return
+            entry = self._shard(self._shard_of(name)).pop(name)
+            self._shard(self._shard_of(new_name))[new_name] = entry
+            self.__summary[new_name] = self.__summary.pop(name)
+            self.__leaderboard.update_player_name(name, new_name)
+            self._changed(name, new_name)
+            print(f"Changed {name} to {new_name}")
+        elif new_name not in self.__summary:
+            self.add_player(new_name)
+            print(f"Could not find player {name}. Created empty entry for {new_name}.")
+        else:
+            print(f"Could not find player {name}. {new_name} already exists.")
+
+    def remove_player(self, name):
+        """Remove a player with all their statistics and days.
+
+        Prints a message when the player is not present rather than raising.
+        """
+        if name not in self.__summary:
+            print(f"Unable to find or remove key named {name}")
+            return
+        del self._shard(self._shard_of(name))[name]
+        del self.__summary[name]
+        self.__leaderboard.remove_player(name)
+        self._changed(name)
+
+    def add_statistics(self, name, has_won=False, draws=0, date=None):
+        """Append a Statistics record for the given player name.
+
+        If the player does not exist a message is printed and no-op is
+        performed.
+        """
+        if name not in self.__summary:
+            print(f"No key in dictionary named {name}. Statistics not appended.")
+            return
+        stat = Statistics(has_won, draws, date)
+        self._entry(name)["games"].append(stat)
+        game = (stat.get_has_won(), stat.get_draws(), stat.get_date())
+        self.__summary[name][game] += 1
+        self.__leaderboard.add_statistics(name, *game)
+        self._changed(name)
+
+    def remove_statistics(self, name, stat_num=0):
+        """Remove the statistics entry at index `stat_num` for `name`.
+
+        Only games that weren't compacted can be removed. Safe: prints a
+        message when the player or index doesn't exist.
+        """
+        try:
+            if stat_num < 0 or name not in self.__summary:
+                raise IndexError(stat_num)
+            stat = self._entry(name)["games"].pop(stat_num)
+        except IndexError:
+            print(
+                f"Unable to either find key named {name} or index to remove is out of range."
+            )
+            return
+        game = (stat.get_has_won(), stat.get_draws(), stat.get_date())
+        groups = self.__summary[name]
+        groups[game] -= 1
+        if groups[game] <= 0:
+            del groups[game]
+        self.__leaderboard.remove_statistics(name, *game)
+        self._changed(name)
+
+    def set_highscores(self, highscores):
+        """Replace every player and statistic, and save them.
+
+        :param highscores: dict mapping player names to lists of Statistics
+            objects (or their dict form)
+        """
+        self.__summary = {}
+        self.__loaded = {shard: {} for shard in range(self.__shards)}
+        self.__leaderboard = Leaderboard()
+        for name, statistics in highscores.items():
+            self.add_player(name, statistics)
+        self.__dirty = set(range(self.__shards))
+        self.__summary_dirty = True
+        self.save_highscores()
+        return highscores
+
+    def compact(self, before):
+        """Roll the games dated before `before` into per-day totals.
+
+        Only the shards of players with such games are read and written.
+        Undated games are kept as they are.
+
+        :param before: datetime.date of the first day to keep as games
+        :return: the number of games compacted
+        """
+        compacted = 0
+        for name, groups in self.__summary.items():
+            if not any(date is not None and date < before for _, _, date in groups):
+                continue
+            entry = self._entry(name)
+            old = [
+                stat
+                for stat in entry["games"]
+                if stat.get_date() is not None and stat.get_date() < before
+            ]
+            if not old:
+                continue  # Only days compacted before
+            days = {day.date: day for day in entry["days"]}
+            for day in days.values():
+                self._count_day(groups, day, -1)
+            for stat in old:
+                game = (stat.get_has_won(), stat.get_draws(), stat.get_date())
+                groups[game] -= 1
+                if groups[game] <= 0:
+                    del groups[game]
+                day = days.get(game[2], DailyTotal(game[2], 0, 0, None))
+                fewest = day.fewest_draws
+                if game[0] and (fewest is None or game[1] < fewest):
+                    fewest = game[1]
+                days[game[2]] = DailyTotal(
+                    day.date, day.games + 1, day.wins + game[0], fewest
+                )
+            rolled = {id(stat) for stat in old}
+            entry["games"] = [s for s in entry["games"] if id(s) not in rolled]
+            entry["days"] = sorted(days.values())
+            for day in entry["days"]:
+                self._count_day(groups, day, 1)
+            self._changed(name)
+            compacted += len(old)
+        return compacted
+
+    def get_highscores(self):
+        """Return a dict mapping every player name to their Statistics.
+
+        This reads every shard. Compacted games are not included, see
+        get_days.
+        """
+        return {name: list(self._entry(name)["games"]) for name in self.__summary}
+
+    def get_statistics(self, name):
+        """Return the Statistics of one player, or None for an unknown player.
+
+        Only the shard of that player is read.
+        """
+        if name not in self.__summary:
+            return None
+        return list(self._entry(name)["games"])
+
+    def get_days(self, name):
+        """Return the DailyTotals of one player, or None for an unknown player."""
+        if name not in self.__summary:
+            return None
+        return list(self._entry(name)["days"])
+
+    def get_leaderboard(self):
+        """Return the Leaderboard, built from the summary alone."""
+        return self.__leaderboard
+
+    def set_filename(self, filename):
+        """Switch to the directory `filename`, saving the current one first.
+
+        :param filename: path to a highscores directory
+        :return: the stored directory
+        """
+        if self.__directory is not None:
+            self.save_highscores()
+        self.__directory = filename
+        self._open()
+        return self.__directory
+
+    def get_filename(self):
+        """Return the current highscores directory."""
+        return self.__directory
+
+    def get_journal(self):
+        """Return False: changes are written by save_highscores."""
+        return False
+
+    def can_compact(self):
+        """Return True: old games can be rolled into per-day totals, see compact."""
+        return True
+
+    def request_save(self):
+        """Save now; only the changed shards are written."""
+        self.save_highscores()
+
+    def flush(self):
+        """Save pending changes, like save_highscores."""
+        self.save_highscores()
+
+    def close(self):
+        """Save pending changes."""
+        self.save_highscores()
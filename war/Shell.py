@@ -6,13 +6,21 @@ testable without running an interactive loop.
 """
 
 import cmd
+import datetime
 
 try:  # Try imports for executing Main normally
+    from Engine import Engine
+    from Events import GameOver, War
     from Game import Game
+    from Highscore import Highscore
+    from Renderer import Renderer
 except:  # Except imports for UnitTesting. To prevent module not found Error.
+    from .Engine import Engine
+    from .Events import GameOver, War
     from .Game import Game
+    from .Highscore import Highscore
+    from .Renderer import Renderer
 
-# TODO Rework cheat to be more aligned with requirements, "cheat that one can use for testing purposes and reach the end of the game faster"
 # TODO Rework Graphical interface
 
 
@@ -39,9 +47,20 @@ class Shell(cmd.Cmd):
     prompt = "> "
 
     def __init__(self, game=None):
-        """Initialize the Shell and optionally inject a Game instance for tests."""
+        """Initialize the Shell and optionally inject a Game instance for tests.
+
+        The default game keeps a highscore journal, so results are saved as
+        they happen and quitting only compacts them, and stores histories in
+        compact columns.
+        """
         super().__init__()
-        self.game = game if game is not None else Game()
+        if game is None:
+            game = Game(Highscore(journal=True, columnar=True))
+        self.game = game
+        # The game only emits events; the Shell draws them as screens
+        self.renderer = Renderer()
+        if hasattr(self.game, "subscribe"):
+            self.game.subscribe(self.renderer)
 
     # Commands that let the user play the game
     def do_start(self, arg):
@@ -49,14 +68,36 @@ class Shell(cmd.Cmd):
         while True:
             try:
                 mode = int(
-                    input("Pick gamemode (1) for singleplayer, (2) for two-player: ")
+                    input(
+                        "Pick gamemode (1) for singleplayer, (2) for two-player, "
+                        "(3) for AI versus AI: "
+                    )
                 )
-                if mode == 1 or mode == 2:
+                if mode in (1, 2, 3):
                     break
                 else:
-                    print("Please enter either (1) or (2).")
+                    print("Please enter either (1), (2) or (3).")
             except:
-                print("Please enter either (1) or (2).")
+                print("Please enter either (1), (2) or (3).")
+
+        if mode == 3:
+            # Both players are AIs, named after their levels
+            ai_level1 = self._ask_ai_level("Choose the level of AI 1")
+            ai_level = self._ask_ai_level("Choose the level of AI 2")
+            self.game.start(
+                mode,
+                f"AI 1 ({ai_level1})",
+                f"AI 2 ({ai_level})",
+                ai_level=ai_level,
+                ai_level1=ai_level1,
+            )
+            print("""
+              
+         The AIs are ready! Watch them round by round with
+          'draw', or play the game out quietly with 'auto'
+          
+                    """)
+            return
 
         player1 = input("Please enter the name of player 1: ")
         if mode == 2:
@@ -64,17 +105,7 @@ class Shell(cmd.Cmd):
             self.game.start(mode, player1, player2)
         else:
             # Ask for AI intelligence level when starting singleplayer mode
-            while True:
-                ai_level = (
-                    input("Choose AI level ('top', 'random', 'greedy') [top]: ")
-                    .strip()
-                    .lower()
-                )
-                if ai_level == "":
-                    ai_level = "top"
-                if ai_level in ("top", "random", "greedy"):
-                    break
-                print("Invalid choice. Please select 'top', 'random' or 'greedy'.")
+            ai_level = self._ask_ai_level("Choose AI level")
             self.game.start(mode, player1, ai_level=ai_level)
 
         start_txt = """
@@ -85,20 +116,102 @@ class Shell(cmd.Cmd):
                     """
         print(start_txt)
 
+    @staticmethod
+    def _ask_ai_level(prompt):
+        """Prompt until a valid AI level is entered and return it, 'top' if empty.
+
+        :param prompt: question asked before the list of levels
+        """
+        while True:
+            ai_level = (
+                input(
+                    f"{prompt} ('top', 'random', 'greedy', 'lookahead', "
+                    "'counting', 'table') [top]: "
+                )
+                .strip()
+                .lower()
+            )
+            if ai_level == "":
+                ai_level = "top"
+            if ai_level in (
+                "top",
+                "random",
+                "greedy",
+                "lookahead",
+                "counting",
+                "table",
+            ):
+                return ai_level
+            print(
+                "Invalid choice. Please select 'top', 'random', 'greedy', "
+                "'lookahead', 'counting' or 'table'."
+            )
+
     def do_draw_card(self, arg):
-        """Draw one round in the active game.
+        """Draw one round in the active game, or N rounds with 'draw N'.
 
-        Prints a helpful message if no game is active.
+        Several rounds are played without screens or pauses; only a summary
+        and the final board are shown. Prints a helpful message if no game is
+        active.
         """
-        if self.game.get_active_game():
-            self.game.draw_cards()
-        else:
+        if not self.game.get_active_game():
             print("Please start a game before you begin drawing cards!")
+            return
+        if not arg.strip():
+            self.game.draw_cards()
+            return
+        try:
+            rounds = int(arg)
+        except ValueError:
+            print("Usage: draw [number of rounds]")
+            return
+        self._fast_forward(rounds)
 
     def do_draw(self, arg):
         """Alias for `draw_card`."""
         self.do_draw_card(arg)
 
+    def do_auto(self, arg):
+        """Play the active game to the end without screens or pauses.
+
+        'auto k' also prints the card counts every k-th round. A game that
+        never ends is stopped after the Engine's maximum number of rounds.
+        """
+        if not self.game.get_active_game():
+            print("Please start a game before you begin drawing cards!")
+            return
+        try:
+            every = int(arg) if arg.strip() else 0
+        except ValueError:
+            print("Usage: auto [print every k-th round]")
+            return
+        self._fast_forward(Engine.MAX_ROUNDS, every)
+
+    def _fast_forward(self, rounds, every=0):
+        """Play up to `rounds` rounds quietly and render a summary.
+
+        The events of these rounds are taken straight from Game.play_round, so
+        they never reach the renderer. Stops early when the game is over.
+
+        :param every: print the card counts every `every` rounds, never if 0
+        """
+        played = wars = 0
+        last = None
+        for _ in range(rounds):
+            for event in self.game.play_round():
+                last = event
+                if isinstance(event, War):
+                    wars += 1
+            if isinstance(last, GameOver):
+                break
+            played += 1
+            if every and played % every == 0:
+                print(
+                    f"Round {played}: {last.player1} has {last.amount1} cards, "
+                    f"{last.player2} has {last.amount2} cards"
+                )
+        self.renderer.fast_forward(played, wars, last)
+
     def do_cheat(self, arg):
         """Trigger the game's cheat hook (used by tests or for debug)."""
 
@@ -130,8 +243,61 @@ class Shell(cmd.Cmd):
         print(rules_text)
 
     def do_highscores(self, arg):
-        """Display stored highscores by delegating to the Game object."""
-        self.game.show_highscore()
+        """Display the leaderboard of all time, or of a period.
+
+        Usage: highscores [--since DATE [--until DATE] | --day [DATE] |
+        --week [DATE] | --month [DATE]]. Dates are YYYY-MM-DD, and --day,
+        --week and --month default to the current one.
+        """
+        if not arg.strip():
+            self.game.show_highscore()
+            return
+        try:
+            since, until = self._period(arg.split())
+        except ValueError:
+            print(
+                "Usage: highscores [--since DATE [--until DATE] | "
+                "--day [DATE] | --week [DATE] | --month [DATE]]"
+            )
+            return
+        self.game.show_highscore(since, until)
+
+    @staticmethod
+    def _period(words):
+        """Return the (since, until) dates of the options of do_highscores.
+
+        :raises ValueError: for unknown options or dates
+        """
+        option, values = words[0], [datetime.date.fromisoformat(w) for w in words[1:2]]
+        if option in ("--day", "--week", "--month") and len(words) <= 2:
+            day = values[0] if values else datetime.date.today()
+            if option == "--day":
+                return day, day
+            if option == "--week":
+                monday = day - datetime.timedelta(days=day.weekday())
+                return monday, monday + datetime.timedelta(days=6)
+            first = day.replace(day=1)
+            following = (first + datetime.timedelta(days=32)).replace(day=1)
+            return first, following - datetime.timedelta(days=1)
+        if option == "--since" and values and len(words) == 2:
+            return values[0], None
+        if option == "--since" and len(words) == 4 and words[2] == "--until":
+            return values[0], datetime.date.fromisoformat(words[3])
+        raise ValueError(words)
+
+    def do_compact(self, arg):
+        """Roll games older than N days (default 90) into per-day totals.
+
+        Usage: compact [days]
+        """
+        try:
+            days = int(arg) if arg.strip() else 90
+            if days < 0:
+                raise ValueError(days)
+        except ValueError:
+            print("Please give the number of days to keep, e.g. compact 90")
+            return
+        self.game.compact_highscores(days)
 
     # TODO Better way to implement?
     def do_namechange(self, arg):
@@ -161,6 +327,12 @@ class Shell(cmd.Cmd):
             except Exception:
                 # Don't let save errors break quitting; best-effort only.
                 pass
+        # Stop the highscore writer thread, writing what it still holds.
+        if callable(getattr(self.game, "close", None)):
+            try:
+                self.game.close()
+            except Exception:
+                pass
         return True
 
     def do_q(self, arg):
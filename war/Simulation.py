@@ -0,0 +1,290 @@
+"""Batch simulation module.
+
+Contains the Simulation class which plays many headless games with the
+Engine, spread over a process pool, and the Summary class that aggregates
+their results. Workers only send summaries back to the parent process, never
+individual games. Player 1 can be an AI too, for AI versus AI runs. Sweeps
+with the 'top' level can use the VectorEngine, which plays a whole chunk of
+games at once when NumPy is installed.
+"""
+
+import math
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+try:  # Try imports for executing Main normally
+    from Deck import Deck
+    from Engine import WON, Engine
+    from Seeding import derive_seed
+    from VectorEngine import VectorEngine, np
+except:  # Except imports for UnitTesting. To prevent module not found Error.
+    from .Deck import Deck
+    from .Engine import WON, Engine
+    from .Seeding import derive_seed
+    from .VectorEngine import VectorEngine, np
+
+
+def wilson_interval(wins, games, z=1.96):
+    """Return the Wilson score interval (low, high) of a win rate.
+
+    Unlike the normal approximation it stays within 0 and 1 and is reliable
+    for rates close to either, such as a strong AI against a weak one.
+
+    :param wins: games won
+    :param games: games played, (0.0, 1.0) when 0
+    :param z: standard normal quantile of the confidence level, 1.96 for 95%
+    """
+    if not games:
+        return 0.0, 1.0
+    rate = wins / games
+    z2 = z * z
+    centre = (rate + z2 / (2 * games)) / (1 + z2 / games)
+    margin = (
+        z
+        * math.sqrt(rate * (1 - rate) / games + z2 / (4 * games * games))
+        / (1 + z2 / games)
+    )
+    return max(0.0, centre - margin), min(1.0, centre + margin)
+
+
+class Summary:
+    """Aggregated results of a batch of headless games."""
+
+    def __init__(self):
+        """Initialize an empty Summary."""
+        self.games = 0
+        self.wins = Counter()  # Player number -> games won
+        self.outcomes = Counter()  # Engine outcome (won, cycle, capped) -> games
+        self.draws = Counter()  # num_draws -> number of games
+        self.wars = 0  # Total number of wars over all games
+        self.longest_war = 0  # Longest chain of wars in a single round
+        self.elapsed = 0.0  # Wall clock seconds, set by Simulation.run
+
+    def __str__(self):
+        """Return a short human-readable report."""
+        lines = [
+            f"Games played: {self.games}",
+            f"Player 1 wins: {self.wins[1]} ({self.win_rate(1):.2%})",
+            f"Player 2 wins: {self.wins[2]} ({self.win_rate(2):.2%})",
+            f"Draws per game: mean {self.mean_draws():.1f}, "
+            f"min {min(self.draws, default=0)}, max {max(self.draws, default=0)}",
+            f"Wars: {self.wars} total, longest chain {self.longest_war}",
+        ]
+        unfinished = self.games - self.outcomes[WON]
+        if unfinished:
+            kinds = ", ".join(
+                f"{outcome} {count}"
+                for outcome, count in sorted(self.outcomes.items())
+                if outcome != WON
+            )
+            lines.append(f"Games without a winner: {unfinished} ({kinds})")
+        if self.elapsed:
+            lines.append(
+                f"Elapsed: {self.elapsed:.2f}s ({self.games_per_second():.0f} games/sec)"
+            )
+        return "\n".join(lines)
+
+    def add(self, result):
+        """Add a single GameResult to the summary."""
+        self.games += 1
+        self.outcomes[result.outcome] += 1
+        if result.winner:
+            self.wins[result.winner] += 1
+        self.draws[result.num_draws] += 1
+        self.wars += result.wars
+        if result.longest_war > self.longest_war:
+            self.longest_war = result.longest_war
+
+    def add_batch(self, result):
+        """Add a GameResult of per-game arrays, as returned by VectorEngine.run."""
+        self.games += len(result.winner)
+        for counter, values in (
+            (self.wins, result.winner[result.winner > 0]),
+            (self.outcomes, result.outcome),
+            (self.draws, result.num_draws),
+        ):
+            keys, counts = np.unique(values, return_counts=True)
+            counter.update(dict(zip(keys.tolist(), counts.tolist())))
+        self.wars += int(result.wars.sum())
+        if len(result.longest_war):
+            self.longest_war = max(self.longest_war, int(result.longest_war.max()))
+
+    def merge(self, other):
+        """Merge another Summary into this one and return self."""
+        self.games += other.games
+        self.wins.update(other.wins)
+        self.outcomes.update(other.outcomes)
+        self.draws.update(other.draws)
+        self.wars += other.wars
+        self.longest_war = max(self.longest_war, other.longest_war)
+        return self
+
+    def win_rate(self, player):
+        """Return the fraction of games won by player 1 or 2."""
+        return self.wins[player] / self.games if self.games else 0.0
+
+    def win_interval(self, player, z=1.96):
+        """Return the Wilson interval of the win rate of player 1 or 2.
+
+        Games without a winner count as games the player didn't win.
+
+        :param z: standard normal quantile of the confidence level, 1.96 for 95%
+        """
+        return wilson_interval(self.wins[player], self.games, z)
+
+    def mean_draws(self):
+        """Return the mean number of draws per game."""
+        total = sum(draws * count for draws, count in self.draws.items())
+        return total / self.games if self.games else 0.0
+
+    def games_per_second(self):
+        """Return the throughput of the run that produced this summary."""
+        return self.games / self.elapsed if self.elapsed else 0.0
+
+
+def _run_chunk(
+    games,
+    ai_level,
+    vectorized=False,
+    max_rounds=None,
+    seed=None,
+    first=0,
+    ai_level1=None,
+):
+    """Play `games` freshly dealt games and return their Summary.
+
+    Module level so it can be sent to worker processes. With a root `seed`,
+    game number `first + i` of the run is dealt and played with its own stream
+    derived from the root seed, so the outcome of every game is the same
+    whatever the chunks, workers or engine. Player 1 is an Intelligence of
+    level `ai_level1`, unless it is None.
+    """
+    summary = Summary()
+    if seed is None:
+        if vectorized:
+            engine = VectorEngine.random_deals(games, max_rounds=max_rounds)
+            summary.add_batch(engine.run())
+            return summary
+        for _ in range(games):
+            engine = Engine.from_deck(
+                ai_level=ai_level, max_rounds=max_rounds, ai_level1=ai_level1
+            )
+            summary.add(engine.run())
+        return summary
+
+    rngs = [random.Random(derive_seed(seed, first + i)) for i in range(games)]
+    if vectorized:
+        deals = b"".join(Deck.shuffled_codes(rng) for rng in rngs)
+        codes = np.frombuffer(deals, dtype=np.uint8).reshape(games, -1)
+        engine = VectorEngine(codes, max_rounds)
+        summary.add_batch(engine.run())
+        return summary
+    for rng in rngs:
+        engine = Engine.from_deck(
+            ai_level=ai_level, max_rounds=max_rounds, rng=rng, ai_level1=ai_level1
+        )
+        summary.add(engine.run())
+    return summary
+
+
+class Simulation:
+    """Runs many headless games in parallel and aggregates the results."""
+
+    def __init__(
+        self,
+        games=1000,
+        workers=None,
+        ai_level="top",
+        chunk_size=None,
+        vectorized=None,
+        max_rounds=None,
+        seed=None,
+        ai_level1=None,
+    ):
+        """Initialize the Simulation.
+
+        :param games: number of games to play
+        :param workers: number of worker processes, defaults to the CPU count
+        :param ai_level: intelligence level of the second player
+        :param chunk_size: games per task sent to a worker, chosen when None
+        :param vectorized: play chunks with the VectorEngine. When None it is
+            used whenever it can be, that is for the 'top' level with NumPy.
+        :param max_rounds: rounds after which a game is stopped without a
+            winner, Engine.MAX_ROUNDS when None
+        :param seed: root seed of the run. Every game gets its own stream
+            derived from it, so a seeded run gives identical results with any
+            number of workers. Unseeded runs use fresh randomness.
+        :param ai_level1: intelligence level of the first player for AI
+            versus AI runs, a Player that draws its top card when None
+        """
+        self.games = games
+        self.workers = workers or os.cpu_count() or 1
+        self.ai_level = ai_level
+        self.ai_level1 = ai_level1
+        can_vectorize = (
+            ai_level == "top" and ai_level1 in (None, "top") and np is not None
+        )
+        if vectorized and not can_vectorize:
+            raise ValueError("Vectorized simulation needs NumPy and the 'top' level")
+        self.vectorized = can_vectorize if vectorized is None else vectorized
+        self.max_rounds = max_rounds
+        self.seed = seed
+        self.chunk_size = chunk_size or self._default_chunk_size()
+
+    def _default_chunk_size(self):
+        """Aim for several chunks per worker to balance load, capped in size.
+
+        Vectorized chunks get faster the more games they hold, so each worker
+        gets one large chunk instead.
+        """
+        if self.vectorized:
+            return max(1, min(50000, -(-self.games // self.workers)))
+        return max(1, min(10000, self.games // (self.workers * 8)))
+
+    def chunks(self):
+        """Return the list of chunk sizes that add up to the number of games."""
+        full, rest = divmod(self.games, self.chunk_size)
+        return [self.chunk_size] * full + ([rest] if rest else [])
+
+    def _chunk_args(self, first):
+        """Return the arguments of _run_chunk after the number of games.
+
+        :param first: number of the chunk's first game in the run
+        """
+        return (
+            self.ai_level,
+            self.vectorized,
+            self.max_rounds,
+            self.seed,
+            first,
+            self.ai_level1,
+        )
+
+    def tasks(self):
+        """Return the arguments of _run_chunk for every chunk of the run."""
+        firsts = range(0, self.games, self.chunk_size)  # First game of each chunk
+        return [
+            (size,) + self._chunk_args(first)
+            for size, first in zip(self.chunks(), firsts)
+        ]
+
+    def run(self):
+        """Play all games and return the merged Summary.
+
+        With a single worker the games are played in this process.
+        """
+        start = time.perf_counter()
+        summary = Summary()
+        if self.workers == 1:
+            for task in self.tasks():
+                summary.merge(_run_chunk(*task))
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                futures = [executor.submit(_run_chunk, *task) for task in self.tasks()]
+                for future in as_completed(futures):
+                    summary.merge(future.result())
+        summary.elapsed = time.perf_counter() - start
+        return summary
@@ -0,0 +1,445 @@
+"""SQLite highscore persistence module.
+
+Provides the SqliteHighscore class, an alternative to Highscore that keeps
+players and their statistics in an SQLite database instead of a JSON file.
+It has the same public API, so a Game can use either, but nothing is loaded
+into memory up front: queries read only what they need, and several
+processes can share one database. The leaderboard is answered by queries
+too, so it always shows what the other processes saved.
+"""
+
+import datetime
+import os
+import sqlite3
+
+try:
+    from Leaderboard import Leaderboard, Standing
+    from Statistics import Statistics
+except:
+    from .Leaderboard import Leaderboard, Standing
+    from .Statistics import Statistics
+
+
+class SqliteLeaderboard(Leaderboard):
+    """Leaderboard whose standings are queried from an SQLite database.
+
+    Players are ranked like Leaderboard does, by wins, then win rate, then
+    fewest draws in a win, with a GROUP BY over the covering indexes of the
+    statistics table. Only the requested rows are returned, and nothing is
+    kept between calls, so the standings include every committed change of
+    every process. table is inherited and formats these standings.
+    """
+
+    # Totals per player; the period filter and the grouping are added by
+    # _standings
+    TOTALS = (
+        "SELECT players.name, COUNT(statistics.id) AS games, "
+        "COALESCE(SUM(statistics.has_won), 0) AS wins, "
+        "MIN(CASE WHEN statistics.has_won THEN statistics.draws END) AS fewest, "
+        "MAX(statistics.date) AS last_played FROM players "
+    )
+    ORDER = (
+        "wins DESC, CAST(wins AS REAL) / MAX(games, 1) DESC, fewest IS NULL, "
+        "fewest, name"
+    )
+
+    def __init__(self, highscore):
+        """Initialize the leaderboard of a SqliteHighscore.
+
+        :param highscore: SqliteHighscore whose database is queried
+        """
+        super().__init__()
+        self.__highscore = highscore
+
+    def __len__(self):
+        """Return the number of players in the database."""
+        return self.__highscore._query("SELECT COUNT(*) FROM players")[0][0]
+
+    def get_standing(self, name):
+        """Return the Standing of one player, or None for an unknown player."""
+        rows = self._standings(name=name)
+        return rows[0] if rows else None
+
+    def top(self, k=20):
+        """Return the Standings of the `k` best players, best first."""
+        return self._standings(k=k)
+
+    def window(self, since=None, until=None, k=20):
+        """Return the Standings of the `k` best players of a period.
+
+        Only dated games count, read with the date index.
+
+        :param since: first day of the period, no lower bound if None
+        :param until: last day of the period, no upper bound if None
+        """
+        return self._standings(since, until, k, period=True)
+
+    def _standings(self, since=None, until=None, k=None, period=False, name=None):
+        """Query ranked Standings.
+
+        :param since: first day of the period
+        :param until: last day of the period
+        :param k: number of standings, all when None
+        :param period: count only dated games, between `since` and `until`;
+            players without such games are left out
+        :param name: return only the standing of this player
+        """
+        if period:
+            sql = self.TOTALS + (
+                "JOIN statistics ON statistics.player_id = players.id "
+                "WHERE statistics.date IS NOT NULL"
+            )
+            params = []
+            if since is not None:
+                sql += " AND statistics.date >= ?"
+                params.append(since.isoformat())
+            if until is not None:
+                sql += " AND statistics.date <= ?"
+                params.append(until.isoformat())
+        else:
+            sql = self.TOTALS + (
+                "LEFT JOIN statistics ON statistics.player_id = players.id"
+            )
+            params = []
+        sql += " GROUP BY players.id"
+        if name is not None:
+            sql = (
+                f"SELECT * FROM (SELECT *, ROW_NUMBER() OVER (ORDER BY {self.ORDER}) "
+                f"FROM ({sql})) WHERE name = ?"
+            )
+            params.append(name)
+        else:
+            sql = f"SELECT *, ROW_NUMBER() OVER (ORDER BY {self.ORDER}) FROM ({sql})"
+            sql += f" ORDER BY {self.ORDER}"
+            if k is not None:
+                sql += " LIMIT ?"
+                params.append(k)
+        return [
+            Standing(
+                rank,
+                player,
+                games,
+                wins,
+                wins / games if games else 0.0,
+                fewest,
+                datetime.date.fromisoformat(last) if last else None,
+            )
+            for player, games, wins, fewest, last, rank in self.__highscore._query(
+                sql, params
+            )
+        ]
+
+
+class SqliteHighscore:
+    """Store player statistics in an SQLite database.
+
+    The database has a players table and a statistics table with one row per
+    game, indexed on player and date. It runs in WAL mode, so readers in
+    other processes are not blocked by a writer. New statistics are buffered
+    and inserted in batches of `batch_size`; every other call writes the
+    buffer first, and save_highscores commits it.
+
+    The leaderboard is a SqliteLeaderboard, which queries the database
+    every time, using covering indexes for the totals of all games and of a
+    period.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS players (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE
+        );
+        CREATE TABLE IF NOT EXISTS statistics (
+            id INTEGER PRIMARY KEY,
+            player_id INTEGER NOT NULL REFERENCES players(id) ON DELETE CASCADE,
+            has_won INTEGER NOT NULL,
+            draws INTEGER NOT NULL,
+            date TEXT
+        );
+        CREATE INDEX IF NOT EXISTS statistics_player ON statistics(player_id, id);
+        CREATE INDEX IF NOT EXISTS statistics_date ON statistics(date);
+        CREATE INDEX IF NOT EXISTS statistics_totals
+            ON statistics(player_id, has_won, draws, date);
+        CREATE INDEX IF NOT EXISTS statistics_period
+            ON statistics(date, player_id, has_won, draws);
+    """
+
+    def __init__(self, filename="war/highscores.db", batch_size=500):
+        """Initialize SqliteHighscore and open (or create) the database.
+
+        :param filename: path to the SQLite database, or ':memory:'
+        :param batch_size: statistics buffered before they are inserted
+        """
+        self.__batch_size = batch_size
+        self.__pending = []  # (player id, has_won, draws, date) not inserted yet
+        self.__connection = None
+        self.__leaderboard = SqliteLeaderboard(self)
+        self.set_filename(filename)
+
+    def __str__(self):
+        """Return a human-readable representation of all highscores."""
+        tmp = []
+        for name, statistics in self.get_highscores().items():
+            lines = [f"{name}:"]
+            for stat_obj in statistics:
+                lines.append(f"    {str(stat_obj)}")
+            tmp.append("\n".join(lines))
+        return "\n".join(tmp)
+
+    def _connect(self):
+        """Open the database at the current filename and create the schema."""
+        if self.__connection is not None:
+            self.save_highscores()
+            self.__connection.close()
+        directory = os.path.dirname(self.__filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.__connection = sqlite3.connect(self.__filename, timeout=30)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute("PRAGMA synchronous=NORMAL")
+        self.__connection.execute("PRAGMA foreign_keys=ON")
+        self.__connection.executescript(self.SCHEMA)
+
+    def _db(self):
+        """Return the database connection, opened again after close."""
+        if self.__connection is None:
+            self._connect()
+        return self.__connection
+
+    def _flush(self):
+        """Insert the buffered statistics in one batch."""
+        if self.__pending:
+            self._db().executemany(
+                "INSERT INTO statistics (player_id, has_won, draws, date) "
+                "VALUES (?, ?, ?, ?)",
+                self.__pending,
+            )
+            self.__pending = []
+
+    def _query(self, sql, params=()):
+        """Insert buffered statistics, then return all rows of a query."""
+        self._flush()
+        return self._db().execute(sql, params).fetchall()
+
+    def _player_id(self, name):
+        """Return the id of a player, or None when the player doesn't exist."""
+        row = (
+            self._db()
+            .execute("SELECT id FROM players WHERE name = ?", (name,))
+            .fetchone()
+        )
+        return row[0] if row else None
+
+    def save_highscores(self):
+        """Insert buffered statistics and commit every change to the database."""
+        if self.__connection is None and not self.__pending:
+            return  # Closed with everything saved
+        try:
+            self._flush()
+            self._db().commit()
+        except sqlite3.Error as e:
+            print(f"Unable to save highscores to database {self.__filename}: {e}")
+
+    def load_highscores(self):
+        """Return all highscores from the database.
+
+        Nothing has to be loaded to use the store; this exists for API
+        compatibility with Highscore and reads every row.
+        """
+        return self.get_highscores()
+
+    def add_player(self, name: str = "Anonymous", statistics=None):
+        """Add a player, with an optional list of Statistics objects.
+
+        If the player exists this is a no-op.
+        """
+        self._flush()
+        if self._player_id(name) is not None:
+            print(f"Player {name} already exists in dictionary")
+            return
+        cursor = self._db().execute("INSERT INTO players (name) VALUES (?)", (name,))
+        for stat in statistics or []:
+            self.__pending.append(self._row(cursor.lastrowid, stat))
+        self._flush()
+        self._db().commit()
+
+    def update_player_name(self, name, new_name):
+        """Rename a player while preserving their statistics.
+
+        If `name` does not exist, `new_name` is created as an empty entry,
+        like Highscore does.
+        """
+        self._flush()
+        if self._player_id(name) is not None:
+            try:
+                self._db().execute(
+                    "UPDATE players SET name = ? WHERE name = ?", (new_name, name)
+                )
+            except sqlite3.IntegrityError:
+                print(f"Could not rename {name}. {new_name} already exists.")
+                return
+            print(f"Changed {name} to {new_name}")
+        elif self._player_id(new_name) is None:
+            self._db().execute("INSERT INTO players (name) VALUES (?)", (new_name,))
+            print(f"Could not find player {name}. Created empty entry for {new_name}.")
+        else:
+            print(f"Could not find player {name}. {new_name} already exists.")
+        self._db().commit()
+
+    def remove_player(self, name):
+        """Remove a player and all their statistics.
+
+        Prints a message when the player is not present rather than raising.
+        """
+        self._flush()
+        cursor = self._db().execute("DELETE FROM players WHERE name = ?", (name,))
+        if cursor.rowcount == 0:
+            print(f"Unable to find or remove key named {name}")
+            return
+        self._db().commit()
+
+    def add_statistics(self, name, has_won=False, draws=0, date=None):
+        """Buffer a Statistics record for the given player name.
+
+        If the player does not exist a message is printed and no-op is
+        performed. Records are inserted once `batch_size` of them are
+        buffered, or by the next other call.
+        """
+        player_id = self._player_id(name)
+        if player_id is None:
+            print(f"No key in dictionary named {name}. Statistics not appended.")
+            return
+        stat = Statistics(has_won, draws, date)
+        self.__pending.append(self._row(player_id, stat))
+        if len(self.__pending) >= self.__batch_size:
+            self.save_highscores()
+
+    def remove_statistics(self, name, stat_num=0):
+        """Remove the statistics entry at index `stat_num` for `name`.
+
+        Safe: prints a message when the player or index doesn't exist.
+        """
+        self._flush()
+        row = (
+            self._db()
+            .execute(
+                "SELECT statistics.id, has_won, draws, date FROM statistics JOIN players "
+                "ON players.id = statistics.player_id WHERE players.name = ? "
+                "ORDER BY statistics.id LIMIT 1 OFFSET ?",
+                (name, stat_num),
+            )
+            .fetchone()
+        )
+        if row is None or stat_num < 0:
+            print(
+                f"Unable to either find key named {name} or index to remove is out of range."
+            )
+            return
+        self._db().execute("DELETE FROM statistics WHERE id = ?", row[:1])
+        self._db().commit()
+
+    def set_highscores(self, highscores):
+        """Replace every player and statistic in the database.
+
+        :param highscores: dict mapping player names to lists of Statistics
+            objects (or their dict form)
+        """
+        self.__pending = []
+        self._db().execute("DELETE FROM statistics")
+        self._db().execute("DELETE FROM players")
+        for name, statistics in highscores.items():
+            cursor = self._db().execute(
+                "INSERT INTO players (name) VALUES (?)", (name,)
+            )
+            for stat in statistics:
+                if isinstance(stat, dict):
+                    stat = Statistics.from_dict(stat)
+                self.__pending.append(self._row(cursor.lastrowid, stat))
+        self.save_highscores()
+        return highscores
+
+    def get_highscores(self):
+        """Return a dict mapping every player name to their Statistics."""
+        self._flush()
+        highscores = {
+            name: []
+            for (name,) in self._db().execute("SELECT name FROM players ORDER BY id")
+        }
+        rows = self._db().execute(
+            "SELECT players.name, has_won, draws, date FROM statistics "
+            "JOIN players ON players.id = statistics.player_id ORDER BY statistics.id"
+        )
+        for name, has_won, draws, date in rows:
+            highscores[name].append(Statistics(bool(has_won), draws, date))
+        return highscores
+
+    def get_statistics(self, name):
+        """Return the Statistics of one player, or None for an unknown player.
+
+        Only that player's rows are read, using the player index.
+        """
+        self._flush()
+        player_id = self._player_id(name)
+        if player_id is None:
+            return None
+        rows = self._db().execute(
+            "SELECT has_won, draws, date FROM statistics WHERE player_id = ? "
+            "ORDER BY id",
+            (player_id,),
+        )
+        return [Statistics(bool(has_won), draws, date) for has_won, draws, date in rows]
+
+    def get_leaderboard(self):
+        """Return the SqliteLeaderboard of the players in the database."""
+        return self.__leaderboard
+
+    def set_filename(self, filename):
+        """Switch to the database at `filename`, saving the current one first.
+
+        :param filename: path to an SQLite database, or ':memory:'
+        :return: the stored filename
+        """
+        self.__filename = filename
+        self._connect()
+        return self.__filename
+
+    def get_filename(self):
+        """Return the current database filename."""
+        return self.__filename
+
+    def get_journal(self):
+        """Return False: changes go to the database, not a journal file."""
+        return False
+
+    def can_compact(self):
+        """Return False: every game is kept as a row of its own."""
+        return False
+
+    def request_save(self):
+        """Commit now; a commit is cheap, so there is nothing to defer."""
+        self.save_highscores()
+
+    def flush(self):
+        """Insert buffered statistics and commit them, like save_highscores."""
+        self.save_highscores()
+
+    def close(self):
+        """Save pending changes and close the database connection.
+
+        The store can still be used afterwards; it opens the database again.
+        """
+        if self.__connection is not None:
+            self.save_highscores()
+            self.__connection.close()
+            self.__connection = None
+
+    @staticmethod
+    def _row(player_id, stat):
+        """Return the statistics table values of a Statistics object."""
+        date = stat.get_date()
+        return (
+            player_id,
+            int(stat.get_has_won()),
+            stat.get_draws(),
+            date.isoformat() if date is not None else None,
+        )
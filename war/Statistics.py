@@ -1,5 +1,12 @@
-"""Statistics model: stores per-game results and supports JSON serialization."""
+"""Statistics model: stores per-game results and supports JSON serialization.
 
+StatisticsColumns stores the results of many games column by column in
+compact arrays, with StatisticsRow views that behave like Statistics.
+"""
+
+from array import array
+from collections import Counter
+from itertools import compress
 from typing import Optional
 import datetime
 
@@ -69,13 +76,13 @@ class Statistics:
 
     # getters
     def get_has_won(self) -> bool:
-        return getattr(self, "_Statistics__has_won", getattr(self, "__has_won", False))
+        return self.__has_won
 
     def get_draws(self) -> int:
-        return getattr(self, "_Statistics__draws", getattr(self, "__draws", 0))
+        return self.__draws
 
     def get_date(self) -> Optional[datetime.date]:
-        return getattr(self, "_Statistics__date", getattr(self, "__date", None))
+        return self.__date
 
     # serialization helpers
     def to_dict(self) -> dict:
@@ -87,6 +94,21 @@ class Statistics:
             "date": date.isoformat() if date is not None else None,
         }
 
+    @classmethod
+    def from_trusted(
+        cls, has_won: bool, draws: int, date: Optional[datetime.date]
+    ) -> "Statistics":
+        """Create a Statistics from values that already have the right types.
+
+        Skips the conversions of the setters, for loaders that checked the
+        values themselves: has_won a bool, draws an int, date a date or None.
+        """
+        stat = cls.__new__(cls)
+        stat.__has_won = has_won
+        stat.__draws = draws
+        stat.__date = date
+        return stat
+
     @classmethod
     def from_dict(cls, data: dict) -> "Statistics":
         """Create a Statistics from a dict produced by to_dict()."""
@@ -101,3 +123,168 @@ class Statistics:
         return cls(
             has_won=data.get("has_won", False), draws=data.get("draws", 0), date=date
         )
+
+
+class StatisticsRow(Statistics):
+    """A view of one row of a StatisticsColumns that behaves like Statistics.
+
+    Nothing is copied: getters read the columns and setters write to them.
+    Removing an earlier row shifts the rows after it, so a view refers to
+    whatever row holds its index afterwards.
+    """
+
+    def __init__(self, columns: "StatisticsColumns", index: int):
+        """Create a view of row `index` of `columns`."""
+        self.__columns = columns
+        self.__index = index
+
+    def set_has_won(self, has_won: bool) -> bool:
+        self.__columns.get_columns()[0][self.__index] = bool(has_won)
+        return self.get_has_won()
+
+    def set_draws(self, draws: int) -> int:
+        self.__columns.get_columns()[1][self.__index] = int(draws)
+        return self.get_draws()
+
+    def set_date(self, date: Optional[object]) -> Optional[datetime.date]:
+        """Set the date of the row; accepts what Statistics.set_date accepts."""
+        date = Statistics(date=date).get_date()
+        self.__columns.get_columns()[2][self.__index] = StatisticsColumns.ordinal(date)
+        return date
+
+    def get_has_won(self) -> bool:
+        return bool(self.__columns.get_columns()[0][self.__index])
+
+    def get_draws(self) -> int:
+        return self.__columns.get_columns()[1][self.__index]
+
+    def get_date(self) -> Optional[datetime.date]:
+        return StatisticsColumns.date(self.__columns.get_columns()[2][self.__index])
+
+
+class StatisticsColumns:
+    """A list of game results stored as three parallel arrays.
+
+    has_won is an array of bytes, draws a signed array('q'), which takes any
+    count a Statistics object does, and dates an array of date ordinals, 0
+    for no date. Indexing gives StatisticsRow views and
+    the list methods Highscore uses (append, pop, len, iteration) are
+    supported, so it can hold a player's history in place of a list of
+    Statistics objects. Aggregations scan the arrays.
+    """
+
+    def __init__(self, statistics=()):
+        """Create the columns, optionally filled from Statistics objects."""
+        self.__has_won = array("B")
+        self.__draws = array("q")
+        self.__dates = array("I")
+        self.extend(statistics)
+
+    def __len__(self) -> int:
+        return len(self.__draws)
+
+    def __getitem__(self, index):
+        """Return a StatisticsRow view, or a new StatisticsColumns for a slice."""
+        if isinstance(index, slice):
+            part = StatisticsColumns()
+            part.__has_won = self.__has_won[index]
+            part.__draws = self.__draws[index]
+            part.__dates = self.__dates[index]
+            return part
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("StatisticsColumns index out of range")
+        return StatisticsRow(self, index)
+
+    def __iter__(self):
+        return (StatisticsRow(self, index) for index in range(len(self)))
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, StatisticsColumns):
+            return NotImplemented
+        return self.get_columns() == other.get_columns()
+
+    def __repr__(self) -> str:
+        return f"StatisticsColumns({len(self)} games)"
+
+    @staticmethod
+    def ordinal(date: Optional[datetime.date]) -> int:
+        """Return the stored ordinal of a date, 0 for None."""
+        return date.toordinal() if date is not None else 0
+
+    @staticmethod
+    def date(ordinal: int) -> Optional[datetime.date]:
+        """Return the date of a stored ordinal, None for 0."""
+        return datetime.date.fromordinal(ordinal) if ordinal else None
+
+    def get_columns(self) -> tuple:
+        """Return the has_won, draws and date ordinal arrays."""
+        return self.__has_won, self.__draws, self.__dates
+
+    def append(self, stat: Statistics) -> None:
+        """Append the values of a Statistics object as a new row."""
+        self.__has_won.append(bool(stat.get_has_won()))
+        self.__draws.append(stat.get_draws())
+        self.__dates.append(self.ordinal(stat.get_date()))
+
+    def append_values(
+        self, has_won: bool, draws: int, date: Optional[datetime.date]
+    ) -> None:
+        """Append a row from plain values, without a Statistics object."""
+        self.__has_won.append(has_won)
+        self.__draws.append(draws)
+        self.__dates.append(self.ordinal(date))
+
+    def extend(self, statistics) -> None:
+        """Append every Statistics object of an iterable."""
+        for stat in statistics:
+            self.append(stat)
+
+    def pop(self, index: int = -1) -> Statistics:
+        """Remove a row and return its values as a new Statistics object."""
+        if not -len(self) <= index < len(self):
+            raise IndexError("pop index out of range")
+        return Statistics(
+            bool(self.__has_won.pop(index)),
+            self.__draws.pop(index),
+            self.date(self.__dates.pop(index)),
+        )
+
+    def to_dicts(self) -> list:
+        """Return the to_dict() form of every row."""
+        return [
+            {
+                "has_won": bool(has_won),
+                "draws": draws,
+                "date": self.date(ordinal).isoformat() if ordinal else None,
+            }
+            for has_won, draws, ordinal in zip(*self.get_columns())
+        ]
+
+    # aggregations
+    def wins(self) -> int:
+        """Return the number of games won."""
+        return sum(self.__has_won)
+
+    def total_draws(self) -> int:
+        """Return the draws of all games together."""
+        return sum(self.__draws)
+
+    def fewest_win_draws(self) -> Optional[int]:
+        """Return the fewest draws of a won game, None without wins."""
+        return min(compress(self.__draws, self.__has_won), default=None)
+
+    def last_played(self) -> Optional[datetime.date]:
+        """Return the latest date of a game, None without dated games."""
+        return self.date(max(self.__dates, default=0))
+
+    def group_counts(self) -> Counter:
+        """Count the games per distinct (has_won, draws, date)."""
+        counts = Counter(zip(self.__has_won, self.__draws, self.__dates))
+        return Counter(
+            {
+                (bool(has_won), draws, self.date(ordinal)): count
+                for (has_won, draws, ordinal), count in counts.items()
+            }
+        )
@@ -0,0 +1,188 @@
+"""AI tournament module.
+
+Contains the Tournament class which plays every pairing of AI levels against
+each other with the headless Engine, spread over a process pool, and the
+Standings class that holds the matrix of their Summaries with Wilson
+confidence intervals of the win rates.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from statistics import NormalDist
+
+try:  # Try imports for executing Main normally
+    from Simulation import Simulation, Summary, _run_chunk, wilson_interval
+except:  # Except imports for UnitTesting. To prevent module not found Error.
+    from .Simulation import Simulation, Summary, _run_chunk, wilson_interval
+
+
+class Standings:
+    """Results of a tournament: a Summary for every pairing of levels.
+
+    The pairing (row, column) is the row level playing as player 1 against
+    the column level as player 2, so every level plays every other one from
+    both seats, and itself.
+    """
+
+    def __init__(self, levels, confidence=0.95):
+        """Initialize empty Standings.
+
+        :param levels: intelligence levels of the tournament, in table order
+        :param confidence: confidence level of the win rate intervals
+        """
+        self.levels = tuple(levels)
+        self.confidence = confidence
+        self.z = NormalDist().inv_cdf((1 + confidence) / 2)
+        self.summaries = {
+            (row, column): Summary() for row in self.levels for column in self.levels
+        }
+        self.elapsed = 0.0  # Wall clock seconds, set by Tournament.run
+
+    def __str__(self):
+        """Return the matrix of win rates followed by the ranking of the levels."""
+        width = max(17, *(len(level) for level in self.levels))
+        games = {summary.games for summary in self.summaries.values()}
+        lines = [
+            "Win rate of the row level as player 1 against the column level as "
+            f"player 2, {self.confidence:.0%} Wilson interval, "
+            f"{'/'.join(map(str, sorted(games)))} games per pairing",
+            " " * width + "".join(f"  {level:<{width}}" for level in self.levels),
+        ]
+        lines[-1] = lines[-1].rstrip()
+        for row in self.levels:
+            cells = []
+            for column in self.levels:
+                rate = self.summaries[row, column].win_rate(1)
+                low, high = self.win_interval(row, column)
+                cells.append(f"  {self._cell(rate, low, high):<{width}}")
+            lines.append((f"{row:<{width}}" + "".join(cells)).rstrip())
+        lines.append("")
+        lines.append("Ranking by games won from either seat:")
+        for place, (level, wins, played) in enumerate(self.ranking(), 1):
+            low, high = wilson_interval(wins, played, self.z)
+            rate = wins / played if played else 0.0
+            lines.append(f"{place}. {level:<{width}}  {self._cell(rate, low, high)}")
+        if self.elapsed:
+            total = sum(summary.games for summary in self.summaries.values())
+            lines.append(
+                f"Elapsed: {self.elapsed:.2f}s ({total / self.elapsed:.0f} games/sec)"
+            )
+        return "\n".join(lines)
+
+    @staticmethod
+    def _cell(rate, low, high):
+        """Return a win rate and its interval as text, e.g. '51.2% (48.1-54.3)'."""
+        return f"{rate:.1%} ({low * 100:.1f}-{high * 100:.1f})"
+
+    def get_summary(self, level1, level2):
+        """Return the Summary of `level1` as player 1 against `level2`."""
+        return self.summaries[level1, level2]
+
+    def win_rate(self, level1, level2):
+        """Return the fraction of games `level1` won as player 1 against `level2`."""
+        return self.summaries[level1, level2].win_rate(1)
+
+    def win_interval(self, level1, level2):
+        """Return the Wilson interval of win_rate(level1, level2)."""
+        return self.summaries[level1, level2].win_interval(1, self.z)
+
+    def ranking(self):
+        """Return (level, games won, games played) tuples, best level first.
+
+        A level's games are all the games it played from either seat,
+        including its games against itself.
+        """
+        totals = []
+        for level in self.levels:
+            wins = played = 0
+            for (row, column), summary in self.summaries.items():
+                if row == level:
+                    wins += summary.wins[1]
+                    played += summary.games
+                if column == level:
+                    wins += summary.wins[2]
+                    played += summary.games
+            totals.append((level, wins, played))
+        return sorted(
+            totals,
+            key=lambda total: total[1] / total[2] if total[2] else 0.0,
+            reverse=True,
+        )
+
+
+class Tournament:
+    """Plays every pairing of AI levels in parallel and collects the Standings.
+
+    Each pairing is run like a Simulation with an Intelligence in both seats.
+    The chunks of all pairings go to one process pool, so the workers stay
+    busy until the whole matrix is played. With a seed every pairing plays
+    the same deals, which makes the pairings directly comparable.
+    """
+
+    # The 'lookahead' level plays rollouts for every decision and is left out
+    # by default, as its games take seconds each
+    LEVELS = ("top", "random", "greedy", "counting", "table")
+
+    def __init__(
+        self,
+        levels=LEVELS,
+        games=1000,
+        workers=None,
+        chunk_size=None,
+        max_rounds=None,
+        seed=None,
+        confidence=0.95,
+    ):
+        """Initialize the Tournament.
+
+        :param levels: intelligence levels that play each other
+        :param games: games played by every pairing
+        :param workers: number of worker processes, defaults to the CPU count
+        :param chunk_size: games per task sent to a worker, chosen when None
+        :param max_rounds: rounds after which a game is stopped without a
+            winner, Engine.MAX_ROUNDS when None
+        :param seed: root seed of the deals, shared by every pairing
+        :param confidence: confidence level of the win rate intervals
+        """
+        self.levels = tuple(levels)
+        self.games = games
+        self.workers = workers or os.cpu_count() or 1
+        self.confidence = confidence
+        self.simulations = {
+            (row, column): Simulation(
+                games,
+                self.workers,
+                column,
+                chunk_size,
+                None,
+                max_rounds,
+                seed,
+                ai_level1=row,
+            )
+            for row in self.levels
+            for column in self.levels
+        }
+
+    def run(self):
+        """Play all pairings and return the Standings.
+
+        With a single worker the games are played in this process.
+        """
+        start = time.perf_counter()
+        standings = Standings(self.levels, self.confidence)
+        if self.workers == 1:
+            for pairing, simulation in self.simulations.items():
+                for task in simulation.tasks():
+                    standings.summaries[pairing].merge(_run_chunk(*task))
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                futures = {
+                    executor.submit(_run_chunk, *task): pairing
+                    for pairing, simulation in self.simulations.items()
+                    for task in simulation.tasks()
+                }
+                for future in as_completed(futures):
+                    standings.summaries[futures[future]].merge(future.result())
+        standings.elapsed = time.perf_counter() - start
+        return standings
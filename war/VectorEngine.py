@@ -0,0 +1,302 @@
+"""Vectorized lockstep simulation engine.
+
+Contains the VectorEngine class which plays thousands of independent War
+games at once with NumPy. All games are advanced in lockstep, one round per
+step: every live game draws its top cards, compares them and moves the pot
+to the winner. Rounds that end in a war are resolved for the tied games
+only, before the next step. Finished games are retired from the arrays. The
+outcome of each game is the same as the Engine playing the same deal with
+the 'top' level, including games that loop or reach the round cap.
+
+NumPy is an optional dependency; the rest of the package works without it.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # Optional dependency, only needed for this module
+    np = None
+
+try:  # Try imports for executing Main normally
+    from Card import CARD_TABLE, RANKS
+    from CardHand import CardHand
+    from Engine import CAPPED, CYCLE, WON, Engine, GameResult
+    from Player import Player
+except:  # Except imports for UnitTesting. To prevent module not found Error.
+    from .Card import CARD_TABLE, RANKS
+    from .CardHand import CardHand
+    from .Engine import CAPPED, CYCLE, WON, Engine, GameResult
+    from .Player import Player
+
+
+class VectorEngine:
+    """Plays a batch of War games in lockstep using NumPy arrays.
+
+    State is kept as a struct of arrays with one row per game. The hands of
+    both players are ring buffers of card values with shape
+    (games, 2, ring size), with head and count offsets of shape (games, 2).
+    The ring size is a power of two, so offsets wrap with a bit mask, and it
+    is larger than the number of cards in a game, so the slots after a
+    hand's last card are always free to write to.
+
+    Once only a few games are left, the per-step cost of NumPy outweighs the
+    work per game, so the remaining games are finished by the Engine.
+
+    Looping games are found like in the Engine: all games share the same
+    round number, so the positions of every game are saved after 1, 2, 4, ...
+    rounds and compared with later ones where player 1's card count and top
+    card match.
+    """
+
+    SCALAR_TAIL = 256  # Finish the batch with the Engine below this many games
+
+    def __init__(self, deals, max_rounds=None):
+        """Initialize the VectorEngine with a batch of deals.
+
+        :param deals: 2-D array of card codes, one row per game. The first
+            half of a row is player 1's hand and the second half player 2's,
+            top card first, like Deck.split.
+        :param max_rounds: rounds after which a game is stopped,
+            Engine.MAX_ROUNDS when None
+        """
+        if np is None:
+            raise ImportError("VectorEngine requires NumPy to be installed")
+        self.__deals = np.asarray(deals, dtype=np.uint8)
+        self.__max_rounds = Engine.MAX_ROUNDS if max_rounds is None else max_rounds
+
+    @classmethod
+    def random_deals(cls, games, rng=None, max_rounds=None):
+        """Return an engine for `games` freshly shuffled standard decks.
+
+        :param games: number of games in the batch
+        :param rng: numpy.random.Generator, a new default generator when None
+        :param max_rounds: rounds after which a game is stopped
+        """
+        if np is None:
+            raise ImportError("VectorEngine requires NumPy to be installed")
+        if rng is None:
+            rng = np.random.default_rng()
+        return cls(rng.random((games, len(RANKS))).argsort(axis=1), max_rounds)
+
+    def get_deals(self):
+        """Return the card codes of every deal in the batch."""
+        return self.__deals
+
+    def run(self):
+        """Play every game to the end.
+
+        :return: GameResult whose fields are arrays with one entry per game
+        """
+        games, cards = self.__deals.shape
+        half = cards // 2
+        self.__size = 1 << cards.bit_length()  # Ring size, a power of two > cards
+        self.__mask = self.__size - 1
+
+        ranks = np.frombuffer(RANKS, dtype=np.uint8)[self.__deals]
+        hands = np.zeros((games, 2, self.__size), dtype=np.uint8)
+        hands[:, 0, :half] = ranks[:, :half]
+        hands[:, 1, : cards - half] = ranks[:, half:]
+        self.__state = {
+            "hands": hands,
+            "head": np.zeros((games, 2), dtype=np.int64),
+            "count": np.tile(
+                np.array([half, cards - half], dtype=np.int64), (games, 1)
+            ),
+            "draws": np.zeros(games, dtype=np.int64),
+            "wars": np.zeros(games, dtype=np.int64),
+            "longest": np.zeros(games, dtype=np.int64),
+            "ids": np.arange(games),  # Original game index of every row
+            "saved": hands.copy(),  # Positions saved for cycle detection
+            "saved_count": np.full(games, -1, dtype=np.int64),
+            "saved_top": np.zeros(games, dtype=np.uint8),
+        }
+
+        result = GameResult(
+            np.zeros(games, dtype=np.int8),
+            np.zeros(games, dtype=np.int64),
+            np.zeros(games, dtype=np.int64),
+            np.zeros(games, dtype=np.int64),
+            np.full(games, WON, dtype=np.array([WON, CYCLE, CAPPED]).dtype),
+        )
+        alive = np.ones(games, dtype=bool)
+        live = games
+        self.__rounds, checkpoint = 0, 1
+        while live >= self.SCALAR_TAIL:
+            s = self.__state
+            if self.__rounds == self.__max_rounds:
+                rows = np.flatnonzero(alive)
+                self._record(result, rows, 0, CAPPED)
+                alive[rows] = False
+                break
+            # Retire finished games once they make up a quarter of the rows
+            if live < 0.75 * len(alive):
+                self._retire(alive)
+                alive = alive[alive]
+            self._step(np.flatnonzero(alive))
+            self.__rounds += 1
+
+            over = np.flatnonzero(alive & (s["count"] == 0).any(axis=1))
+            self._record(result, over, np.where(s["count"][over, 0] > 0, 1, 2))
+            alive[over] = False
+
+            # Only rows where player 1 has as many cards and the same top card
+            # as when the position was saved can be back in that position
+            top = s["hands"][np.arange(len(alive)), 0, s["head"][:, 0]]
+            maybe = (s["count"][:, 0] == s["saved_count"]) & (top == s["saved_top"])
+            rows = np.flatnonzero(alive & maybe)
+            if rows.size:
+                same = (self._positions(rows) == s["saved"][rows]).all(axis=(1, 2))
+                self._record(result, rows[same], 0, CYCLE)
+                alive[rows[same]] = False
+            live = np.count_nonzero(alive)
+
+            if self.__rounds == checkpoint:
+                s["saved"] = self._positions(np.arange(len(alive)))
+                s["saved_count"] = s["count"][:, 0].copy()
+                s["saved_top"] = top
+                checkpoint *= 2
+
+        self._retire(alive)
+        self._finish(result)
+        return result
+
+    def results(self):
+        """Play every game and return one GameResult per game."""
+        result = self.run()
+        return [
+            GameResult(*values) for values in zip(*(field.tolist() for field in result))
+        ]
+
+    def _record(self, result, rows, winner, outcome=WON):
+        """Store the outcome of the finished games in `rows`."""
+        s = self.__state
+        game = s["ids"][rows]
+        result.winner[game] = winner
+        result.num_draws[game] = s["draws"][rows]
+        result.wars[game] = s["wars"][rows]
+        result.longest_war[game] = s["longest"][rows]
+        result.outcome[game] = outcome
+
+    def _positions(self, rows):
+        """Return the hands of the games in `rows`, top card first.
+
+        Slots after the last card of a hand are zero, so equal positions give
+        equal arrays.
+        """
+        s, size, mask = self.__state, self.__size, self.__mask
+        slots = np.arange(size)
+        offsets = (s["head"][rows][:, :, None] + slots) & mask
+        cards = s["hands"][rows[:, None, None], np.arange(2)[:, None], offsets]
+        cards[slots >= s["count"][rows][:, :, None]] = 0
+        return cards
+
+    def _retire(self, alive):
+        """Drop the rows of finished games from every state array."""
+        s = self.__state
+        for name, values in s.items():
+            s[name] = values[alive]
+
+    def _finish(self, result):
+        """Play the remaining games to the end one by one with the Engine."""
+        s, mask = self.__state, self.__mask
+        for row in range(len(s["ids"])):
+            players = []
+            for p in range(2):
+                offsets = (s["head"][row, p] + np.arange(s["count"][row, p])) & mask
+                cards = [CARD_TABLE[rank - 2] for rank in s["hands"][row, p, offsets]]
+                players.append(Player(hand=CardHand(cards)))
+            game = Engine(*players, self.__max_rounds - self.__rounds).run()
+            s["draws"][row] += game.num_draws
+            s["wars"][row] += game.wars
+            s["longest"][row] = max(s["longest"][row], game.longest_war)
+            self._record(result, np.array([row]), game.winner, game.outcome)
+
+    def _step(self, rows):
+        """Play one round in the games of `rows`, the rows of live games.
+
+        Finished games are left as they are until they are retired, so their
+        hands and counts keep the values they ended with.
+
+        :param rows: int array of the rows of the games still being played
+        """
+        s, size, mask = self.__state, self.__size, self.__mask
+        hands, head, count = s["hands"].ravel(), s["head"].ravel(), s["count"].ravel()
+        slot = ((rows * 2)[:, None] + np.arange(2)).ravel()  # Both hands of a row
+        base = slot * size
+
+        first = head[slot]
+        cards = hands[base + first]
+        first = (first + 1) & mask
+        left = count[slot] - 1
+        s["draws"][rows] += 1
+
+        # Every hand's free slots get the loser's card, then the winner's;
+        # only the winner's count grows
+        pair = cards.reshape(-1, 2)
+        tail = first + left
+        hands[base + (tail & mask)] = pair[:, ::-1].ravel()
+        hands[base + ((tail + 1) & mask)] = cards
+        gain = np.empty(pair.shape, dtype=np.int64)
+        np.greater(pair[:, 0], pair[:, 1], out=gain[:, 0], casting="unsafe")
+        np.less(pair[:, 0], pair[:, 1], out=gain[:, 1], casting="unsafe")
+        head[slot] = first
+        count[slot] = left + 2 * gain.ravel()
+
+        tied = np.flatnonzero(pair[:, 0] == pair[:, 1])
+        if tied.size:
+            self._war(rows[tied], pair[tied, :, None])
+
+    def _war(self, rows, pot):
+        """Resolve the wars of the tied games in `rows`.
+
+        :param pot: array of shape (games, 2, cards) with both players' pots
+        """
+        s, size, mask = self.__state, self.__size, self.__mask
+        hands, head, count = s["hands"].ravel(), s["head"], s["count"]
+        depth = 0
+        while rows.size:
+            depth += 1
+            s["wars"][rows] += 1
+            s["longest"][rows] = np.maximum(s["longest"][rows], depth)
+
+            # A player without two cards left forfeits the pot
+            left = count[rows]
+            short1 = left[:, 0] < 2
+            short = short1 | (left[:, 1] < 2)
+            if short.any():
+                self._collect(
+                    rows[short], (~short1[short]).astype(np.int64), pot[short]
+                )
+                rows, pot = rows[~short], pot[~short]
+
+            # Face down card, then face up card
+            first = head[rows]
+            slot = (rows * 2)[:, None] + np.arange(2)
+            down = hands[slot * size + first]
+            up = hands[slot * size + ((first + 1) & mask)]
+            head[rows] = (first + 2) & mask
+            count[rows] -= 2
+            pot = np.concatenate((pot, down[:, :, None], up[:, :, None]), axis=2)
+
+            decided = up[:, 0] != up[:, 1]
+            winner = (up[decided, 0] > up[decided, 1]).astype(np.int64)
+            self._collect(rows[decided], winner, pot[decided])
+            rows, pot = rows[~decided], pot[~decided]
+
+    def _collect(self, rows, winner, pot):
+        """Append the loser's pot, then the winner's own, to the winner's hand.
+
+        :param winner: 1 where player 1 won, 0 where player 2 won
+        :param pot: array of shape (games, 2, cards) with both players' pots
+        """
+        if not rows.size:
+            return
+        s, size, mask = self.__state, self.__size, self.__mask
+        hands, head, count = s["hands"].ravel(), s["head"].ravel(), s["count"].ravel()
+        # Loser's pot first: swap the players' pots where player 1 won
+        cards = np.where(winner[:, None, None], pot[:, ::-1], pot).reshape(
+            rows.size, -1
+        )
+        slot = rows * 2 + 1 - winner
+        offsets = (head[slot] + count[slot])[:, None] + np.arange(cards.shape[1])
+        hands[(slot * size)[:, None] + (offsets & mask)] = cards
+        count[slot] += cards.shape[1]
@@ -11,11 +11,23 @@ __all__ = [
     "Card",
     "CardHand",
     "Deck",
+    "Engine",
+    "Events",
     "Game",
     "Highscore",
     "Intelligence",
+    "Leaderboard",
+    "Lookahead",
     "Main",
     "Player",
+    "PolicyTable",
+    "Renderer",
+    "Seeding",
+    "ShardedHighscore",
     "Shell",
+    "Simulation",
+    "SqliteHighscore",
     "Statistics",
+    "Tournament",
+    "VectorEngine",
 ]
@@ -0,0 +1,197 @@
+"""Command-line entry point for ``python -m war``.
+
+Without a command the interactive Shell is started, with its highscores kept
+in the store chosen by ``--highscores``. The ``simulate`` command
+plays many headless games in parallel and prints a summary, the ``tournament``
+command plays every pairing of AI levels and prints their win rates, and the
+``table`` command compiles an AI level into a policy table for the 'table'
+level.
+"""
+
+import argparse
+import os
+
+try:  # Try imports for executing Main normally
+    from Highscore import Highscore
+    from Main import Main
+    from PolicyTable import PolicyTable
+    from ShardedHighscore import ShardedHighscore
+    from Simulation import Simulation
+    from SqliteHighscore import SqliteHighscore
+    from Tournament import Tournament
+except:  # Except imports for UnitTesting. To prevent module not found Error.
+    from .Highscore import Highscore
+    from .Main import Main
+    from .PolicyTable import PolicyTable
+    from .ShardedHighscore import ShardedHighscore
+    from .Simulation import Simulation
+    from .SqliteHighscore import SqliteHighscore
+    from .Tournament import Tournament
+
+
+LEVELS = ("top", "random", "greedy", "lookahead", "counting", "table")
+HIGHSCORES = ("journal", "sharded", "sqlite")
+
+
+def build_highscore(kind, path=None):
+    """Return the highscore store the Shell's game records results in.
+
+    :param kind: 'journal' for a journaled JSON file, 'sharded' for a
+        ShardedHighscore directory or 'sqlite' for a SqliteHighscore database
+    :param path: file or directory of the store, its default when None
+    :return: the store, None for the Shell's default journaled JSON file
+    """
+    if kind == "sharded":
+        return ShardedHighscore() if path is None else ShardedHighscore(path)
+    if kind == "sqlite":
+        return SqliteHighscore() if path is None else SqliteHighscore(path)
+    if path is None:
+        return None
+    return Highscore(path, journal=True, columnar=True)
+
+
+def build_parser():
+    """Return the argument parser for the command line."""
+    parser = argparse.ArgumentParser(prog="war", description="The War card game.")
+    parser.add_argument(
+        "--highscores",
+        default="journal",
+        choices=HIGHSCORES,
+        help="store of the Shell's highscores; 'sharded' can be compacted",
+    )
+    parser.add_argument(
+        "--highscores-path",
+        default=None,
+        help="file or directory of the highscores (default of the store)",
+    )
+    commands = parser.add_subparsers(dest="command")
+
+    simulate = commands.add_parser("simulate", help="play many headless games")
+    simulate.add_argument("--games", type=int, default=1000, help="games to play")
+    simulate.add_argument(
+        "--workers", type=int, default=None, help="worker processes (CPU count)"
+    )
+    simulate.add_argument(
+        "--ai", default="top", choices=LEVELS, help="intelligence level of player 2"
+    )
+    simulate.add_argument(
+        "--ai1",
+        default=None,
+        choices=LEVELS,
+        help="intelligence level of player 1, for AI versus AI",
+    )
+    simulate.add_argument(
+        "--chunk-size", type=int, default=None, help="games per worker task"
+    )
+    simulate.add_argument(
+        "--max-rounds",
+        type=int,
+        default=None,
+        help="rounds after which a game is stopped without a winner",
+    )
+    simulate.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="root seed, for results that are the same with any --workers",
+    )
+    engine = simulate.add_mutually_exclusive_group()
+    engine.add_argument(
+        "--vectorized",
+        action="store_true",
+        default=None,
+        help="play chunks with the NumPy engine (default when possible)",
+    )
+    engine.add_argument(
+        "--scalar",
+        dest="vectorized",
+        action="store_false",
+        help="play games one by one with the pure Python engine",
+    )
+
+    tournament = commands.add_parser(
+        "tournament", help="play every pairing of AI levels"
+    )
+    tournament.add_argument(
+        "--levels",
+        nargs="+",
+        default=list(Tournament.LEVELS),
+        choices=LEVELS,
+        help="intelligence levels that play each other",
+    )
+    tournament.add_argument("--games", type=int, default=1000, help="games per pairing")
+    tournament.add_argument(
+        "--workers", type=int, default=None, help="worker processes (CPU count)"
+    )
+    tournament.add_argument(
+        "--max-rounds",
+        type=int,
+        default=None,
+        help="rounds after which a game is stopped without a winner",
+    )
+    tournament.add_argument(
+        "--seed", type=int, default=None, help="root seed of the deals"
+    )
+    tournament.add_argument(
+        "--confidence",
+        type=float,
+        default=0.95,
+        help="confidence level of the win rate intervals",
+    )
+
+    table = commands.add_parser("table", help="compile an AI level into a table")
+    table.add_argument(
+        "--level",
+        default="greedy",
+        choices=("greedy", "lookahead", "counting"),
+        help="intelligence level to compile",
+    )
+    table.add_argument("--samples", type=int, default=8, help="hands per entry")
+    table.add_argument(
+        "--workers", type=int, default=None, help="worker processes (CPU count)"
+    )
+    table.add_argument("--seed", type=int, default=0, help="seed of the hands")
+    table.add_argument(
+        "--output",
+        default=PolicyTable.FILENAME,
+        help="table file, used by the 'table' level when it is the default",
+    )
+    return parser
+
+
+def main(argv=None):
+    """Run the command given on the command line."""
+    args = build_parser().parse_args(argv)
+    if args.command == "simulate":
+        simulation = Simulation(
+            args.games,
+            args.workers,
+            args.ai,
+            args.chunk_size,
+            args.vectorized,
+            args.max_rounds,
+            args.seed,
+            args.ai1,
+        )
+        print(simulation.run())
+    elif args.command == "tournament":
+        tournament = Tournament(
+            args.levels,
+            args.games,
+            args.workers,
+            max_rounds=args.max_rounds,
+            seed=args.seed,
+            confidence=args.confidence,
+        )
+        print(tournament.run())
+    elif args.command == "table":
+        policy_table = PolicyTable.build(
+            args.level, args.samples, args.workers or os.cpu_count() or 1, args.seed
+        )
+        print(f"Saved the {args.level} table to {policy_table.save(args.output)}")
+    else:
+        Main().run(build_highscore(args.highscores, args.highscores_path))
+
+
+if __name__ == "__main__":
+    main()